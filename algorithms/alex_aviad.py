@@ -1,22 +1,32 @@
 import logging
+import math
 from decimal import Decimal, getcontext
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from base_types import Preferences
-from type_helper import to_decimal
-from valuation import get_double_prime_for_interval
-
-from .alex_aviad_condition.condition_a import (
-    check_condition_a,
-    find_allocation_on_condition_a,
+from numeric_backend import get_backend, use_backend
+from parallel import current_workers, use_workers
+from type_helper import to_number
+from valuation import (
+    as_valuation_context,
+    get_double_prime_for_interval,
+    run_all_in_notebook,
+    valuation_notebook,
 )
+from verification import get_verification, use_verification
+
+from .alex_aviad_condition.condition_a import find_allocation_on_condition_a
+from .alex_aviad_condition.condition_a_or_b import check_condition_a_or_b
 from .alex_aviad_condition.condition_b import (
     check_condition_b,
     find_allocation_on_condition_b,
 )
+from .alex_aviad_condition.condition_b_helper import implicit_cut_tables
+from .alex_aviad_condition.condition_checks import condition_checks
 from .alex_aviad_hepler import equipartition
 from .algorithm_test_utils import find_envy_free_allocation
 from .algorithm_types import Step, make_step
+from .root_finding import warm_starts
 
 getcontext().prec = 15
 
@@ -24,27 +34,79 @@ getcontext().prec = 15
 def alex_aviad(
     preferences: Preferences,
     cake_size: int,
-    epsilon: Decimal = to_decimal("1e-15"),
-    tolerance: Decimal = to_decimal("1e-10"),
+    epsilon: Decimal = to_number("1e-15"),
+    tolerance: Decimal = to_number("1e-10"),
+    backend: Optional[str] = None,
+    workers: Optional[int] = None,
+    verification: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    `backend` selects the numeric backend ("decimal", "float" or "fraction")
+    for this call, by default the one currently in use is kept.
+
+    `workers` is the number of processes the candidate checks of a condition
+    are spread over, by default ALEX_AVIAD_WORKERS or none at all. From 3 on,
+    the alphas of the next rounds of bisection are checked side by side
+    instead, which gives the same result in fewer rounds.
+
+    `verification` is how many of the internal consistency checks to run
+    ("off", "sampled" or "full"), by default ALEX_AVIAD_VERIFY or none.
+
+    v'' values are memoised for the whole call, the `notebook` entry of the
+    result holds the hit and miss counts and the time saved, those of the
+    worker processes, which memoise per job, included. The cut searches
+    of the condition checks start from the cuts found for earlier alphas, and
+    agent 1's implicit cuts for condition B are tabulated per alpha. The final
+    allocation is made from the cuts of the last condition met, rather than by
+    checking it again.
+    """
+    with use_backend(backend), use_verification(verification):
+        with valuation_notebook() as notebook, warm_starts() as starts:
+            with implicit_cut_tables() as tables, use_workers(workers):
+                with condition_checks() as checks:
+                    result = _alex_aviad(
+                        preferences=preferences,
+                        cake_size=cake_size,
+                        epsilon=to_number(epsilon),
+                        tolerance=to_number(tolerance),
+                    )
+            logging.info(f"alex_aviad: v'' notebook {notebook.stats()}")
+            logging.info(f"alex_aviad: warm-started cut searches {starts.stats()}")
+            logging.info(f"alex_aviad: tabulated implicit cuts {tables.stats()}")
+            logging.info(f"alex_aviad: remembered condition checks {checks.stats()}")
+            if result is not None:
+                result["notebook"] = notebook.stats()
+            return result
+
+
+def _alex_aviad(
+    preferences: Preferences,
+    cake_size: int,
+    epsilon: Decimal,
+    tolerance: Decimal,
 ) -> Dict[str, Any]:
     assert len(preferences) == 4, "Need 4 agents here"
 
+    # Bind every preference to the cake once, all valuations below reuse the
+    # compiled index and whole-cake value of these contexts
+    preferences = [as_valuation_context(p, cake_size, epsilon) for p in preferences]
+
     solution = []
     steps: List[Step] = []
 
     # Find the equipartition by Agent1
     cuts = equipartition(
         preference=preferences[0],
-        cake_size=to_decimal(cake_size),
+        cake_size=to_number(cake_size),
         epsilon=epsilon,
-        start=to_decimal(0),
-        end=to_decimal(cake_size),
+        start=to_number(0),
+        end=to_number(cake_size),
         tolerance=tolerance,
     )
     solution = find_envy_free_allocation(
         cuts=cuts,
         num_agents=4,
-        cake_size=to_decimal(cake_size),
+        cake_size=to_number(cake_size),
         preferences=preferences,
         epsilon=epsilon,
     )
@@ -93,19 +155,19 @@ def alex_aviad(
     alpha_underline = get_double_prime_for_interval(
         segments=preferences[0],
         epsilon=epsilon,
-        start=to_decimal(0),
+        start=to_number(0),
         end=cuts[0],
-        cake_size=to_decimal(cake_size),
+        cake_size=to_number(cake_size),
     )
 
     # Should be 1, sometimes gets 1.00000000000000000001 due to precision problem
-    # alpha_overline = to_decimal(1)
+    # alpha_overline = to_number(1)
     alpha_overline = get_double_prime_for_interval(
         segments=preferences[0],
         epsilon=epsilon,
-        start=to_decimal(0),
-        end=to_decimal(cake_size),
-        cake_size=to_decimal(cake_size),
+        start=to_number(0),
+        end=to_number(cake_size),
+        cake_size=to_number(cake_size),
     )
     assert (
         alpha_overline == 1
@@ -114,72 +176,61 @@ def alex_aviad(
     info = []
     alpha = -1
     condition_info = {
-        "A": {"cuts": [], "k": -1, "alpha_underline": -1},
-        "B": {"cuts": [], "k": -1, "k_prime": -1, "alpha_underline": -1},
+        "A": {"cuts": [], "k": -1, "alpha": -1, "alpha_underline": -1},
+        "B": {"cuts": [], "k": -1, "k_prime": -1, "alpha": -1, "alpha_underline": -1},
     }
     meet_condition = ""
     logging.info(
         f"abs(alpha_overline - alpha_underline) = {abs(alpha_overline - alpha_underline)}\n (epsilon**4 / 12) = {(epsilon**4 / 12)}"
     )
     counter = 0
+    outcomes: Dict[Decimal, Tuple[str, Dict[str, Any]]] = {}
     try:
-        while (
-            abs(alpha_overline - alpha_underline) > (epsilon**4 / 12) and counter <= 12
-        ):
+        while _keep_bisecting(alpha_underline, alpha_overline, counter, epsilon):
             alpha = (alpha_underline + alpha_overline) / 2
             logging.error(
                 f"Iteration {counter}: alpha_overline = {alpha_overline}, alpha_underline = {alpha_underline}, {epsilon**4 / 12}, {alpha=}"
             )
 
             logging.warning(f"alpha = {alpha}, {alpha_overline=}, {alpha_underline=}")
-            if to_decimal(0.25) <= alpha < Decimal("1") / Decimal("3"):
-                logging.warning(
-                    "**********************************************************"
-                )
-                logging.warning("Check Condition A")
-                logging.warning(
-                    "**********************************************************"
-                )
-                meet_a, condition_a_info = check_condition_a(
-                    alpha=alpha,
+            if alpha not in outcomes:
+                outcomes = _check_conditions_ahead(
+                    alpha_underline=alpha_underline,
+                    alpha_overline=alpha_overline,
+                    counter=counter,
                     preferences=preferences,
-                    cake_size=to_decimal(cake_size),
+                    cake_size=to_number(cake_size),
                     epsilon=epsilon,
                     tolerance=tolerance,
                 )
-                if meet_a:
-                    # assert "OHHHHH" == "", "GOODDDDD, meet conditon A"
-                    meet_condition = "A"
-                    condition_info["A"] = condition_a_info
-                    condition_info["A"]["alpha_underline"] = alpha_underline
-                    alpha_underline = alpha
-                    info.append(
-                        f"meet A, alpha_underline:{alpha_underline} = {alpha}\n\t{condition_info=}"
-                    )
-                    counter += 1
-                    logging.warning("Meet Condition A")
-                    continue
+            met, met_info = outcomes[alpha]
+            if met == "A":
+                # assert "OHHHHH" == "", "GOODDDDD, meet conditon A"
+                meet_condition = "A"
+                condition_info["A"] = met_info
+                condition_info["A"]["alpha"] = alpha
+                condition_info["A"]["alpha_underline"] = alpha_underline
+                alpha_underline = alpha
+                info.append(
+                    f"meet A, alpha_underline:{alpha_underline} = {alpha}\n\t{condition_info=}"
+                )
+                counter += 1
+                logging.warning("Meet Condition A")
+                continue
 
-            if to_decimal(0.25) <= alpha < to_decimal(0.5):
-                meet_b, condition_b_info = check_condition_b(
-                    alpha=alpha,
-                    preferences=preferences,
-                    cake_size=to_decimal(cake_size),
-                    epsilon=epsilon,
-                    tolerance=tolerance,
+            if met == "B":
+                # assert "OHHHHH" == "", "GOODDDDD, meet conditon B"
+                meet_condition = "B"
+                condition_info["B"] = met_info
+                condition_info["B"]["alpha"] = alpha
+                condition_info["B"]["alpha_underline"] = alpha_underline
+                alpha_underline = alpha
+                info.append(
+                    f"meet B, alpha_underline:{alpha_underline} = {alpha}\n\t{condition_info=}"
                 )
-                if meet_b:
-                    # assert "OHHHHH" == "", "GOODDDDD, meet conditon B"
-                    meet_condition = "B"
-                    condition_info["B"] = condition_b_info
-                    condition_info["B"]["alpha_underline"] = alpha_underline
-                    alpha_underline = alpha
-                    info.append(
-                        f"meet B, alpha_underline:{alpha_underline} = {alpha}\n\t{condition_info=}"
-                    )
-                    logging.warning("Meet Condition B")
-                    counter += 1
-                    continue
+                logging.warning("Meet Condition B")
+                counter += 1
+                continue
 
             alpha_overline = alpha
             info.append(
@@ -195,28 +246,35 @@ def alex_aviad(
         ), "At least one condition should be met when exit the loop"
         logging.warning(f"Finding Allocation on Condition {meet_condition}")
         if meet_condition == "A":
+            # k is -1 until condition A is met, 0 is a valid piece
             assert (
-                condition_info["A"]["cuts"] and condition_info["A"]["k"]
+                condition_info["A"]["cuts"] and condition_info["A"]["k"] >= 0
             ), "Should have necessary information of condition A to yied a final allocation"
+            # The cuts of the iteration that met it, no need to check it again
             allocation = find_allocation_on_condition_a(
                 preferences=preferences,
-                alpha=condition_info["A"]["alpha_underline"],
-                cake_size=to_decimal(cake_size),
+                alpha=condition_info["A"]["alpha"],
+                cake_size=to_number(cake_size),
                 epsilon=epsilon,
                 tolerance=tolerance,
+                cuts=condition_info["A"]["cuts"],
+                k=condition_info["A"]["k"],
             )
         elif meet_condition == "B":
             assert (
                 condition_info["B"]["cuts"]
-                and condition_info["B"]["k"]
-                and condition_info["B"]["k_prime"]
+                and condition_info["B"]["k"] >= 0
+                and condition_info["B"]["k_prime"] >= 0
             ), "Should have necessary information of condition B to yied a final allocation"
             allocation = find_allocation_on_condition_b(
-                alpha=condition_info["B"]["alpha_underline"],
-                cake_size=to_decimal(cake_size),
+                alpha=condition_info["B"]["alpha"],
+                cake_size=to_number(cake_size),
                 epsilon=epsilon,
                 preferences=preferences,
                 tolerance=tolerance,
+                cuts=condition_info["B"]["cuts"],
+                k=condition_info["B"]["k"],
+                k_prime=condition_info["B"]["k_prime"],
             )
         for i in info:
             logging.error(f"info: {i}")
@@ -224,3 +282,115 @@ def alex_aviad(
     except Exception as e:
         logging.error(f"error from algorithm: {e}")
         logging.error("exit")
+
+
+def _keep_bisecting(alpha_underline, alpha_overline, counter: int, epsilon) -> bool:
+    return abs(alpha_overline - alpha_underline) > (epsilon**4 / 12) and counter <= 12
+
+
+def _check_conditions(
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> Tuple[str, Dict[str, Any]]:
+    """Condition met at alpha, "A" or "B", and its cuts, or ("", {})"""
+    if to_number(0.25) <= alpha < to_number(1) / to_number(3):
+        logging.warning(
+            "**********************************************************"
+        )
+        logging.warning("Check Condition A")
+        logging.warning(
+            "**********************************************************"
+        )
+        # Condition B is checked alongside, it only counts if A fails
+        return check_condition_a_or_b(
+            alpha=alpha,
+            preferences=preferences,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+
+    if to_number(0.25) <= alpha < to_number(0.5):
+        meet_b, condition_b_info = check_condition_b(
+            alpha=alpha,
+            preferences=preferences,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+        return ("B", condition_b_info) if meet_b else ("", {})
+
+    return "", {}
+
+
+def _check_conditions_in_worker(
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+    backend: str,
+    verification: str,
+) -> Tuple[str, Dict[str, Any]]:
+    with use_backend(backend), use_verification(verification):
+        return _check_conditions(alpha, preferences, cake_size, epsilon, tolerance)
+
+
+def _bisection_tree(
+    alpha_underline, alpha_overline, counter: int, depth: int, epsilon
+) -> List[Decimal]:
+    """Alphas the next `depth` rounds of bisection may try, whatever they find"""
+    if depth == 0 or not _keep_bisecting(
+        alpha_underline, alpha_overline, counter, epsilon
+    ):
+        return []
+    alpha = (alpha_underline + alpha_overline) / 2
+    return (
+        [alpha]
+        + _bisection_tree(alpha, alpha_overline, counter + 1, depth - 1, epsilon)
+        + _bisection_tree(alpha_underline, alpha, counter + 1, depth - 1, epsilon)
+    )
+
+
+def _check_conditions_ahead(
+    alpha_underline: Decimal,
+    alpha_overline: Decimal,
+    counter: int,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> Dict[Decimal, Tuple[str, Dict[str, Any]]]:
+    """
+    `_check_conditions` at the midpoint of the bracket, and with a pool of at
+    least 3 workers, at the midpoints the rounds after it may try.
+
+    Every check only depends on its alpha, so with n workers the 2^d - 1 <= n
+    alphas of the next d rounds are checked at once, one per worker, and the
+    loop then walks down them as it would have found them. It tries the same
+    alphas as plain bisection and ends at the same one, in a d-th of the rounds.
+    With fewer workers, the midpoint's candidates are spread over them instead.
+    """
+    depth = int(math.log2(current_workers() + 1))
+    alphas = _bisection_tree(alpha_underline, alpha_overline, counter, depth, epsilon)
+    if len(alphas) == 1:
+        return {
+            alphas[0]: _check_conditions(
+                alphas[0], preferences, cake_size, epsilon, tolerance
+            )
+        }
+
+    backend = get_backend().name
+    verification = get_verification().level
+    outcomes = run_all_in_notebook(
+        _check_conditions_in_worker,
+        [
+            (alpha, preferences, cake_size, epsilon, tolerance)
+            + (backend, verification)
+            for alpha in alphas
+        ],
+    )
+    return dict(zip(alphas, outcomes))
@@ -1,19 +1,27 @@
 import logging
 from decimal import Decimal, getcontext
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from base_types import AssignedSlice, Preferences, Segment
-from type_helper import de_norm, to_decimal
-from valuation import get_double_prime_for_interval
+from numeric_backend import get_backend, use_backend
+from type_helper import de_norm, to_number
+from valuation import (
+    first_success_in_notebook,
+    get_double_prime_for_interval,
+    get_whole_cake_value,
+    valuation_notebook,
+)
 from values import get_value_for_interval
 
 from ..alex_aviad_hepler import (
-    _binary_search_left_to_right,
-    _binary_search_right_to_left,
+    CutPlanner,
     _check_if_weakly_prefer_piece_k,
     get_range_by_cuts,
 )
 from ..algorithm_test_utils import find_envy_free_allocation
+from ..algorithm_types import Rejected
+from .condition_checks import remembered_check
+from .prescreen import PRESCREEN_SLACK, _cuts_at_shares, _piece_value_bounds
 
 getcontext().prec = 15
 
@@ -27,34 +35,90 @@ def check_condition_a(
     epsilon: Decimal,
     tolerance: Decimal,
 ) -> Tuple[bool, Dict[str, Any]]:
-    alpha = to_decimal(alpha)
-    epsilon = to_decimal(epsilon)
-    tolerance = to_decimal(tolerance)
-    cake_size = to_decimal(cake_size)
-
-    preference_a = preferences[0]
+    alpha = to_number(alpha)
+    epsilon = to_number(epsilon)
+    tolerance = to_number(tolerance)
+    cake_size = to_number(cake_size)
+
+    def check() -> Tuple[bool, Dict[str, Any]]:
+        # Find cuts and identify k, the lowest k that works wins
+        found = first_success_in_notebook(
+            _check_candidate_for_condition_a,
+            _condition_a_jobs(alpha, preferences, cake_size, epsilon, tolerance),
+        )
+        if found is None:
+            return (False, {})
+        return (True, found[1])
 
-    whole_cake_value = get_value_for_interval(
-        segments=preference_a, start=to_decimal(0), end=cake_size
+    return remembered_check(
+        "A", alpha, preferences, (cake_size, epsilon, tolerance), check
     )
-    # Find cuts and identify k
-    for k in POSIBLE_K:
+
+
+def _condition_a_jobs(
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> List[Tuple]:
+    """
+    Arguments of `_check_candidate_for_condition_a` per k, in order. The
+    candidates share the planner when they run here, worker processes get a
+    copy each.
+    """
+    backend = get_backend().name
+    planner = CutPlanner(preferences[0], cake_size, epsilon, tolerance)
+    return [
+        (k, alpha, preferences, cake_size, epsilon, tolerance, backend, planner)
+        for k in POSIBLE_K
+    ]
+
+
+def _check_candidate_for_condition_a(
+    k: int,
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+    backend: str,
+    planner: CutPlanner,
+) -> Union[Dict[str, Any], Rejected]:
+    """
+    Cuts and k if agent 1 can cut pieces worth alpha with piece k the
+    smallest, and at least two of the others weakly prefer piece k, else why
+    not. Runs in a worker process when there is a pool, hence the explicit
+    backend.
+    """
+    candidate = f"condition A, k={k}"
+    with use_backend(backend), valuation_notebook():
+        ruled_out = _prescreen_condition_a(
+            k, alpha, preferences, to_number(cake_size), tolerance
+        )
+        if ruled_out is not None:
+            return Rejected(candidate, ruled_out)
+
+        preference_a = preferences[0]
+
+        whole_cake_value = get_whole_cake_value(preference_a, cake_size)
         results = _find_cuts_and_k_for_condition_a(
             k=k,
             alpha=alpha,
             preference=preference_a,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
             epsilon=epsilon,
             tolerance=tolerance,
+            planner=planner,
         )
         if len(results) == 0:
-            continue
+            return Rejected(candidate, "piece k is worth more than alpha to agent 1")
 
         cuts = results["cuts"]
         k = results["k"]
 
         start_k, end_k = get_range_by_cuts(
-            cuts=cuts, k=k, cake_size=to_decimal(cake_size)
+            cuts=cuts, k=k, cake_size=to_number(cake_size)
         )
 
         v_1 = get_double_prime_for_interval(
@@ -76,7 +140,7 @@ def check_condition_a(
             logging.error(f"Check Conditonn A if agent {i} weakly prefer k")
             weak_preference[i] = _check_if_weakly_prefer_piece_k(
                 preference=preferences[i],
-                cake_size=to_decimal(cake_size),
+                cake_size=to_number(cake_size),
                 epsilon=epsilon,
                 start=start_k,
                 end=end_k,
@@ -89,8 +153,56 @@ def check_condition_a(
             logging.error(
                 f"Test A successful, {k=}, other agents (i and i') are {weak_preference_idx}"
             )
-            return (True, {"cuts": cuts, "k": k})
-    return (False, {})
+            return {"cuts": cuts, "k": k}
+        return Rejected(candidate, "fewer than two other agents weakly prefer piece k")
+
+
+def _prescreen_condition_a(
+    k: int,
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    tolerance: Decimal,
+) -> Optional[str]:
+    """
+    Why piece k cannot meet condition A, or None if it might, from prefix
+    values alone.
+
+    Agent 1's three other pieces are worth alpha each, up to the search
+    tolerance, which pins every cut to a narrow range of agent 1's prefix
+    values and piece k to about 1 - 3 alpha of agent 1's cake. An agent weakly
+    prefers piece k when it is worth at least as much to them as to agent 1
+    (see `_check_if_weakly_prefer_piece_k`), so over those ranges at least two
+    of agents 2 to 4 must be able to value piece k that much.
+    """
+    alpha = to_number(alpha)
+    slack = to_number(PRESCREEN_SLACK) + 3 * to_number(tolerance)
+    shares = [alpha] * 3
+    shares.insert(k, 1 - 3 * alpha)
+    before = [sum(shares[: cut + 1]) for cut in range(3)]
+    lowest_cuts, highest_cuts = _cuts_at_shares(
+        preferences[0],
+        cake_size,
+        [share - slack for share in before],
+        [share + slack for share in before],
+    )
+
+    least_for_agent_1 = max(to_number(0), shares[k] - slack) * get_whole_cake_value(
+        preferences[0], cake_size
+    )
+    reached = 0
+    for preference in preferences[1:]:
+        most, _ = _piece_value_bounds(preference, cake_size, lowest_cuts, highest_cuts)
+        # Agent i's value of piece k is scaled by the cake up to its end
+        most_before_end = get_value_for_interval(
+            segments=preference, start=to_number(0), end=highest_cuts[k + 1]
+        )
+        most_for_agent = (most[k] + to_number(PRESCREEN_SLACK)) * most_before_end
+        if most_for_agent >= least_for_agent_1:
+            reached += 1
+    if reached < 2:
+        return "piece k cannot be worth as much to two other agents as to agent 1"
+    return None
 
 
 def _find_cuts_and_k_for_condition_a(
@@ -99,13 +211,21 @@ def _find_cuts_and_k_for_condition_a(
     cake_size: Decimal,
     preference: List[Segment],
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-3),
+    tolerance: Decimal = to_number(1e-3),
+    planner: Optional[CutPlanner] = None,
 ) -> Dict[str, Any]:
-    """Could simplify code, but lost readability."""
+    """
+    Could simplify code, but lost readability.
+
+    The candidates for the different k share most of their cuts, pass the
+    same `planner` to all of them to search for each of those only once.
+    """
 
-    alpha = to_decimal(alpha)
-    start = to_decimal(0)
-    end = to_decimal(cake_size)
+    alpha = to_number(alpha)
+    if planner is None:
+        planner = CutPlanner(preference, cake_size, epsilon, tolerance)
+    start = to_number(0)
+    end = to_number(cake_size)
 
     # equals: List[bool] = []
 
@@ -113,37 +233,13 @@ def _find_cuts_and_k_for_condition_a(
         # [0, l] | [l, m] | [m, r] | [r, cake_size]
         #    *       3         2          1
         logging.error(f"******{k=}")
-        r = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        r = planner.right_to_left(start=start, end=end, target=alpha)
         logging.error(f"******{r=}")
 
-        m = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=r,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        m = planner.right_to_left(start=start, end=r, target=alpha)
         logging.error(f"******{m=}")
 
-        l = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=m,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        l = planner.right_to_left(start=start, end=m, target=alpha)
         logging.error(f"******{l=}")
 
         remained_value = get_double_prime_for_interval(
@@ -151,7 +247,7 @@ def _find_cuts_and_k_for_condition_a(
             epsilon=epsilon,
             start=start,
             end=l,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
         logging.error(f"******{remained_value=}, should < {alpha=}")
 
@@ -167,37 +263,13 @@ def _find_cuts_and_k_for_condition_a(
         # [0, l] | [l, m] | [m, r] | [r, cake_size]
         #    1       *         3          2
         logging.error(f"******{k=}")
-        l = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        l = planner.left_to_right(start=start, end=end, target=alpha)
         logging.error(f"******{l=}")
 
-        r = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=l,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        r = planner.right_to_left(start=l, end=end, target=alpha)
         logging.error(f"******{r=}")
 
-        m = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=l,
-            end=r,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        m = planner.right_to_left(start=l, end=r, target=alpha)
         logging.error(f"******{m=}")
 
         remained_value = get_double_prime_for_interval(
@@ -205,7 +277,7 @@ def _find_cuts_and_k_for_condition_a(
             epsilon=epsilon,
             start=l,
             end=m,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
         logging.error(f"******{remained_value=}, should < {alpha=}")
 
@@ -221,37 +293,13 @@ def _find_cuts_and_k_for_condition_a(
         # [0, l] | [l, m] | [m, r] | [r, cake_size]
         #    1       2         *          3
         logging.error(f"******{k=}")
-        l = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        l = planner.left_to_right(start=start, end=end, target=alpha)
         logging.error(f"******{l=}")
 
-        m = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=l,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        m = planner.left_to_right(start=l, end=end, target=alpha)
         logging.error(f"******{m=}")
 
-        r = _binary_search_right_to_left(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=m,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        r = planner.right_to_left(start=m, end=end, target=alpha)
         logging.error(f"******{r=}")
 
         remained_value = get_double_prime_for_interval(
@@ -259,7 +307,7 @@ def _find_cuts_and_k_for_condition_a(
             epsilon=epsilon,
             start=m,
             end=r,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
         logging.error(f"******{remained_value=}, should < {alpha=}")
 
@@ -275,37 +323,13 @@ def _find_cuts_and_k_for_condition_a(
         # [0, l] | [l, m] | [m, r] | [r, cake_size]
         #    1       2         3          *
         logging.error(f"******{k=}")
-        l = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=start,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        l = planner.left_to_right(start=start, end=end, target=alpha)
         logging.error(f"******{l=}")
 
-        m = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=l,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        m = planner.left_to_right(start=l, end=end, target=alpha)
         logging.error(f"******{m=}")
 
-        r = _binary_search_left_to_right(
-            preference=preference,
-            cake_size=cake_size,
-            epsilon=epsilon,
-            start=m,
-            end=end,
-            target=alpha,
-            tolerance=tolerance,
-        )
+        r = planner.left_to_right(start=m, end=end, target=alpha)
         logging.error(f"******{r=}")
 
         remained_value = get_double_prime_for_interval(
@@ -313,7 +337,7 @@ def _find_cuts_and_k_for_condition_a(
             epsilon=epsilon,
             start=r,
             end=end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
         logging.error(f"******{remained_value=}, should < {alpha=}")
 
@@ -340,21 +364,28 @@ def find_allocation_on_condition_a(
     epsilon: Decimal,
     alpha: Decimal,
     tolerance: Decimal,
+    cuts: Optional[List[Decimal]] = None,
+    k: Optional[int] = None,
 ) -> List[AssignedSlice]:
-    meet_a, info = check_condition_a(
-        alpha=alpha,
-        preferences=preferences,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        tolerance=tolerance,
-    )
-    assert (
-        meet_a is True
-    ), "find_allocation_on_condition_a: Should meet Condition A at this stage"
-    assert (
-        len(info) != 0
-    ), "find_allocation_on_condition_a: Should have necessary info at this stage"
-    cuts, k = info["cuts"], info["k"]
+    """
+    Allocation from the cuts and k that meet condition A at alpha. Without
+    them, condition A is checked again, or looked up in `condition_checks()`.
+    """
+    if cuts is None:
+        meet_a, info = check_condition_a(
+            alpha=alpha,
+            preferences=preferences,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+        assert (
+            meet_a is True
+        ), "find_allocation_on_condition_a: Should meet Condition A at this stage"
+        assert (
+            len(info) != 0
+        ), "find_allocation_on_condition_a: Should have necessary info at this stage"
+        cuts, k = info["cuts"], info["k"]
     logging.error(f"find_allocation_on_condition_a: {cuts=}, {k=}, {alpha=}")
 
     allocation = find_envy_free_allocation(
@@ -0,0 +1,62 @@
+from decimal import Decimal, getcontext
+from typing import Any, Callable, Dict, Tuple
+
+from base_types import Preferences
+from type_helper import to_number
+from valuation import first_success_in_notebook
+
+from .condition_a import _check_candidate_for_condition_a, _condition_a_jobs
+from .condition_b import _check_candidate_for_condition_b, _condition_b_jobs
+from .condition_b_helper import implicit_cut_tables
+from .condition_checks import record_check
+
+getcontext().prec = 15
+
+
+def check_condition_a_or_b(
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    ("A", cuts and k) if condition A holds at alpha, else ("B", cuts, k and
+    k') if condition B does, else ("", {}).
+
+    The same as checking condition A and then, if it fails, condition B. Their
+    candidates are lined up A's first, so with a pool of workers they all start
+    at once and B's are dropped as soon as one of A's succeeds, a round costs
+    the longer of the two checks rather than both.
+    """
+    alpha = to_number(alpha)
+    epsilon = to_number(epsilon)
+    tolerance = to_number(tolerance)
+    cake_size = to_number(cake_size)
+
+    a_jobs = _condition_a_jobs(alpha, preferences, cake_size, epsilon, tolerance)
+    b_jobs = _condition_b_jobs(alpha, preferences, cake_size, epsilon, tolerance)
+    with implicit_cut_tables():
+        found = first_success_in_notebook(
+            _check_candidate,
+            [(_check_candidate_for_condition_a,) + job for job in a_jobs]
+            + [(_check_candidate_for_condition_b,) + job for job in b_jobs],
+        )
+
+    settings = (cake_size, epsilon, tolerance)
+    if found is not None and found[0] < len(a_jobs):
+        record_check("A", alpha, preferences, settings, (True, found[1]))
+        return "A", found[1]
+
+    # B's outcome is only known once A has failed
+    record_check("A", alpha, preferences, settings, (False, {}))
+    if found is None:
+        record_check("B", alpha, preferences, settings, (False, {}))
+        return "", {}
+    record_check("B", alpha, preferences, settings, (True, found[1]))
+    return "B", found[1]
+
+
+def _check_candidate(check: Callable[..., Any], *job) -> Any:
+    """`check(*job)`, so that one pool can run the candidates of both conditions"""
+    return check(*job)
@@ -0,0 +1,43 @@
+import pytest
+
+from parallel import use_workers
+from type_helper import to_decimal
+
+from ..algorithm_test_utils import gen_four_sloped_preferences
+from .condition_a import check_condition_a
+from .condition_a_or_b import check_condition_a_or_b
+from .condition_b import check_condition_b
+from .condition_checks import condition_checks
+
+
+def _sequential(alpha, preferences, cake_size, epsilon, tolerance):
+    meet_a, info = check_condition_a(alpha, preferences, cake_size, epsilon, tolerance)
+    if meet_a:
+        return "A", info
+    meet_b, info = check_condition_b(alpha, preferences, cake_size, epsilon, tolerance)
+    return ("B", info) if meet_b else ("", {})
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_check_condition_a_or_b_is_a_then_b(workers):
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = gen_four_sloped_preferences(cake_size)
+
+    met = []
+    for alpha in ["0.26", "0.3", "0.33"]:
+        arguments = (to_decimal(alpha), preferences, cake_size, epsilon, tolerance)
+        with use_workers(workers):
+            with condition_checks() as checks:
+                condition, info = check_condition_a_or_b(*arguments)
+                # Both outcomes are remembered, unless A holds
+                meet_a = condition == "A"
+                assert check_condition_a(*arguments) == (meet_a, info if meet_a else {})
+                if not meet_a:
+                    assert check_condition_b(*arguments) == (condition == "B", info)
+        assert (condition, info) == _sequential(*arguments)
+        assert checks.misses == 0
+        met.append(condition)
+
+    assert "A" in met
@@ -2,10 +2,18 @@ from decimal import ROUND_DOWN, Decimal
 
 import pytest
 
-from algorithms.alex_aviad_condition.condition_a import check_condition_a
+from parallel import use_workers
 from type_helper import to_decimal
+from valuation import valuation_notebook
 
+from ..alex_aviad_hepler import CutPlanner
 from ..algorithm_test_utils import check_if_envy_free, gen_flat_seg
+from ..algorithm_types import Rejected
+from .condition_a import (
+    _check_candidate_for_condition_a,
+    _prescreen_condition_a,
+    check_condition_a,
+)
 
 
 def test_check_condition_a():
@@ -47,3 +55,63 @@ def test_check_condition_a():
             expected_info["cuts"][i],
             abs=tolerance,
         )
+
+
+def test_check_condition_a_in_worker_processes():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = [
+        [gen_flat_seg(to_decimal(0), to_decimal(cake_size), to_decimal(10))]
+        for _ in range(4)
+    ]
+    alpha = to_decimal(0.25000043535345)
+
+    serial = check_condition_a(alpha, preferences, cake_size, epsilon, tolerance)
+    with valuation_notebook() as notebook, use_workers(2):
+        parallel = check_condition_a(alpha, preferences, cake_size, epsilon, tolerance)
+
+    assert parallel == serial
+    # The v'' lookups of the worker processes are counted here
+    assert notebook.misses > 0
+
+
+def test_prescreen_rules_out_candidates_before_searching():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    alpha = to_decimal("0.3")
+
+    # Agents 2 and 3 value the whole cake below what piece k is worth to agent 1
+    preferences = [
+        [gen_flat_seg(to_decimal(0), cake_size, to_decimal(value))]
+        for value in (10, 2, 3, 11)
+    ]
+    planner = CutPlanner(preferences[0], cake_size, epsilon, tolerance)
+    for k in range(4):
+        result = _check_candidate_for_condition_a(
+            k,
+            alpha,
+            preferences,
+            cake_size,
+            epsilon,
+            tolerance,
+            "decimal",
+            planner,
+        )
+        assert isinstance(result, Rejected)
+        assert "two other agents" in result.reason
+    assert planner.misses == 0
+
+    # Equal agents may all prefer piece k, the pre-screen leaves that to the
+    # searches
+    preferences = [
+        [gen_flat_seg(to_decimal(0), cake_size, to_decimal(10))] for _ in range(4)
+    ]
+    alpha = to_decimal(0.25000043535345)
+    found, info = check_condition_a(alpha, preferences, cake_size, epsilon, tolerance)
+    assert found
+    assert (
+        _prescreen_condition_a(info["k"], alpha, preferences, cake_size, tolerance)
+        is None
+    )
@@ -1,17 +1,32 @@
 import logging
 from decimal import ROUND_DOWN, ROUND_UP, Decimal, getcontext
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from base_types import AssignedSlice, Preferences, Segment
-from type_helper import almost_equal, de_norm, to_decimal
-from valuation import get_double_prime_for_interval
-from values import get_value_for_interval
+from numeric_backend import get_backend, use_backend
+from type_helper import almost_equal, de_norm, quantize, to_number
+from valuation import (
+    first_success_in_notebook,
+    get_double_prime_for_interval,
+    get_value_matrix,
+    get_whole_cake_value,
+    preference_fingerprint,
+    valuation_notebook,
+)
+from verification import get_verification, should_verify, use_verification
 
 from ..alex_aviad_hepler import (_binary_search_left_to_right,
-                                 _binary_search_right_to_left,
-                                 get_range_by_cuts)
+                                 _binary_search_right_to_left)
 from ..algorithm_test_utils import find_envy_free_allocation
-from .condition_b_helper import _find_balanced_cut_for_adjacent
+from ..algorithm_types import Rejected
+from ..root_finding import expand_feasible_range, find_warm_root
+from .condition_b_helper import (
+    _find_balanced_cut_for_adjacent,
+    _prescreen_condition_b,
+    implicit_cut_tables,
+    tabulated_cuts,
+)
+from .condition_checks import remembered_check
 
 getcontext().prec = 15
 
@@ -33,243 +48,220 @@ def check_condition_b(
     epsilon: Decimal,
     tolerance: Decimal,
 ) -> Tuple[bool, Dict[str, Any]]:
-    alpha = to_decimal(alpha)
-    epsilon = to_decimal(epsilon)
-    tolerance = to_decimal(tolerance)
-    cake_size = to_decimal(cake_size)
-
-    preference_1, preference_2 = preferences[0], preferences[1]
-    preference_3, preference_4 = preferences[2], preferences[3]
+    alpha = to_number(alpha)
+    epsilon = to_number(epsilon)
+    tolerance = to_number(tolerance)
+    cake_size = to_number(cake_size)
+
+    def check() -> Tuple[bool, Dict[str, Any]]:
+        # The first candidate that works wins. Agent 1's implicit cuts are
+        # shared between the jobs that run in this process
+        with implicit_cut_tables():
+            found = first_success_in_notebook(
+                _check_candidate_for_condition_b,
+                _condition_b_jobs(alpha, preferences, cake_size, epsilon, tolerance),
+            )
+        if found is None:
+            return (False, {})
+        return (True, found[1])
 
-    whole_cake_value_0 = get_value_for_interval(
-        segments=preference_1, start=to_decimal(0), end=cake_size
-    )
-    whole_cake_value_1 = get_value_for_interval(
-        segments=preference_2, start=to_decimal(0), end=cake_size
-    )
-    whole_cake_value_2 = get_value_for_interval(
-        segments=preference_3, start=to_decimal(0), end=cake_size
-    )
-    whole_cake_value_3 = get_value_for_interval(
-        segments=preference_4, start=to_decimal(0), end=cake_size
+    return remembered_check(
+        "B", alpha, preferences, (cake_size, epsilon, tolerance), check
     )
 
-    whole_cake_values = {
-        0: whole_cake_value_0,
-        1: whole_cake_value_1,
-        2: whole_cake_value_2,
-        3: whole_cake_value_3,
-    }
 
-    alpha_de_norm = de_norm(v=alpha, whole_cake_value=whole_cake_value_0)
-
-    # PERF: May accelerate this process by using "notebook", cache double values
-    for i in range(1, len(preferences)):
-        preference_i = preferences[i]
-        results = _find_cuts_and_k_k_prime_for_agent_i_on_condition_b(
-            alpha=alpha,
-            cake_size=to_decimal(cake_size),
-            preference_1=preference_1,
-            preference_i=preference_i,
-            epsilon=epsilon,
-            tolerance=tolerance,
-        )
-        for result in results:
-            cuts: List[Decimal] = result["cuts"]
-            k: int = result["k"]
-            k_prime: int = result["k_prime"]
-
-            other_1: int
-            other_2: int
-            other_1, other_2 = result["others"]
-            assert len(cuts) == 3, "Should have 3 cut points"
-            assert (
-                (k in POSSIBLE_PIECE_NUMBER)
-                and (k_prime in POSSIBLE_PIECE_NUMBER)
-                and (other_1 in POSSIBLE_PIECE_NUMBER)
-                and (other_2 in POSSIBLE_PIECE_NUMBER)
-                and (k != k_prime)
-                and (k != other_1)
-                and (k != other_2)
-                and (k_prime != other_1)
-                and (k_prime != other_2)
-                and (other_1 != other_2)
-            ), "Invalid k"
-
-            start_k, end_k = get_range_by_cuts(
-                cuts=cuts, k=k, cake_size=to_decimal(cake_size)
+def _condition_b_jobs(
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> List[Tuple]:
+    """
+    Arguments of `_check_candidate_for_condition_b` per agent i and (k, k'),
+    in the order they used to be tried.
+    """
+    backend = get_backend().name
+    verification = get_verification().level
+    return [
+        (i, k, k_prime, others)
+        + (alpha, preferences, cake_size, epsilon, tolerance)
+        + (backend, verification)
+        for i in range(1, len(preferences))
+        for k, k_prime, others in POSSIBLE_K_AND_K_PRIME_COMBINATION_ON_CONDITION_B
+    ]
+
+
+def _check_candidate_for_condition_b(
+    i: int,
+    k: int,
+    k_prime: int,
+    others: List[int],
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+    backend: str,
+    verification: str,
+) -> Union[Dict[str, Any], Rejected]:
+    """
+    Cuts, k and k' if agent 1 and agent i can cut the cake so that conditions
+    i-iv hold for pieces k and k', else why not. Runs in a worker process when
+    there is a pool, hence the explicit backend and verification level.
+    """
+    candidate = f"condition B, agent {i}, (k, k')=({k}, {k_prime})"
+    arguments = dict(
+        candidate=candidate,
+        i=i,
+        k=k,
+        k_prime=k_prime,
+        others=others,
+        alpha=alpha,
+        preferences=preferences,
+        cake_size=cake_size,
+        epsilon=epsilon,
+        tolerance=tolerance,
+    )
+    # The sampled checks of a candidate do not depend on the ones before it,
+    # which may have run in other processes
+    with use_backend(backend), use_verification(verification, fresh=True):
+        with valuation_notebook(), implicit_cut_tables():
+            reason = _prescreen_condition_b(
+                i, k, k_prime, others, alpha, preferences, cake_size
             )
+            if reason is not None:
+                if should_verify("prescreen_b"):
+                    assert not _run_candidate_for_condition_b(**arguments), (
+                        f"{candidate}: pre-screen ruled out cuts that meet it, {reason}"
+                    )
+                logging.info(f"{candidate}: ruled out, {reason}")
+                return Rejected(candidate, reason)
+            return _run_candidate_for_condition_b(**arguments)
 
-            start_k_prime, end_k_prime = get_range_by_cuts(
-                cuts=cuts, k=k_prime, cake_size=to_decimal(cake_size)
-            )
 
-            start_other_1, end_other_1 = get_range_by_cuts(
-                cuts=cuts, k=other_1, cake_size=to_decimal(cake_size)
-            )
-            start_other_2, end_other_2 = get_range_by_cuts(
-                cuts=cuts, k=other_2, cake_size=to_decimal(cake_size)
-            )
+def _run_candidate_for_condition_b(
+    candidate: str,
+    i: int,
+    k: int,
+    k_prime: int,
+    others: List[int],
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> Union[Dict[str, Any], Rejected]:
+    """Cuts, k and k' the handler of (k, k') finds for agent i, or why it fails"""
+    cuts = _find_cuts_for_condition_b_handler(
+        k=k,
+        k_prime=k_prime,
+        alpha=alpha,
+        preference_1=preferences[0],
+        preference_i=preferences[i],
+        epsilon=epsilon,
+        cake_size=cake_size,
+        tolerance=tolerance,
+    )
+    if isinstance(cuts, Rejected):
+        return Rejected(candidate, cuts.reason)
+    if not _meets_condition_b(
+        i=i,
+        cuts=cuts,
+        k=k,
+        k_prime=k_prime,
+        others=others,
+        alpha=alpha,
+        preferences=preferences,
+        cake_size=cake_size,
+        epsilon=epsilon,
+        tolerance=tolerance,
+    ):
+        return Rejected(candidate, "conditions i-iv do not hold for the cuts")
+    return {"cuts": cuts, "k": k, "k_prime": k_prime}
 
-            # Check condition, if Ok, return.
-            # Otherwise, continue exploring.
 
-            # ii. (v_i(P_k′) =)v_i(P_k) >= max_t v_i(P_t), and
-            logging.error(
-                f"check Condition B, {k=}([{start_k}, {end_k}], {k_prime=}([{start_k_prime}, {end_k_prime}]), {other_1=}([{start_other_1}, {end_other_1}]), {other_2=}([{start_other_2}, {end_other_2}]), {cuts=}, {i=}"
-            )
-            k_value_i = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_i,
-                    epsilon=epsilon,
-                    start=start_k,
-                    end=end_k,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[i],
-            )
-            k_prime_value_i = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_i,
-                    epsilon=epsilon,
-                    start=start_k_prime,
-                    end=end_k_prime,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[i],
-            )
-            if not almost_equal(k_value_i, k_prime_value_i, tolerance):
-                logging.error(
-                    f"check Condition B: 1 fail, should be equal, {k_value_i=}, {k_prime_value_i=}"
-                )
-                continue
-            other_1_value_i = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_i,
-                    epsilon=epsilon,
-                    start=start_other_1,
-                    end=end_other_1,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[i],
-            )
-            other_2_value_i = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_i,
-                    epsilon=epsilon,
-                    start=start_other_2,
-                    end=end_other_2,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[i],
-            )
-            logging.error(
-                f"{other_1=}({start_other_1}-{end_other_1}): {other_1_value_i=}, {other_2=}({start_other_2}-{end_other_2}): {other_2_value_i=})"
-            )
-            others_max_value_i = max(other_1_value_i, other_2_value_i)
-            if not (
-                k_value_i >= others_max_value_i
-                and k_prime_value_i >= others_max_value_i
-            ):
-                logging.error(
-                    f"check Condition B: 1 fail, {k_value_i=} should > {others_max_value_i=}. {k_prime_value_i=} should > {others_max_value_i=}"
-                )
-                continue
-
-            # i. v_1(P_k) <= α and v_1(P_k′) <= α, and
-            k_value_1 = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_1,
-                    epsilon=epsilon,
-                    start=start_k,
-                    end=end_k,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[0],
-            )
-            k_prime_value_1 = de_norm(
-                v=get_double_prime_for_interval(
-                    segments=preference_1,
-                    epsilon=epsilon,
-                    start=start_k_prime,
-                    end=end_k_prime,
-                    cake_size=to_decimal(cake_size),
-                ),
-                whole_cake_value=whole_cake_values[0],
-            )
-            if not (k_value_1 <= alpha_de_norm and k_prime_value_1 <= alpha_de_norm):
-                logging.error(
-                    f"check Condition B: 2 fail, {k_value_1=} should < {alpha_de_norm=}. {k_prime_value_1=} should < {alpha_de_norm=}"
-                )
-                continue
-
-            # iii. there exists i′ ∈ {2, 3, 4} ∖ {i} such that v_i′(P_k) ≥ max_t v_i′(P_t), and
-            # iv. there exists i′ ∈ {2, 3, 4} ∖ {i} with v_i′(P_k′) ≥ max_t v_i′(P_t).
-            meet_last_two_conditions = 0
-            for j in range(1, len(preferences)):
-                if j == i:
-                    continue
-                preference_j = preferences[j]
-                other_1_value_j = de_norm(
-                    v=get_double_prime_for_interval(
-                        segments=preference_j,
-                        epsilon=epsilon,
-                        start=start_other_1,
-                        end=end_other_1,
-                        cake_size=to_decimal(cake_size),
-                    ),
-                    whole_cake_value=whole_cake_values[j],
-                )
-                other_2_value_j = de_norm(
-                    v=get_double_prime_for_interval(
-                        segments=preference_j,
-                        epsilon=epsilon,
-                        start=start_other_2,
-                        end=end_other_2,
-                        cake_size=to_decimal(cake_size),
-                    ),
-                    whole_cake_value=whole_cake_values[j],
-                )
-                others_max_value_j = max(other_1_value_j, other_2_value_j)
-
-                k_value_j = de_norm(
-                    v=get_double_prime_for_interval(
-                        segments=preference_j,
-                        epsilon=epsilon,
-                        start=start_k,
-                        end=end_k,
-                        cake_size=to_decimal(cake_size),
-                    ),
-                    whole_cake_value=whole_cake_values[j],
-                )
-                k_prime_value_j = de_norm(
-                    v=get_double_prime_for_interval(
-                        segments=preference_j,
-                        epsilon=epsilon,
-                        start=start_k_prime,
-                        end=end_k_prime,
-                        cake_size=to_decimal(cake_size),
-                    ),
-                    whole_cake_value=whole_cake_values[j],
-                )
-                logging.warning(f"Check Condition B last two conditions: {j=}")
-                if k_value_j >= others_max_value_j:
-                    logging.warning(
-                        f"Check Condition B {k_value_j=} >= {others_max_value_j} oooooooooooookkkkkkkkkkkk"
-                    )
-                    meet_last_two_conditions += 1
-                if k_prime_value_j >= others_max_value_j:
-                    logging.warning(
-                        f"Check Condition B {k_prime_value_j=} >= {others_max_value_j} oooooooooooooooookkkkkkkkkkkk"
-                    )
-                    meet_last_two_conditions += 1
-            logging.warning(f"Check Condition B: {meet_last_two_conditions=}")
-            if meet_last_two_conditions >= 2:
-                logging.warning(
-                    f"Check Condition B: {meet_last_two_conditions=} ooooooooooooooooookkkkkkkkkkkkkk"
-                )
-                return (True, {"cuts": cuts, "k": k, "k_prime": k_prime})
-    return (False, {})
+def _meets_condition_b(
+    i: int,
+    cuts: List[Decimal],
+    k: int,
+    k_prime: int,
+    others: List[int],
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    epsilon: Decimal,
+    tolerance: Decimal,
+) -> bool:
+    """
+    Conditions i-iv of condition B for pieces k and k' of `cuts`, agent i.
+
+    All of them are read off one agent x piece matrix of v'' values.
+    """
+    other_1: int
+    other_2: int
+    other_1, other_2 = others
+    assert len(cuts) == 3, "Should have 3 cut points"
+    assert (
+        (k in POSSIBLE_PIECE_NUMBER)
+        and (k_prime in POSSIBLE_PIECE_NUMBER)
+        and (other_1 in POSSIBLE_PIECE_NUMBER)
+        and (other_2 in POSSIBLE_PIECE_NUMBER)
+        and (k != k_prime)
+        and (k != other_1)
+        and (k != other_2)
+        and (k_prime != other_1)
+        and (k_prime != other_2)
+        and (other_1 != other_2)
+    ), "Invalid k"
+
+    logging.error(
+        f"check Condition B, {k=}, {k_prime=}, {other_1=}, {other_2=}, {cuts=}, {i=}"
+    )
+    values = get_value_matrix(preferences, cuts, cake_size, epsilon)
+
+    # ii. (v_i(P_k′) =)v_i(P_k) >= max_t v_i(P_t), and
+    k_value_i = de_norm(
+        v=values[i][k], whole_cake_value=get_whole_cake_value(preferences[i], cake_size)
+    )
+    k_prime_value_i = de_norm(
+        v=values[i][k_prime],
+        whole_cake_value=get_whole_cake_value(preferences[i], cake_size),
+    )
+    if not almost_equal(k_value_i, k_prime_value_i, tolerance):
+        logging.error(
+            f"check Condition B: 1 fail, should be equal, {k_value_i=}, {k_prime_value_i=}"
+        )
+        return False
+    others_max_value_i = max(values[i][other_1], values[i][other_2])
+    if not (
+        values[i][k] >= others_max_value_i and values[i][k_prime] >= others_max_value_i
+    ):
+        logging.error(
+            f"check Condition B: 1 fail, v_i(P_k)={values[i][k]} and v_i(P_k')={values[i][k_prime]} should >= {others_max_value_i=}"
+        )
+        return False
+
+    # i. v_1(P_k) <= α and v_1(P_k′) <= α, and
+    if not (values[0][k] <= alpha and values[0][k_prime] <= alpha):
+        logging.error(
+            f"check Condition B: 2 fail, v_1(P_k)={values[0][k]} and v_1(P_k')={values[0][k_prime]} should <= {alpha=}"
+        )
+        return False
+
+    # iii. there exists i′ ∈ {2, 3, 4} ∖ {i} such that v_i′(P_k) ≥ max_t v_i′(P_t), and
+    # iv. there exists i′ ∈ {2, 3, 4} ∖ {i} with v_i′(P_k′) ≥ max_t v_i′(P_t).
+    meet_last_two_conditions = 0
+    for j in range(1, len(preferences)):
+        if j == i:
+            continue
+        others_max_value_j = max(values[j][other_1], values[j][other_2])
+        if values[j][k] >= others_max_value_j:
+            meet_last_two_conditions += 1
+        if values[j][k_prime] >= others_max_value_j:
+            meet_last_two_conditions += 1
+    logging.warning(f"Check Condition B: {meet_last_two_conditions=}")
+    return meet_last_two_conditions >= 2
 
 
 def _handle_adjacent(
@@ -291,7 +283,7 @@ def _handle_adjacent(
             preference=preference_1,
             cake_size=cake_size,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=cake_size,
             target=alpha,
             tolerance=tolerance,
@@ -301,7 +293,7 @@ def _handle_adjacent(
             preference=preference_1,
             cake_size=cake_size,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=r,
             target=alpha,
             tolerance=tolerance,
@@ -311,29 +303,29 @@ def _handle_adjacent(
             preference=preference_i,
             cake_size=cake_size,
             epsilon=epsilon,
-            left=to_decimal(0),
+            left=to_number(0),
             right=m,
             tolerance=tolerance,
         )
 
-        # NOTE: For testing
-        first_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=to_decimal(0),
-            end=l,
-            cake_size=to_decimal(cake_size),
-        )
-        second_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=l,
-            end=m,
-            cake_size=to_decimal(cake_size),
-        )
-        assert almost_equal(
-            first_half_value, second_half_value, tolerance=to_decimal("1e-1")
-        ), f"_handle_adjacent_0_1: Should have almost the same value under the view of agent i, got {first_half_value}([0, {l}]) and {second_half_value}([{l}, {m}])"
+        if should_verify("handle_adjacent"):
+            first_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=to_number(0),
+                end=l,
+                cake_size=to_number(cake_size),
+            )
+            second_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=l,
+                end=m,
+                cake_size=to_number(cake_size),
+            )
+            assert almost_equal(
+                first_half_value, second_half_value, tolerance=to_number("1e-1")
+            ), f"_handle_adjacent_0_1: Should have almost the same value under the view of agent i, got {first_half_value}([0, {l}]) and {second_half_value}([{l}, {m}])"
 
         return [l, m, r]
     # if k, k' = (1, 2)
@@ -345,7 +337,7 @@ def _handle_adjacent(
             preference=preference_1,
             cake_size=cake_size,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=cake_size,
             target=alpha,
             tolerance=tolerance,
@@ -370,24 +362,24 @@ def _handle_adjacent(
             tolerance=tolerance,
         )
 
-        # NOTE: For testing
-        first_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=l,
-            end=m,
-            cake_size=to_decimal(cake_size),
-        )
-        second_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=m,
-            end=r,
-            cake_size=to_decimal(cake_size),
-        )
-        assert almost_equal(
-            first_half_value, second_half_value, tolerance=to_decimal("1e-1")
-        ), f"_handle_adjacent_1_2: Should have almost the same value under the view of agent i, got {first_half_value}([{l}, {m}]) and {second_half_value}([{m}, {r}])"
+        if should_verify("handle_adjacent"):
+            first_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=l,
+                end=m,
+                cake_size=to_number(cake_size),
+            )
+            second_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=m,
+                end=r,
+                cake_size=to_number(cake_size),
+            )
+            assert almost_equal(
+                first_half_value, second_half_value, tolerance=to_number("1e-1")
+            ), f"_handle_adjacent_1_2: Should have almost the same value under the view of agent i, got {first_half_value}([{l}, {m}]) and {second_half_value}([{m}, {r}])"
 
         return [l, m, r]
     # if k, k' = (2, 3)
@@ -399,8 +391,8 @@ def _handle_adjacent(
             preference=preference_1,
             cake_size=cake_size,
             epsilon=epsilon,
-            start=to_decimal(0),
-            end=to_decimal(cake_size),
+            start=to_number(0),
+            end=to_number(cake_size),
             target=alpha,
             tolerance=tolerance,
         )
@@ -410,7 +402,7 @@ def _handle_adjacent(
             cake_size=cake_size,
             epsilon=epsilon,
             start=l,
-            end=to_decimal(cake_size),
+            end=to_number(cake_size),
             target=alpha,
             tolerance=tolerance,
         )
@@ -420,28 +412,28 @@ def _handle_adjacent(
             cake_size=cake_size,
             epsilon=epsilon,
             left=m,
-            right=to_decimal(cake_size),
+            right=to_number(cake_size),
             tolerance=tolerance,
         )
 
-        # NOTE: For testing
-        first_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=m,
-            end=r,
-            cake_size=to_decimal(cake_size),
-        )
-        second_half_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=r,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
-        )
-        assert almost_equal(
-            first_half_value, second_half_value, tolerance=to_decimal("1e-1")
-        ), f"_handle_adjacent_2_3: Should have almost the same value under the view of agent i, got {first_half_value}([{m}, {r}]) and {second_half_value}([{r}, {cake_size}])"
+        if should_verify("handle_adjacent"):
+            first_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=m,
+                end=r,
+                cake_size=to_number(cake_size),
+            )
+            second_half_value = get_double_prime_for_interval(
+                segments=preference_i,
+                epsilon=epsilon,
+                start=r,
+                end=to_number(cake_size),
+                cake_size=to_number(cake_size),
+            )
+            assert almost_equal(
+                first_half_value, second_half_value, tolerance=to_number("1e-1")
+            ), f"_handle_adjacent_2_3: Should have almost the same value under the view of agent i, got {first_half_value}([{m}, {r}]) and {second_half_value}([{r}, {cake_size}])"
 
         return [l, m, r]
     else:
@@ -455,18 +447,19 @@ def _find_m_given_l(
     preference_1: List[Segment],
     cake_size: Decimal,
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> Decimal:
     """find m given l: m(l), so that v_1(l, m(l)) = alpha (second piece)"""
-    return _binary_search_left_to_right(
+    m_for_l = _binary_search_left_to_right(
         preference=preference_1,
         cake_size=cake_size,
         epsilon=epsilon,
-        start=to_decimal(l).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        end=to_decimal(r),
+        start=quantize(l, "0.00000001", ROUND_UP),
+        end=to_number(r),
         target=alpha,
         tolerance=tolerance,
-    ).quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    )
+    return quantize(m_for_l, "0.00000001", ROUND_UP)
 
 
 def _binary_search_case_0_2(
@@ -477,18 +470,15 @@ def _binary_search_case_0_2(
     l_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
 ) -> Tuple[Decimal, Decimal]:
-    tolerance = to_decimal("1e-7")
-    original_l_end = to_decimal(l_end)  # namely r
-    iteration = 0
-    m_for_l = to_decimal(0)
-    retry = 5
-
-    while l_end - l_start > tolerance and iteration < max_iterations:
-        l = (l_start + l_end) / 4 if iteration == 0 else (l_start + l_end) / 2
-        m_for_l = _find_m_given_l(
+    tolerance = to_number("1e-7")
+    original_l_end = to_number(l_end)  # namely r
+    m_for_ls: Dict[Decimal, Decimal] = {}
+
+    def find_m(l: Decimal) -> Decimal:
+        return _find_m_given_l(
             l=l,
             r=original_l_end,
             alpha=alpha,
@@ -498,40 +488,39 @@ def _binary_search_case_0_2(
             tolerance=tolerance,
         )
 
+    def balance(l: Decimal) -> Optional[Decimal]:
+        m_for_l = find_m(l)
         if not (l <= m_for_l <= original_l_end):
-            # Adjust l more aggressively if m is out of bounds
-            l_end /= 2
-            retry -= 1
-            if retry <= 0:
-                logging.error("_binary search case 0_2: exit early")
-                break
-            continue
-        a = get_double_prime_for_interval(
-            segments=preference_1,
-            epsilon=epsilon,
-            start=l,
-            end=m_for_l,
-            cake_size=to_decimal(cake_size),
-        )
-        b = get_double_prime_for_interval(
-            segments=preference_1,
-            epsilon=epsilon,
-            start=original_l_end,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
-        )
-        # TODO: DELETE LATER FOR TESTING
-        # give l, find m(l), where v_1([l, m(l)]) = alpha (second piece) = v_1([r, cake_size])
-        assert almost_equal(
-            a, b, tolerance=to_decimal("1e-1")
-        ), f"_binary search case 0_2: should be equal [l:{l}, m(l):{m_for_l}] = {a=}, [r:{original_l_end}, {cake_size}]{b=}, ({alpha=})"
+            # m is out of bounds, l is too far right
+            logging.error(f"_binary search case 0_2: m(l) out of bounds, {l=}, {m_for_l=}")
+            return None
+        m_for_ls[l] = m_for_l
+        if should_verify("case_0_2"):
+            a = get_double_prime_for_interval(
+                segments=preference_1,
+                epsilon=epsilon,
+                start=l,
+                end=m_for_l,
+                cake_size=to_number(cake_size),
+            )
+            b = get_double_prime_for_interval(
+                segments=preference_1,
+                epsilon=epsilon,
+                start=original_l_end,
+                end=to_number(cake_size),
+                cake_size=to_number(cake_size),
+            )
+            # give l, find m(l), where v_1([l, m(l)]) = alpha (second piece) = v_1([r, cake_size])
+            assert almost_equal(
+                a, b, tolerance=to_number("1e-1")
+            ), f"_binary search case 0_2: should be equal [l:{l}, m(l):{m_for_l}] = {a=}, [r:{original_l_end}, {cake_size}]{b=}, ({alpha=})"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=l,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         # Want v_i[(0, l)]= v_i[(m(l), r)]
@@ -540,26 +529,32 @@ def _binary_search_case_0_2(
             epsilon=epsilon,
             start=m_for_l,
             end=original_l_end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
-        # logging.info("***********")
-        # logging.warning("Handle_one_between: binary search")
-        # logging.warning(f"{l=}, {searched_value=}, {desired_value=} {l=}, {m_for_l=}")
-        # logging.info("***********")
-        if abs(searched_value - desired_value) <= tolerance:
-            return l, m_for_l
-
-        if searched_value < desired_value:
-            l_start = l
-        else:
-            l_end = l
-
-        iteration = iteration + 1
-    if iteration >= max_iterations:
+        return searched_value - desired_value
+
+    result = find_warm_root(
+        balance,
+        lower=to_number(l_start),
+        upper=original_l_end,
+        position_tolerance=tolerance,
+        value_tolerance=tolerance,
+        guess=(to_number(l_start) + original_l_end) / 4,
+        max_iterations=max_iterations,
+        key=(
+            "case_0_2",
+            preference_fingerprint(preference_1),
+            preference_fingerprint(preference_i),
+        ),
+        alpha=alpha,
+    )
+    if not result.converged:
         logging.warning(
-            f"binary search case 0_2: reach max iteration, {l_start=}, {l_end=}, {alpha=}"
+            f"binary search case 0_2: reach max iteration, {result.lower=}, {result.upper=}, {alpha=}"
         )
-    return to_decimal((l_start + l_end) / 2), m_for_l
+    l = to_number(result.x)
+    m_for_l = m_for_ls[l] if l in m_for_ls else find_m(l)
+    return l, m_for_l
 
 
 def _find_m_given_r(
@@ -569,18 +564,19 @@ def _find_m_given_r(
     preference_1: List[Segment],
     cake_size: Decimal,
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> Decimal:
     """find m given r: m(r), so that v_1(m(r), r) = alpha (third piece)"""
-    return _binary_search_right_to_left(
+    m_for_r = _binary_search_right_to_left(
         preference=preference_1,
         cake_size=cake_size,
         epsilon=epsilon,
-        start=to_decimal(l).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        end=to_decimal(r).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
+        start=quantize(l, "0.00000001", ROUND_UP),
+        end=quantize(r, "0.00000001", ROUND_UP),
         target=alpha,
         tolerance=tolerance,
-    ).quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    )
+    return quantize(m_for_r, "0.00000001", ROUND_UP)
 
 
 def _binary_search_case_1_3(
@@ -591,19 +587,17 @@ def _binary_search_case_1_3(
     r_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
 ) -> Tuple[Decimal, Decimal]:
     getcontext().prec = 15
-    tolerance = to_decimal("1e-7")
+    tolerance = to_number("1e-7")
 
-    original_r_start = to_decimal(r_start)  # namely l
-    iteration = 0
-    m_for_r = to_decimal(0)
+    original_r_start = to_number(r_start)  # namely l
+    m_for_rs: Dict[Decimal, Decimal] = {}
 
-    while r_end - r_start > tolerance and iteration < max_iterations:
-        r = (r_start + r_end) / 2
-        m_for_r = _find_m_given_r(
+    def find_m(r: Decimal) -> Decimal:
+        return _find_m_given_r(
             l=original_r_start,
             r=r,
             alpha=alpha,
@@ -612,32 +606,35 @@ def _binary_search_case_1_3(
             epsilon=epsilon,
             tolerance=tolerance,
         )
-        # TODO: DELETE LATER FOR TESTING
-        # give r, find m(r), where v_1([m(r), r]) = alpha (third piece) = v_1([(0, l)])
-        a = get_double_prime_for_interval(
-            segments=preference_1,
-            epsilon=epsilon,
-            start=m_for_r,
-            end=r,
-            cake_size=to_decimal(cake_size),
-        )
-        b = get_double_prime_for_interval(
-            segments=preference_1,
-            epsilon=epsilon,
-            start=to_decimal(0),
-            end=original_r_start,
-            cake_size=to_decimal(cake_size),
-        )
-        assert almost_equal(
-            a, b, tolerance=to_decimal("1e-1")
-        ), f"_binary search case 1_3: should be equal give {r=}, find m(r)={m_for_r}, where v_1([m(r), r])={a} = alpha={alpha} = v_1([(0, l)])={b}"
+
+    def balance(r: Decimal) -> Decimal:
+        m_for_r = m_for_rs[r] = find_m(r)
+        if should_verify("case_1_3"):
+            # give r, find m(r), where v_1([m(r), r]) = alpha (third piece) = v_1([(0, l)])
+            a = get_double_prime_for_interval(
+                segments=preference_1,
+                epsilon=epsilon,
+                start=m_for_r,
+                end=r,
+                cake_size=to_number(cake_size),
+            )
+            b = get_double_prime_for_interval(
+                segments=preference_1,
+                epsilon=epsilon,
+                start=to_number(0),
+                end=original_r_start,
+                cake_size=to_number(cake_size),
+            )
+            assert almost_equal(
+                a, b, tolerance=to_number("1e-1")
+            ), f"_binary search case 1_3: should be equal give {r=}, find m(r)={m_for_r}, where v_1([m(r), r])={a} = alpha={alpha} = v_1([(0, l)])={b}"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=r,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
+            end=to_number(cake_size),
+            cake_size=to_number(cake_size),
         )
         logging.info("***********")
         logging.info(f"{r=}, {searched_value=}, {r=}, {cake_size=}")
@@ -649,20 +646,28 @@ def _binary_search_case_1_3(
             epsilon=epsilon,
             start=original_r_start,
             end=m_for_r,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
+        # v_i([r, cake_size]) shrinks as r moves right
+        return desired_value - searched_value
 
-        if abs(searched_value - desired_value) <= tolerance:
-            return m_for_r, r
-
-        if searched_value < desired_value:
-            r_end = r
-        else:
-            r_start = r
-
-        iteration = iteration + 1
-
-    return m_for_r, to_decimal((r_start + r_end) / 2)
+    result = find_warm_root(
+        balance,
+        lower=original_r_start,
+        upper=to_number(r_end),
+        position_tolerance=tolerance,
+        value_tolerance=tolerance,
+        max_iterations=max_iterations,
+        key=(
+            "case_1_3",
+            preference_fingerprint(preference_1),
+            preference_fingerprint(preference_i),
+        ),
+        alpha=alpha,
+    )
+    r = to_number(result.x)
+    m_for_r = m_for_rs[r] if r in m_for_rs else find_m(r)
+    return m_for_r, r
 
 
 def _handle_one_between(
@@ -673,9 +678,9 @@ def _handle_one_between(
     preference_i: List[Segment],
     epsilon: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> List[Decimal]:
-    # tolerance = to_decimal(1e-10)
+    # tolerance = to_number(1e-10)
     getcontext().prec = 15
     # if k, k' = (0, 2)
     #    0        1        2            3
@@ -689,12 +694,12 @@ def _handle_one_between(
                 preference=preference_1,
                 cake_size=cake_size,
                 epsilon=epsilon,
-                start=to_decimal(0),
-                end=to_decimal(cake_size),
+                start=to_number(0),
+                end=to_number(cake_size),
                 target=alpha,
                 tolerance=tolerance,
             )
-            l_start = to_decimal(0)
+            l_start = to_number(0)
             l_end = r
             l, m = _binary_search_case_0_2(
                 preference_1=preference_1,
@@ -703,7 +708,7 @@ def _handle_one_between(
                 l_start=l_start,
                 l_end=l_end,
                 alpha=alpha,
-                cake_size=to_decimal(cake_size),
+                cake_size=to_number(cake_size),
                 tolerance=tolerance,
             )
             # m = _find_m_given_l(
@@ -730,22 +735,22 @@ def _handle_one_between(
                 preference=preference_1,
                 cake_size=cake_size,
                 epsilon=epsilon,
-                start=to_decimal(0),
+                start=to_number(0),
                 end=cake_size,
                 target=alpha,
                 tolerance=tolerance,
             )
-            l = l.quantize(Decimal("0.00000001"), rounding=ROUND_DOWN)
+            l = quantize(l, "0.00000001", ROUND_DOWN)
 
-            r_start = to_decimal(l)
-            r_end = to_decimal(cake_size)
+            r_start = to_number(l)
+            r_end = to_number(cake_size)
             m, r = _binary_search_case_1_3(
                 preference_1=preference_1,
                 preference_i=preference_i,
                 epsilon=epsilon,
                 r_start=r_start,
                 r_end=r_end,
-                cake_size=to_decimal(cake_size),
+                cake_size=to_number(cake_size),
                 alpha=alpha,
                 tolerance=tolerance,
             )
@@ -771,33 +776,45 @@ def _find_m_and_r_given_l(
     alpha: Decimal,
     preference_1: List[Segment],
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> List[Decimal]:
     getcontext().prec = 15
 
     """find m and r given l: m(l) and r(l), so that v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha"""
-    m_for_l = _binary_search_left_to_right(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(l).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        end=to_decimal(cake_size),
-        target=alpha,
-        tolerance=tolerance,
-    )
-    m_for_l = m_for_l.quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    l = quantize(l, "0.00000001", ROUND_UP)
 
-    r_for_l = _binary_search_left_to_right(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(m_for_l).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        end=to_decimal(cake_size),
-        target=alpha,
-        tolerance=tolerance,
-    )
+    def search() -> List[Decimal]:
+        m_for_l = _binary_search_left_to_right(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=l,
+            end=to_number(cake_size),
+            target=alpha,
+            tolerance=tolerance,
+        )
+        m_for_l = quantize(m_for_l, "0.00000001", ROUND_UP)
 
-    return [m_for_l, r_for_l]
+        r_for_l = _binary_search_left_to_right(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=quantize(m_for_l, "0.00000001", ROUND_UP),
+            end=to_number(cake_size),
+            target=alpha,
+            tolerance=tolerance,
+        )
+
+        return [m_for_l, r_for_l]
+
+    return tabulated_cuts(
+        "m_and_r_given_l",
+        preference_1,
+        alpha,
+        l,
+        (to_number(cake_size), epsilon, tolerance),
+        search,
+    )
 
 
 def _binary_search_find_l(
@@ -808,52 +825,49 @@ def _binary_search_find_l(
     l_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
 ) -> Decimal:
     getcontext().prec = 15
-    tolerance = to_decimal(1e-5)
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
+    tolerance = to_number(1e-5)
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
 
-    iteration = 0
-
-    while l_end - l_start > tolerance and iteration < max_iterations:
-        l = (l_start + l_end) / 2
+    def balance(l: Decimal) -> Decimal:
         m_for_l, r_for_l = _find_m_and_r_given_l(
             l=l,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
-        # TODO: DELETE LATER FOR TESTING
-        # give l, find m(l) and r(l), where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l,
-                end=m_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_l,
-                end=r_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal(1e-1),
-        ), f"_binary_search_find_l: give {l=}, find m(l)={m_for_l} and r(l)={r_for_l}, where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha({alpha}), Should work"
+        if should_verify("find_l"):
+            # give l, find m(l) and r(l), where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l,
+                    end=m_for_l,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m_for_l,
+                    end=r_for_l,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=to_number(1e-1),
+            ), f"_binary_search_find_l: give {l=}, find m(l)={m_for_l} and r(l)={r_for_l}, where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha({alpha}), Should work"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=cake_start,
             end=l,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
@@ -866,20 +880,26 @@ def _binary_search_find_l(
             epsilon=epsilon,
             start=r_for_l,
             end=cake_end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            return l
-
-        if searched_value < desired_value:
-            l_start = l
-        else:
-            l_end = l
+        return searched_value - desired_value
 
-        iteration = iteration + 1
-
-    return to_decimal((l_start + l_end) / 2)
+    result = find_warm_root(
+        balance,
+        lower=to_number(l_start),
+        upper=to_number(l_end),
+        position_tolerance=tolerance,
+        value_tolerance=tolerance,
+        max_iterations=max_iterations,
+        key=(
+            "find_l",
+            preference_fingerprint(preference_1),
+            preference_fingerprint(preference_i),
+        ),
+        alpha=alpha,
+    )
+    return to_number(result.x)
 
 
 def _expand_range_around_l(
@@ -889,117 +909,53 @@ def _expand_range_around_l(
     epsilon: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> Tuple[Decimal, Decimal]:
     getcontext().prec = 15
-    tolerance = to_decimal(1e-5)
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
-
-    # Expand the range to find the lower bound
-    lower_bound = found_l
-    while lower_bound - epsilon >= cake_start:
-        lower_bound_candidate = lower_bound - epsilon
-        m_for_l, r_for_l = _find_m_and_r_given_l(
-            l=lower_bound_candidate,
-            cake_size=to_decimal(cake_size),
-            alpha=alpha,
-            preference_1=preference_1,
-            epsilon=epsilon,
-            tolerance=tolerance,
-        )
-
-        # TODO: DELETE LATER FOR TESTING
-        # give l, find m(l) and r(l), where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=lower_bound_candidate,
-                end=m_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_l,
-                end=r_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=tolerance,
-        ), f"_expand_range_around_l lower bound part: give {found_l=}, find m(l)={m_for_l} and r(l)={r_for_l}, where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha({alpha}), Should work"
-
-        searched_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=cake_start,
-            end=lower_bound_candidate,
-            cake_size=to_decimal(cake_size),
-        )
-
-        logging.info("***********")
-        logging.info(
-            f"{lower_bound_candidate=}, {searched_value=}, {cake_start=}, {lower_bound_candidate=}"
-        )
-        logging.info("***********")
-
-        # Want v_i([0, l])= v_i([(r(l), cake_size])
-        desired_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=r_for_l,
-            end=cake_end,
-            cake_size=to_decimal(cake_size),
-        )
-
-        if abs(searched_value - desired_value) <= tolerance:
-            lower_bound = lower_bound_candidate
-        else:
-            break
+    tolerance = to_number(1e-5)
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
 
-    # Expand the range to find the upper bound
-    upper_bound = found_l
-    while upper_bound + epsilon <= cake_end:
-        upper_bound_candidate = upper_bound + epsilon
+    def feasible(l: Decimal) -> bool:
         m_for_l, r_for_l = _find_m_and_r_given_l(
-            l=upper_bound_candidate,
-            cake_size=to_decimal(cake_size),
+            l=l,
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
 
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=upper_bound_candidate,
-                end=m_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_l,
-                end=r_for_l,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=tolerance,
-        ), f"_expand_range_around_l upper bound part: give {found_l=}, find m(l)={m_for_l} and r(l)={r_for_l}, where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha({alpha}), Should work"
+        if should_verify("expand_l"):
+            # give l, find m(l) and r(l), where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l,
+                    end=m_for_l,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m_for_l,
+                    end=r_for_l,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=tolerance,
+            ), f"_expand_range_around_l: give {found_l=}, find m(l)={m_for_l} and r(l)={r_for_l}, where v_1([l, m(l)]) = v_1([m(l), r(l)]) = alpha({alpha}), Should work"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=cake_start,
-            end=upper_bound_candidate,
-            cake_size=to_decimal(cake_size),
+            end=l,
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
-        logging.info(
-            f"{upper_bound_candidate=}, {searched_value=}, {cake_start=}, {upper_bound_candidate=}"
-        )
+        logging.info(f"{l=}, {searched_value=}, {cake_start=}, {l=}")
         logging.info("***********")
 
         # Want v_i([0, l])= v_i([(r(l), cake_size])
@@ -1008,15 +964,14 @@ def _expand_range_around_l(
             epsilon=epsilon,
             start=r_for_l,
             end=cake_end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            upper_bound = upper_bound_candidate
-        else:
-            break
+        return abs(searched_value - desired_value) <= tolerance
 
-    return lower_bound, upper_bound
+    return expand_feasible_range(
+        feasible, centre=found_l, step=epsilon, lower=cake_start, upper=cake_end
+    )
 
 
 def _find_range_l(
@@ -1027,7 +982,7 @@ def _find_range_l(
     l_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
 ) -> Tuple[Decimal, Decimal]:
     found_l = _binary_search_find_l(
@@ -1061,32 +1016,44 @@ def _find_l_and_m_given_r(
     alpha: Decimal,
     preference_1: List[Segment],
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> List[Decimal]:
     """find l and m given r: l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha"""
-    m_for_r = _binary_search_right_to_left(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(0),
-        end=to_decimal(r).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        target=alpha,
-        tolerance=tolerance,
-    )
-    m_for_r = m_for_r.quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    r = quantize(r, "0.00000001", ROUND_UP)
 
-    l_for_r = _binary_search_right_to_left(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(0),
-        end=to_decimal(m_for_r).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        target=alpha,
-        tolerance=tolerance,
-    )
-    l_for_r = l_for_r.quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+    def search() -> List[Decimal]:
+        m_for_r = _binary_search_right_to_left(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=to_number(0),
+            end=r,
+            target=alpha,
+            tolerance=tolerance,
+        )
+        m_for_r = quantize(m_for_r, "0.00000001", ROUND_UP)
+
+        l_for_r = _binary_search_right_to_left(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=to_number(0),
+            end=quantize(m_for_r, "0.00000001", ROUND_UP),
+            target=alpha,
+            tolerance=tolerance,
+        )
+        l_for_r = quantize(l_for_r, "0.01", ROUND_DOWN)
 
-    return [l_for_r, m_for_r]
+        return [l_for_r, m_for_r]
+
+    return tabulated_cuts(
+        "l_and_m_given_r",
+        preference_1,
+        alpha,
+        r,
+        (to_number(cake_size), epsilon, tolerance),
+        search,
+    )
 
 
 def _binary_search_find_r(
@@ -1097,51 +1064,49 @@ def _binary_search_find_r(
     r_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
+    bracket: Optional[Tuple[Decimal, Decimal]] = None,
 ) -> Decimal:
-    tolerance = to_decimal(1e-5)
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
+    tolerance = to_number(1e-5)
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
 
-    iteration = 0
-
-    while r_end - r_start > tolerance and iteration < max_iterations:
-        r = (r_start + r_end) / 2
+    def balance(r: Decimal) -> Decimal:
         l_for_r, m_for_r = _find_l_and_m_given_r(
             r=r,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
-        # TODO: DELETE LATER FOR TESTING
-        # give r, find l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_r,
-                end=m_for_r,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_r,
-                end=r,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_binary_search_find_r: give {r=}, find l(r)={l_for_r} and m(r)={m_for_r}, so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha({alpha}, Should work)"
+        if should_verify("find_r"):
+            # give r, find l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l_for_r,
+                    end=m_for_r,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m_for_r,
+                    end=r,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=to_number("1e-1"),
+            ), f"_binary_search_find_r: give {r=}, find l(r)={l_for_r} and m(r)={m_for_r}, so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha({alpha}, Should work)"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=r,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
+            end=to_number(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
@@ -1152,22 +1117,30 @@ def _binary_search_find_r(
         desired_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=l_for_r,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            return r
-
-        if searched_value < desired_value:
-            r_end = r
-        else:
-            r_start = r
+        # v_i([r, cake_size]) shrinks as r moves right
+        return desired_value - searched_value
 
-        iteration = iteration + 1
-
-    return to_decimal((r_start + r_end) / 2)
+    result = find_warm_root(
+        balance,
+        lower=to_number(r_start),
+        upper=to_number(r_end),
+        position_tolerance=tolerance,
+        value_tolerance=tolerance,
+        max_iterations=max_iterations,
+        key=(
+            "find_r",
+            preference_fingerprint(preference_1),
+            preference_fingerprint(preference_i),
+        ),
+        alpha=alpha,
+        bracket=bracket,
+    )
+    return to_number(result.x)
 
 
 def _expand_range_around_r(
@@ -1177,135 +1150,68 @@ def _expand_range_around_r(
     epsilon: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> Tuple[Decimal, Decimal]:
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
-    tolerance = to_decimal("1e-7")
-
-    # Expand the range to find the lower bound
-    lower_bound = found_r
-    while lower_bound - epsilon >= cake_start:
-        lower_bound_candidate = lower_bound - epsilon
-        l_for_r, m_for_r = _find_l_and_m_given_r(
-            r=lower_bound_candidate,
-            cake_size=to_decimal(cake_size),
-            alpha=alpha,
-            preference_1=preference_1,
-            epsilon=epsilon,
-            tolerance=tolerance,
-        )
-
-        # TODO: DELETE LATER FOR TESTING
-        # give r, find l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_r,
-                end=m_for_r,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_r,
-                end=lower_bound_candidate,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_expand_range_around_r lower bound part: give {found_r=}, find l(r)={l_for_r} and m(r)={m_for_r}, so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha({alpha}, Should work)"
-
-        searched_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=lower_bound_candidate,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
-        )
-
-        logging.info("***********")
-        logging.info(
-            f"{lower_bound_candidate=}, {searched_value=}, {lower_bound_candidate=}, {cake_size=}"
-        )
-        logging.info("***********")
-
-        # Want v_i([0, l(r)])= v_i([(r, cake_size])
-        desired_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=to_decimal(0),
-            end=l_for_r,
-            cake_size=to_decimal(cake_size),
-        )
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
+    tolerance = to_number("1e-7")
 
-        if abs(searched_value - desired_value) <= tolerance:
-            lower_bound = lower_bound_candidate
-        else:
-            break
-
-    # Expand the range to find the upper bound
-    upper_bound = found_r
-    while upper_bound + epsilon <= cake_end:
-        upper_bound_candidate = upper_bound + epsilon
+    def feasible(r: Decimal) -> bool:
         l_for_r, m_for_r = _find_l_and_m_given_r(
-            r=upper_bound_candidate,
-            cake_size=to_decimal(cake_size),
+            r=r,
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
 
-        # TODO: DELETE LATER FOR TESTING
-        # give r, find l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_r,
-                end=m_for_r,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m_for_r,
-                end=upper_bound_candidate,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_expand_range_around_r upper bound part: give {found_r=}, find l(r)={l_for_r} and m(r)={m_for_r}, so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha({alpha}, Should work)"
+        if should_verify("expand_r"):
+            # give r, find l(r) and m(r), so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l_for_r,
+                    end=m_for_r,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m_for_r,
+                    end=r,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=to_number("1e-1"),
+            ), f"_expand_range_around_r: give {found_r=}, find l(r)={l_for_r} and m(r)={m_for_r}, so that v_1([l(r), m(r)]) = v_1([m(r), r]) = alpha({alpha}, Should work)"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
-            start=upper_bound_candidate,
-            end=to_decimal(cake_size),
-            cake_size=to_decimal(cake_size),
+            start=r,
+            end=to_number(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
-        logging.info(
-            f"{upper_bound_candidate=}, {searched_value=}, {upper_bound_candidate=}, {cake_size=}"
-        )
+        logging.info(f"{r=}, {searched_value=}, {r=}, {cake_size=}")
         logging.info("***********")
 
         # Want v_i([0, l(r)])= v_i([(r, cake_size])
         desired_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
-            start=to_decimal(0),
+            start=to_number(0),
             end=l_for_r,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            upper_bound = upper_bound_candidate
-        else:
-            break
+        return abs(searched_value - desired_value) <= tolerance
 
-    return lower_bound, upper_bound
+    return expand_feasible_range(
+        feasible, centre=found_r, step=epsilon, lower=cake_start, upper=cake_end
+    )
 
 
 def _find_range_r(
@@ -1316,8 +1222,9 @@ def _find_range_r(
     r_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
+    bracket: Optional[Tuple[Decimal, Decimal]] = None,
 ) -> Tuple[Decimal, Decimal]:
     found_l = _binary_search_find_r(
         preference_1=preference_1,
@@ -1329,6 +1236,7 @@ def _find_range_r(
         cake_size=cake_size,
         tolerance=tolerance,
         max_iterations=max_iterations,
+        bracket=bracket,
     )
 
     lower_bound, upper_bound = _expand_range_around_r(
@@ -1350,32 +1258,44 @@ def _find_l_and_r_given_m(
     alpha: Decimal,
     preference_1: List[Segment],
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> List[Decimal]:
     """find l and r given m: l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha"""
-    l_for_m = _binary_search_right_to_left(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(0),
-        end=to_decimal(m).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        target=alpha,
-        tolerance=tolerance,
-    )
-    l_for_m = l_for_m.quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    m = quantize(m, "0.00000001", ROUND_UP)
 
-    r_for_m = _binary_search_left_to_right(
-        preference=preference_1,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=to_decimal(m).quantize(Decimal("0.00000001"), rounding=ROUND_UP),
-        end=to_decimal(cake_size),
-        target=alpha,
-        tolerance=tolerance,
-    )
-    r_for_m = r_for_m.quantize(Decimal("0.00000001"), rounding=ROUND_UP)
+    def search() -> List[Decimal]:
+        l_for_m = _binary_search_right_to_left(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=to_number(0),
+            end=m,
+            target=alpha,
+            tolerance=tolerance,
+        )
+        l_for_m = quantize(l_for_m, "0.00000001", ROUND_UP)
+
+        r_for_m = _binary_search_left_to_right(
+            preference=preference_1,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            start=m,
+            end=to_number(cake_size),
+            target=alpha,
+            tolerance=tolerance,
+        )
+        r_for_m = quantize(r_for_m, "0.00000001", ROUND_UP)
+
+        return [l_for_m, r_for_m]
 
-    return [l_for_m, r_for_m]
+    return tabulated_cuts(
+        "l_and_r_given_m",
+        preference_1,
+        alpha,
+        m,
+        (to_number(cake_size), epsilon, tolerance),
+        search,
+    )
 
 
 def _binary_search_find_m(
@@ -1386,51 +1306,49 @@ def _binary_search_find_m(
     m_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
+    bracket: Optional[Tuple[Decimal, Decimal]] = None,
 ) -> Decimal:
-    tolerance = to_decimal("1e-7")
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
-
-    iteration = 0
+    tolerance = to_number("1e-7")
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
 
-    while m_end - m_start > tolerance and iteration < max_iterations:
-        m = (m_start + m_end) / 2
+    def balance(m: Decimal) -> Decimal:
         l_for_m, r_for_m = _find_l_and_r_given_m(
             m=m,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
-        # TODO: DELETE LATER FOR TESTING
-        # give m, l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_m,
-                end=m,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=m,
-                end=r_for_m,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_binary_search_find_m: give {m=}, l(m)={l_for_m=} and r(m)={r_for_m}, so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha({alpha}), Should work"
+        if should_verify("find_m"):
+            # give m, l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l_for_m,
+                    end=m,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m,
+                    end=r_for_m,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=to_number("1e-1"),
+            ), f"_binary_search_find_m: give {m=}, l(m)={l_for_m=} and r(m)={r_for_m}, so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha({alpha}), Should work"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=cake_start,
             end=l_for_m,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
@@ -1443,20 +1361,27 @@ def _binary_search_find_m(
             epsilon=epsilon,
             start=r_for_m,
             end=cake_end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            return m
-
-        if searched_value < desired_value:
-            m_start = m
-        else:
-            m_end = m
-
-        iteration = iteration + 1
+        return searched_value - desired_value
 
-    return to_decimal((m_start + m_end) / 2)
+    result = find_warm_root(
+        balance,
+        lower=to_number(m_start),
+        upper=to_number(m_end),
+        position_tolerance=tolerance,
+        value_tolerance=tolerance,
+        max_iterations=max_iterations,
+        key=(
+            "find_m",
+            preference_fingerprint(preference_1),
+            preference_fingerprint(preference_i),
+        ),
+        alpha=alpha,
+        bracket=bracket,
+    )
+    return to_number(result.x)
 
 
 def _expand_range_around_m(
@@ -1466,118 +1391,52 @@ def _expand_range_around_m(
     epsilon: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
 ) -> Tuple[Decimal, Decimal]:
-    tolerance = to_decimal("1e-7")
-    cake_start = to_decimal(0)
-    cake_end = to_decimal(cake_size)
-
-    # Expand the range to find the lower bound
-    lower_bound = found_m
-    while lower_bound - epsilon >= cake_start:
-        lower_bound_candidate = lower_bound - epsilon
-        l_for_m, r_for_m = _find_l_and_r_given_m(
-            m=lower_bound_candidate,
-            cake_size=to_decimal(cake_size),
-            alpha=alpha,
-            preference_1=preference_1,
-            epsilon=epsilon,
-            tolerance=tolerance,
-        )
-
-        # TODO: DELETE LATER FOR TESTING
-        # give m, l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_m,
-                end=lower_bound_candidate,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=lower_bound_candidate,
-                end=r_for_m,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_expand_range_around_m lower bound part: give {found_m=}, l(m)={l_for_m=} and r(m)={r_for_m}, so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha({alpha}), Should work"
-
-        searched_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=cake_start,
-            end=l_for_m,
-            cake_size=to_decimal(cake_size),
-        )
-
-        logging.info("***********")
-        logging.info(
-            f"{lower_bound_candidate=}, {searched_value=}, {lower_bound_candidate=}, {cake_size=}"
-        )
-        logging.info("***********")
-
-        # Want v_i([0, l(m)])= v_i([(r(m), cake_size])
-        desired_value = get_double_prime_for_interval(
-            segments=preference_i,
-            epsilon=epsilon,
-            start=r_for_m,
-            end=cake_end,
-            cake_size=to_decimal(cake_size),
-        )
-
-        if abs(searched_value - desired_value) <= tolerance:
-            lower_bound = lower_bound_candidate
-        else:
-            break
+    tolerance = to_number("1e-7")
+    cake_start = to_number(0)
+    cake_end = to_number(cake_size)
 
-    # Expand the range to find the upper bound
-    upper_bound = found_m
-    while upper_bound + epsilon <= cake_end:
-        upper_bound_candidate = upper_bound + epsilon
+    def feasible(m: Decimal) -> bool:
         l_for_m, r_for_m = _find_l_and_r_given_m(
-            m=upper_bound_candidate,
-            cake_size=to_decimal(cake_size),
+            m=m,
+            cake_size=to_number(cake_size),
             alpha=alpha,
             preference_1=preference_1,
             epsilon=epsilon,
             tolerance=tolerance,
         )
 
-        # TODO: DELETE LATER FOR TESTING
-        # give m, l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha
-        assert almost_equal(
-            a=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=l_for_m,
-                end=upper_bound_candidate,
-                cake_size=to_decimal(cake_size),
-            ),
-            b=get_double_prime_for_interval(
-                segments=preference_1,
-                epsilon=epsilon,
-                start=upper_bound_candidate,
-                end=r_for_m,
-                cake_size=to_decimal(cake_size),
-            ),
-            tolerance=to_decimal("1e-1"),
-        ), f"_expand_range_around_m upper bound part: give {found_m=}, l(m)={l_for_m=} and r(m)={r_for_m}, so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha({alpha}), Should work"
+        if should_verify("expand_m"):
+            # give m, l(m) and r(m), so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha
+            assert almost_equal(
+                a=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=l_for_m,
+                    end=m,
+                    cake_size=to_number(cake_size),
+                ),
+                b=get_double_prime_for_interval(
+                    segments=preference_1,
+                    epsilon=epsilon,
+                    start=m,
+                    end=r_for_m,
+                    cake_size=to_number(cake_size),
+                ),
+                tolerance=to_number("1e-1"),
+            ), f"_expand_range_around_m: give {found_m=}, l(m)={l_for_m=} and r(m)={r_for_m}, so that v_1([l(m), m]) = v_1([m, r(m)]) = alpha({alpha}), Should work"
 
         searched_value = get_double_prime_for_interval(
             segments=preference_i,
             epsilon=epsilon,
             start=cake_start,
             end=l_for_m,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
         logging.info("***********")
-        logging.info(
-            f"{upper_bound_candidate=}, {searched_value=}, {cake_start=}, {l_for_m=}"
-        )
+        logging.info(f"{m=}, {searched_value=}, {m=}, {cake_size=}")
         logging.info("***********")
 
         # Want v_i([0, l(m)])= v_i([(r(m), cake_size])
@@ -1586,15 +1445,14 @@ def _expand_range_around_m(
             epsilon=epsilon,
             start=r_for_m,
             end=cake_end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         )
 
-        if abs(searched_value - desired_value) <= tolerance:
-            upper_bound = upper_bound_candidate
-        else:
-            break
+        return abs(searched_value - desired_value) <= tolerance
 
-    return lower_bound, upper_bound
+    return expand_feasible_range(
+        feasible, centre=found_m, step=epsilon, lower=cake_start, upper=cake_end
+    )
 
 
 def _find_range_m(
@@ -1605,10 +1463,11 @@ def _find_range_m(
     m_end: Decimal,
     alpha: Decimal,
     cake_size: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
+    bracket: Optional[Tuple[Decimal, Decimal]] = None,
 ) -> Tuple[Decimal, Decimal]:
-    tolerance = to_decimal("1e-7")
+    tolerance = to_number("1e-7")
 
     found_m = _binary_search_find_m(
         preference_1=preference_1,
@@ -1620,6 +1479,7 @@ def _find_range_m(
         cake_size=cake_size,
         tolerance=tolerance,
         max_iterations=max_iterations,
+        bracket=bracket,
     )
 
     lower_bound, upper_bound = _expand_range_around_m(
@@ -1661,41 +1521,88 @@ def _handle_leftmost_rightmost(
     tolerance: Decimal,
 ) -> List[Decimal]:
     getcontext().prec = 15
-    tolerance = to_decimal("1e-7")
+    tolerance = to_number("1e-7")
     try:
         lower_l, upper_l = _find_range_l(
             preference_1=preference_1,
             preference_i=preference_i,
             epsilon=epsilon,
-            l_start=to_decimal(0),
-            l_end=to_decimal(cake_size),
+            l_start=to_number(0),
+            l_end=to_number(cake_size),
             alpha=alpha,
             cake_size=cake_size,
             tolerance=tolerance,
         )
         logging.error(f"@@@@@@@@@@@@ {lower_l=}, {upper_l=}")
 
+        # m(l) and r(l) grow with l, so at the ends of the l range they bound
+        # where the r and m searches will end up. The l search has tabulated
+        # them there already (at its tolerance)
+        m_for_lower_l, r_for_lower_l = _find_m_and_r_given_l(
+            l=lower_l,
+            cake_size=cake_size,
+            alpha=alpha,
+            preference_1=preference_1,
+            epsilon=epsilon,
+            tolerance=to_number(1e-5),
+        )
+        m_for_upper_l, r_for_upper_l = _find_m_and_r_given_l(
+            l=upper_l,
+            cake_size=cake_size,
+            alpha=alpha,
+            preference_1=preference_1,
+            epsilon=epsilon,
+            tolerance=to_number(1e-5),
+        )
+
+        # l < m < r
         lower_r, upper_r = _find_range_r(
             preference_1=preference_1,
             preference_i=preference_i,
             epsilon=epsilon,
-            r_start=to_decimal(0),
-            r_end=to_decimal(cake_size),
+            r_start=lower_l,
+            r_end=to_number(cake_size),
             alpha=alpha,
             cake_size=cake_size,
             tolerance=tolerance,
+            bracket=(r_for_lower_l, r_for_upper_l),
         )
         logging.error(f"@@@@@@@@@@@@ {lower_r=}, {upper_r=}")
 
+        # Likewise l(r) and m(r) grow with r, the r range narrows m further
+        _, m_for_lower_r = _find_l_and_m_given_r(
+            r=lower_r,
+            cake_size=cake_size,
+            alpha=alpha,
+            preference_1=preference_1,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+        _, m_for_upper_r = _find_l_and_m_given_r(
+            r=upper_r,
+            cake_size=cake_size,
+            alpha=alpha,
+            preference_1=preference_1,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+        m_bracket = (
+            max(m_for_lower_l, m_for_lower_r),
+            min(m_for_upper_l, m_for_upper_r),
+        )
+        if m_bracket[0] > m_bracket[1]:
+            m_bracket = (m_for_lower_l, m_for_upper_l)
+
         lower_m, upper_m = _find_range_m(
             preference_1=preference_1,
             preference_i=preference_i,
             epsilon=epsilon,
-            m_start=to_decimal(0),
-            m_end=to_decimal(cake_size),
+            m_start=lower_l,
+            m_end=upper_r,
             alpha=alpha,
             cake_size=cake_size,
             tolerance=tolerance,
+            bracket=m_bracket,
         )
         logging.error(f"@@@@@@@@@@@@ {lower_m=}, {upper_m=}")
 
@@ -1721,11 +1628,11 @@ def _handle_leftmost_rightmost(
     #     l_end: Decimal,
     #     alpha: Decimal,
     #     cake_size: Decimal,
-    #     tolerance: Decimal = to_decimal(1e-10),
+    #     tolerance: Decimal = to_number(1e-10),
     #     max_iterations: int = 1000,
     # ) -> Decimal:
-    #     cake_start = to_decimal(0)
-    #     cake_end = to_decimal(cake_size)
+    #     cake_start = to_number(0)
+    #     cake_end = to_number(cake_size)
     #
     #     iteration = 0
     #
@@ -1733,7 +1640,7 @@ def _handle_leftmost_rightmost(
     #         l = (l_start + l_end) / 2
     #         m_for_l, r_for_l = find_m_and_r_given_l(
     #             l=l,
-    #             cake_size=to_decimal(cake_size),
+    #             cake_size=to_number(cake_size),
     #             alpha=alpha,
     #             preference_1=preference_1,
     #             epsilon=epsilon,
@@ -1782,7 +1689,7 @@ def _handle_leftmost_rightmost(
     #
     #         iteration = iteration + 1
     #
-    #     return to_decimal((l_start + l_end) / 2)
+    #     return to_number((l_start + l_end) / 2)
 
     # logging.info(f"Handling leftmost and rightmost: ({k}, {k_prime})")
 
@@ -1797,43 +1704,36 @@ CONDITION_B_HANDLERS = {
 }
 
 
-def _find_cuts_and_k_k_prime_for_agent_i_on_condition_b(
+def _find_cuts_for_condition_b_handler(
+    k: int,
+    k_prime: int,
     alpha: Decimal,
-    cake_size: Decimal,
     preference_1: List[Segment],
     preference_i: List[Segment],
     epsilon: Decimal,
-    tolerance: Decimal = to_decimal("1e-3"),
-) -> Dict[str, Any]:
-    alpha = to_decimal(alpha)
-    start = to_decimal(0)
-    end = to_decimal(cake_size)
-    epsilon = to_decimal(epsilon)
-    cake_size = to_decimal(cake_size)
-
-    for k, k_prime, others in POSSIBLE_K_AND_K_PRIME_COMBINATION_ON_CONDITION_B:
-        handler = CONDITION_B_HANDLERS.get((k, k_prime))
-        if handler:
-            try:
-                cuts: List[Decimal] = handler(
-                    k=k,
-                    k_prime=k_prime,
-                    alpha=alpha,
-                    preference_1=preference_1,
-                    preference_i=preference_i,
-                    epsilon=epsilon,
-                    cake_size=to_decimal(cake_size),
-                    tolerance=tolerance,
-                )
-                yield {"cuts": cuts, "k": k, "k_prime": k_prime, "others": others}
-            except Exception as e:
-                logging.error(
-                    f"Error processing handler for ({k}, {k_prime}), got handler: {handler}: \n\tError: {e}\n\t Keep exploreing"
-                )
-                continue
-
-        else:
-            raise ValueError(f"No handler for combination: ({k}, {k_prime})")
+    cake_size: Decimal,
+    tolerance: Decimal = to_number("1e-3"),
+) -> Union[List[Decimal], Rejected]:
+    """Cuts the handler of (k, k') finds, or why it fails"""
+    handler = CONDITION_B_HANDLERS.get((k, k_prime))
+    if not handler:
+        raise ValueError(f"No handler for combination: ({k}, {k_prime})")
+    try:
+        return handler(
+            k=k,
+            k_prime=k_prime,
+            alpha=to_number(alpha),
+            preference_1=preference_1,
+            preference_i=preference_i,
+            epsilon=to_number(epsilon),
+            cake_size=to_number(cake_size),
+            tolerance=tolerance,
+        )
+    except Exception as e:
+        logging.error(
+            f"Error processing handler for ({k}, {k_prime}), got handler: {handler}: \n\tError: {e}\n\t Keep exploreing"
+        )
+        return Rejected(f"({k}, {k_prime})", f"the handler failed: {e}")
 
 
 def find_allocation_on_condition_b(
@@ -1842,22 +1742,29 @@ def find_allocation_on_condition_b(
     cake_size: Decimal,
     epsilon: Decimal,
     tolerance: Decimal,
+    cuts: Optional[List[Decimal]] = None,
+    k: Optional[int] = None,
+    k_prime: Optional[int] = None,
 ) -> List[AssignedSlice]:
-
-    meet_b, info = check_condition_b(
-        alpha=alpha,
-        preferences=preferences,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        tolerance=tolerance,
-    )
-    assert (
-        meet_b is True
-    ), "find_allocation_on_condition_b: Should meet Condition B at this stage"
-    assert (
-        len(info) != 0
-    ), "find_allocation_on_condition_b: Should have necessary info at this stage"
-    cuts, k, k_prime = info["cuts"], info["k"], info["k_prime"]
+    """
+    Allocation from the cuts, k and k' that meet condition B at alpha. Without
+    them, condition B is checked again, or looked up in `condition_checks()`.
+    """
+    if cuts is None:
+        meet_b, info = check_condition_b(
+            alpha=alpha,
+            preferences=preferences,
+            cake_size=cake_size,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+        assert (
+            meet_b is True
+        ), "find_allocation_on_condition_b: Should meet Condition B at this stage"
+        assert (
+            len(info) != 0
+        ), "find_allocation_on_condition_b: Should have necessary info at this stage"
+        cuts, k, k_prime = info["cuts"], info["k"], info["k_prime"]
     logging.error(f"{cuts=}, {k=}, {k_prime=}")
 
     allocation = find_envy_free_allocation(
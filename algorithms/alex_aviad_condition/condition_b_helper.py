@@ -1,9 +1,24 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from decimal import Decimal, getcontext
-from typing import List
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Tuple
 
-from base_types import Segment
-from type_helper import to_decimal
-from valuation import get_double_prime_for_interval
+from base_types import Preferences, Segment
+from type_helper import to_number
+from valuation import (
+    get_double_prime_for_interval,
+    get_whole_cake_value,
+    preference_fingerprint,
+)
+from values import cut_from
+
+from ..root_finding import find_root
+from .prescreen import (
+    PRESCREEN_SLACK,
+    _cuts_at_shares,
+    _piece_value_bounds,
+    _value_between,
+)
 
 getcontext().prec = 15
 
@@ -18,14 +33,9 @@ def _find_balanced_cut_for_adjacent(
     max_iterations: int = 1000,
 ) -> Decimal:
     getcontext().prec = 15
-    tolerance = to_decimal("1e-7")
-    start = left
-    end = right
-    iteration = 0
-
-    while end - start > tolerance / to_decimal(1000) and iteration < max_iterations:
-        m = (start + end) / 2
+    tolerance = to_number("1e-7")
 
+    def balance(m: Decimal) -> Decimal:
         first_half_value = get_double_prime_for_interval(
             segments=preference,
             epsilon=epsilon,
@@ -40,15 +50,257 @@ def _find_balanced_cut_for_adjacent(
             end=right,
             cake_size=cake_size,
         )
+        return first_half_value - second_half_value
+
+    result = find_root(
+        balance,
+        lower=to_number(left),
+        upper=to_number(right),
+        position_tolerance=tolerance / to_number(1000),
+        value_tolerance=tolerance,
+        max_iterations=max_iterations,
+    )
+    return result.x
+
+
+class ImplicitCutTables:
+    """
+    Agent 1's implicit cuts for condition B, m(l) and r(l), l(r) and m(r),
+    l(m) and r(m), per alpha, at the points probed so far.
+
+    They only depend on agent 1's preference and alpha, but every agent i and
+    every (k, k') handler bisects over the same l, m or r and used to search
+    for them again. The tables fill in lazily as the probes come in and hold
+    the exact cuts, `hits` and `misses` count the lookups served from and added
+    to them.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._tables: Dict[Hashable, Dict[Decimal, List[Decimal]]] = {}
+
+    def lookup(
+        self,
+        name: str,
+        preference: List[Segment],
+        alpha: Decimal,
+        x: Decimal,
+        settings: Hashable,
+        compute: Callable[[], List[Decimal]],
+    ) -> List[Decimal]:
+        table = self._tables.setdefault(
+            (name, preference_fingerprint(preference), alpha, settings), {}
+        )
+        cuts = table.get(x)
+        if cuts is not None:
+            self.hits += 1
+            return list(cuts)
+
+        self.misses += 1
+        cuts = table[x] = compute()
+        return list(cuts)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_current_cut_tables: ContextVar[Optional[ImplicitCutTables]] = ContextVar(
+    "implicit_cut_tables", default=None
+)
+
+
+@contextmanager
+def implicit_cut_tables() -> Iterator[ImplicitCutTables]:
+    """
+    Tabulate agent 1's implicit cuts in the enclosed code. Nested uses share
+    the outermost tables.
+    """
+    tables = _current_cut_tables.get()
+    if tables is not None:
+        yield tables
+        return
+
+    tables = ImplicitCutTables()
+    token = _current_cut_tables.set(tables)
+    try:
+        yield tables
+    finally:
+        _current_cut_tables.reset(token)
+
+
+def tabulated_cuts(
+    name: str,
+    preference: List[Segment],
+    alpha: Decimal,
+    x: Decimal,
+    settings: Hashable,
+    compute: Callable[[], List[Decimal]],
+) -> List[Decimal]:
+    """`compute()`, looked up in the current `implicit_cut_tables()` if any"""
+    tables = _current_cut_tables.get()
+    if tables is None:
+        return compute()
+    return tables.lookup(name, preference, alpha, x, settings, compute)
+
+
+def _prescreen_condition_b(
+    i: int,
+    k: int,
+    k_prime: int,
+    others: List[int],
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+) -> Optional[str]:
+    """
+    Why no cuts can make pieces k and k' meet condition B with agent i, or
+    None if some might, from prefix values alone.
+
+    Condition i caps agent 1's value of pieces k and k' at alpha, which
+    confines every cut to a range of agent 1's prefix values. Over those ranges
+    each agent can value pieces k and k' at most so much and the better of the
+    other two at least so much, and conditions ii to iv need the former to
+    reach the latter. For (0, 3), where the handler fixes the middle pieces,
+    see `_prescreen_leftmost_rightmost`.
+    """
+    alpha = to_number(alpha)
+    cake_size = to_number(cake_size)
+    slack = to_number(PRESCREEN_SLACK)
+    if (k, k_prime) == (0, 3):
+        return _prescreen_leftmost_rightmost(i, alpha, preferences, cake_size)
+
+    cut_ranges = _cut_ranges_for_condition_b(
+        k, k_prime, alpha + slack, preferences[0], cake_size
+    )
+    if cut_ranges is None:
+        return "agent 1 cannot keep pieces k and k' at alpha or below"
+    lowest_cuts, highest_cuts = cut_ranges
+
+    def can_be_best(agent: int) -> List[bool]:
+        """Whether pieces k and k' can be worth as much as the better other one"""
+        preference = preferences[agent]
+        most, least = _piece_value_bounds(
+            preference, cake_size, lowest_cuts, highest_cuts
+        )
+        better_other = max(least[others[0]], least[others[1]])
+        if abs(others[0] - others[1]) == 1:
+            # Together adjacent pieces are worth at least what their union is
+            start, end = min(others), max(others) + 1
+            union = _value_between(
+                preference, cake_size, highest_cuts[start], lowest_cuts[end]
+            )
+            better_other = max(better_other, union / 2)
+        return [most[piece] >= better_other - slack for piece in (k, k_prime)]
+
+    if not all(can_be_best(i)):
+        return f"agent i ({i}) values another piece above piece k or k'"
+
+    reached = sum(
+        sum(can_be_best(j)) for j in range(1, len(preferences)) if j != i
+    )
+    if reached < 2:
+        return "pieces k and k' cannot be best for two of the other agents"
+    return None
+
+
+def _cut_ranges_for_condition_b(
+    k: int,
+    k_prime: int,
+    cap: Decimal,
+    preference_1: List[Segment],
+    cake_size: Decimal,
+) -> Optional[Tuple[List[Decimal], List[Decimal]]]:
+    """
+    Lowest and highest position of the start of the cake, the three cuts and
+    the end of the cake when agent 1 values pieces k and k' at `cap` (a share
+    of the cake) or less, None if that is impossible
+    """
+    caps = [cap if piece in (k, k_prime) else to_number(1) for piece in range(4)]
+    # Shares of agent 1's cake before each cut, pushed right from the start of
+    # the cake and left from its end
+    highest = [to_number(0)]
+    for piece in range(3):
+        highest.append(min(to_number(1), highest[-1] + caps[piece]))
+    lowest = [to_number(1)]
+    for piece in range(3, 0, -1):
+        lowest.insert(0, max(to_number(0), lowest[0] - caps[piece]))
+    lowest.insert(0, to_number(0))
+    if any(low > high for low, high in zip(lowest, highest)):
+        return None
+    return _cuts_at_shares(preference_1, cake_size, lowest[1:4], highest[1:4])
+
+
+def _prescreen_leftmost_rightmost(
+    i: int,
+    alpha: Decimal,
+    preferences: Preferences,
+    cake_size: Decimal,
+    max_iterations: int = 100,
+) -> Optional[str]:
+    """
+    Pre-screen for (k, k') = (0, 3), where agent 1 cuts the two middle pieces
+    at alpha each and only l is left to choose.
+
+    Agent i's value of piece 0 grows with l and that of piece 3 shrinks, so
+    there is a single l where agent i values them equally. Found on prefix
+    values, it tells right away whether the pieces there can meet conditions
+    ii to iv.
+    """
+    alpha = to_number(alpha)
+    cake_size = to_number(cake_size)
+    slack = to_number(PRESCREEN_SLACK)
+    preference_1 = preferences[0]
+    whole = get_whole_cake_value(preference_1, cake_size)
+
+    def cuts(share: Decimal) -> List[Decimal]:
+        """Cake ends and the cuts where pieces 1 and 2 are worth alpha to agent 1"""
+        positions = [to_number(0)]
+        for before in (share, share + alpha, share + 2 * alpha):
+            positions.append(
+                cake_size
+                if before >= 1
+                else cut_from(preference_1, to_number(0), before * whole)
+            )
+        return positions + [cake_size]
+
+    def values(agent: int, share: Decimal) -> List[Decimal]:
+        positions = cuts(share)
+        return [
+            _value_between(preferences[agent], cake_size, start, end)
+            for start, end in zip(positions, positions[1:])
+        ]
+
+    def balance(share: Decimal) -> Decimal:
+        piece_values = values(i, share)
+        return piece_values[0] - piece_values[3]
 
-        if abs(first_half_value - second_half_value) < tolerance:
-            return m
+    # Condition i keeps pieces 0 and 3 at alpha or below for agent 1
+    lower = max(to_number(0), 1 - 3 * alpha - slack)
+    upper = min(alpha + slack, 1 - 2 * alpha)
+    if lower > upper:
+        return "agent 1 cannot keep pieces 0 and 3 at alpha or below"
+    if balance(lower) > slack or balance(upper) < -slack:
+        return f"agent i ({i}) cannot value pieces 0 and 3 equally"
 
-        if first_half_value < second_half_value:
-            start = m
-        else:
-            end = m
+    result = find_root(
+        balance,
+        lower=lower,
+        upper=upper,
+        position_tolerance=slack,
+        value_tolerance=slack,
+        max_iterations=max_iterations,
+    )
+    share = to_number(result.x)
 
-        iteration += 1
+    def can_be_best(agent: int) -> List[bool]:
+        piece_values = values(agent, share)
+        better_other = max(piece_values[1], piece_values[2])
+        return [piece_values[piece] >= better_other - slack for piece in (0, 3)]
 
-    return (start + end) / 2
+    if not all(can_be_best(i)):
+        return f"agent i ({i}) values a middle piece above pieces 0 and 3"
+    reached = sum(sum(can_be_best(j)) for j in range(1, len(preferences)) if j != i)
+    if reached < 2:
+        return "pieces 0 and 3 cannot be best for two of the other agents"
+    return None
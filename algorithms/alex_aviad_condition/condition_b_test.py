@@ -2,17 +2,30 @@ import logging
 
 import pytest
 
+from parallel import use_workers
 from type_helper import almost_equal, to_decimal
 from valuation import get_double_prime_for_interval
+from verification import Verification, use_verification
 
 from ..alex_aviad_hepler import _binary_search_right_to_left
-from ..algorithm_test_utils import gen_flat_seg
+from ..algorithm_test_utils import (
+    gen_flat_seg,
+    gen_four_sloped_preferences,
+    gen_sloped_seg,
+)
+from ..algorithm_types import Rejected
 from .condition_b import (
+    _check_candidate_for_condition_b,
+    _condition_b_jobs,
+    _find_l_and_r_given_m,
     _find_m_and_r_given_l,
     _find_m_given_l,
     _find_m_given_r,
     _handle_adjacent,
+    check_condition_b,
 )
+from .condition_b_helper import _prescreen_condition_b, implicit_cut_tables
+from .condition_checks import condition_checks
 
 
 def test_handle_adjacent():
@@ -205,3 +218,139 @@ def test_find_m_and_r_given_l():
     )
     assert m_for_l == pytest.approx(to_decimal(0.50), abs=tolerance)
     assert r_for_l == pytest.approx(to_decimal(0.75), abs=tolerance)
+
+
+def test_implicit_cuts_are_tabulated_per_alpha():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preference_1 = [gen_sloped_seg(to_decimal(0), cake_size, to_decimal(3), to_decimal(8))]
+
+    def cuts(m, alpha):
+        return _find_l_and_r_given_m(
+            m=to_decimal(m),
+            cake_size=cake_size,
+            alpha=to_decimal(alpha),
+            preference_1=preference_1,
+            epsilon=epsilon,
+            tolerance=tolerance,
+        )
+
+    expected = cuts("0.5", "0.25")
+    with implicit_cut_tables() as tables:
+        assert cuts("0.5", "0.25") == expected
+        # Same probe once rounded to the 1e-8 lattice the searches start from
+        assert cuts("0.500000001", "0.25") == cuts("0.50000001", "0.25")
+        assert cuts("0.5", "0.25") == expected
+        assert cuts("0.5", "0.3") != expected
+
+    assert tables.stats() == {"hits": 2, "misses": 3}
+
+
+def test_condition_checks_are_remembered_per_alpha():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = gen_four_sloped_preferences(cake_size)
+    alpha = to_decimal("0.26")
+
+    with condition_checks() as checks:
+        meet_b, info = check_condition_b(
+            alpha, preferences, cake_size, epsilon, tolerance
+        )
+        # As the main loop does with the outcome it keeps
+        info["alpha_underline"] = to_decimal("0.25")
+        assert check_condition_b(
+            alpha, preferences, cake_size, epsilon, tolerance
+        ) == (meet_b, {key: info[key] for key in ("cuts", "k", "k_prime")})
+
+    assert meet_b
+    assert checks.stats() == {"hits": 1, "misses": 1}
+
+
+def test_check_condition_b_in_worker_processes():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = gen_four_sloped_preferences(cake_size)
+    alpha = to_decimal("0.26")
+
+    serial = check_condition_b(alpha, preferences, cake_size, epsilon, tolerance)
+    with use_workers(2):
+        parallel = check_condition_b(alpha, preferences, cake_size, epsilon, tolerance)
+
+    # Found by a late job, after the earlier (k, k') failed
+    assert serial[0] is True
+    assert (serial[1]["k"], serial[1]["k_prime"]) == (2, 3)
+    assert parallel == serial
+
+
+def test_prescreen_rules_out_candidates_before_searching():
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = gen_four_sloped_preferences(cake_size)
+    alpha = to_decimal("0.26")
+
+    # Agent 2 can never value the outer pieces equally while agent 1 keeps
+    # them at alpha, the full verification level in the tests confirms that
+    # the handler fails too
+    result = _check_candidate_for_condition_b(
+        i=2,
+        k=0,
+        k_prime=3,
+        others=[1, 2],
+        alpha=alpha,
+        preferences=preferences,
+        cake_size=cake_size,
+        epsilon=epsilon,
+        tolerance=tolerance,
+        backend="decimal",
+        verification="full",
+    )
+    assert isinstance(result, Rejected)
+    assert not result
+    assert "equally" in result.reason
+
+    # The pieces check_condition_b finds are not ruled out
+    _, info = check_condition_b(alpha, preferences, cake_size, epsilon, tolerance)
+    k, k_prime = info["k"], info["k_prime"]
+    others = [piece for piece in range(4) if piece not in (k, k_prime)]
+    assert any(
+        _prescreen_condition_b(i, k, k_prime, others, alpha, preferences, cake_size)
+        is None
+        for i in range(1, 4)
+    )
+
+
+def test_sampled_checks_of_a_candidate_do_not_depend_on_earlier_ones(monkeypatch):
+    cake_size = to_decimal(1)
+    epsilon = to_decimal("1e-15")
+    tolerance = to_decimal("1e-10")
+    preferences = gen_four_sloped_preferences(cake_size)
+    alpha = to_decimal("0.26")
+
+    checks = []
+    should_verify = Verification.should_verify
+
+    def logged(self, site):
+        checks.append((site, should_verify(self, site)))
+        return checks[-1][1]
+
+    monkeypatch.setattr(Verification, "should_verify", logged)
+    sampled = []
+    with use_verification("sampled"):
+        jobs = _condition_b_jobs(alpha, preferences, cake_size, epsilon, tolerance)
+        for job in jobs:
+            # As a worker process would run it after another candidate, or
+            # first
+            checks.clear()
+            _check_candidate_for_condition_b(*job)
+            first = list(checks)
+            checks.clear()
+            _check_candidate_for_condition_b(*job)
+            assert checks == first
+            sampled.extend(ran for _, ran in first)
+
+    # Some checks ran and some were skipped
+    assert any(sampled) and not all(sampled)
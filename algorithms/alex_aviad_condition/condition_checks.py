@@ -0,0 +1,120 @@
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from base_types import Preferences
+from valuation import preference_fingerprint
+
+CheckResult = Tuple[bool, Dict[str, Any]]
+
+
+class ConditionChecks:
+    """
+    Outcomes of the condition A and B checks per alpha, in a request.
+
+    The allocation step needs the cuts of a check the main loop has already
+    run, this is where it finds them when they are not handed over. The
+    outcomes are copied in and out, since the main loop annotates the ones it
+    keeps. `hits` and `misses` count the checks served from and added to them.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._results: Dict[Hashable, CheckResult] = {}
+
+    def lookup(
+        self,
+        condition: str,
+        alpha: Decimal,
+        preferences: Preferences,
+        settings: Hashable,
+        compute: Callable[[], CheckResult],
+    ) -> CheckResult:
+        key = self._key(condition, alpha, preferences, settings)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            return copy.deepcopy(result)
+
+        self.misses += 1
+        result = self._results[key] = compute()
+        return copy.deepcopy(result)
+
+    def record(
+        self,
+        condition: str,
+        alpha: Decimal,
+        preferences: Preferences,
+        settings: Hashable,
+        result: CheckResult,
+    ) -> None:
+        key = self._key(condition, alpha, preferences, settings)
+        self._results[key] = copy.deepcopy(result)
+
+    @staticmethod
+    def _key(
+        condition: str, alpha: Decimal, preferences: Preferences, settings: Hashable
+    ) -> Hashable:
+        return (
+            condition,
+            tuple(preference_fingerprint(p) for p in preferences),
+            alpha,
+            settings,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_current_condition_checks: ContextVar[Optional[ConditionChecks]] = ContextVar(
+    "condition_checks", default=None
+)
+
+
+@contextmanager
+def condition_checks() -> Iterator[ConditionChecks]:
+    """
+    Remember the condition checks of the enclosed code. Nested uses share the
+    outermost store.
+    """
+    checks = _current_condition_checks.get()
+    if checks is not None:
+        yield checks
+        return
+
+    checks = ConditionChecks()
+    token = _current_condition_checks.set(checks)
+    try:
+        yield checks
+    finally:
+        _current_condition_checks.reset(token)
+
+
+def remembered_check(
+    condition: str,
+    alpha: Decimal,
+    preferences: Preferences,
+    settings: Hashable,
+    compute: Callable[[], CheckResult],
+) -> CheckResult:
+    """`compute()`, looked up in the current `condition_checks()` if any"""
+    checks = _current_condition_checks.get()
+    if checks is None:
+        return compute()
+    return checks.lookup(condition, alpha, preferences, settings, compute)
+
+
+def record_check(
+    condition: str,
+    alpha: Decimal,
+    preferences: Preferences,
+    settings: Hashable,
+    result: CheckResult,
+) -> None:
+    """Remember a check run outside `remembered_check`, if checks are remembered"""
+    checks = _current_condition_checks.get()
+    if checks is not None:
+        checks.record(condition, alpha, preferences, settings, result)
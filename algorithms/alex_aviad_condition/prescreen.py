@@ -0,0 +1,75 @@
+from decimal import Decimal, getcontext
+from typing import List, Tuple
+
+from base_types import Segment
+from type_helper import to_number
+from valuation import get_whole_cake_value
+from values import PreferenceIndex, cut_from, cut_to
+
+getcontext().prec = 15
+
+# The pre-screens compare values of v rather than v'', which differ by O(delta)
+PRESCREEN_SLACK = "1e-9"
+
+
+def _cuts_at_shares(
+    preference_1: List[Segment],
+    cake_size: Decimal,
+    lowest: List[Decimal],
+    highest: List[Decimal],
+) -> Tuple[List[Decimal], List[Decimal]]:
+    """
+    Lowest and highest position of the start of the cake, the three cuts and
+    the end of the cake, from the lowest and highest share of agent 1's cake
+    before each of the cuts
+    """
+    whole = get_whole_cake_value(preference_1, cake_size)
+    lowest_cuts = [to_number(0)]
+    highest_cuts = [to_number(0)]
+    for low, high in zip(lowest, highest):
+        lowest_cuts.append(
+            cake_size
+            if low >= 1
+            else cut_from(preference_1, to_number(0), max(low, to_number(0)) * whole)
+        )
+        highest_cuts.append(
+            cake_size
+            if high >= 1
+            else cut_to(preference_1, cake_size, (1 - high) * whole)
+        )
+    return lowest_cuts + [cake_size], highest_cuts + [cake_size]
+
+
+def _piece_value_bounds(
+    preference: List[Segment],
+    cake_size: Decimal,
+    lowest_cuts: List[Decimal],
+    highest_cuts: List[Decimal],
+) -> Tuple[List[Decimal], List[Decimal]]:
+    """Most and least share of the cake each piece can be worth to an agent"""
+    most = []
+    least = []
+    for piece in range(4):
+        most.append(
+            _value_between(
+                preference, cake_size, lowest_cuts[piece], highest_cuts[piece + 1]
+            )
+        )
+        least.append(
+            _value_between(
+                preference, cake_size, highest_cuts[piece], lowest_cuts[piece + 1]
+            )
+        )
+    return most, least
+
+
+def _value_between(
+    preference: List[Segment], cake_size: Decimal, start: Decimal, end: Decimal
+) -> Decimal:
+    """Share of the cake [start, end] is worth, from prefix values, 0 if empty"""
+    if end <= start:
+        return to_number(0)
+    index = PreferenceIndex.from_segments(preference)
+    return (index.value_up_to(end) - index.value_up_to(start)) / get_whole_cake_value(
+        preference, cake_size
+    )
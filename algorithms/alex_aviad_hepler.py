@@ -1,11 +1,17 @@
 import logging
 from decimal import Decimal, getcontext
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from base_types import Segment
-from type_helper import de_norm, to_decimal
-from valuation import get_double_prime_for_interval
-from values import get_value_for_interval
+from type_helper import de_norm, scale_back_from_unit, scale_to_unit, to_number
+from valuation import (
+    get_double_prime_for_interval,
+    get_whole_cake_value,
+    lattice_step,
+)
+from values import cut_from, cut_to, get_value_for_interval
+
+from .root_finding import find_root
 
 getcontext().prec = 15
 
@@ -17,120 +23,317 @@ def _binary_search_left_to_right(
     start: Decimal,
     end: Decimal,
     target: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
     max_iterations: int = 1000,
 ) -> Decimal:
-    cake_size = to_decimal(cake_size)
-    epsilon = to_decimal(epsilon)
-    start = to_decimal(start)
-    end = to_decimal(end)
-    target = to_decimal(target)
-    # getcontext().prec = 15
-    tolerance = to_decimal("1e-10") if tolerance < to_decimal("1e-10") else tolerance
-    epsilon = to_decimal("1e-15") if epsilon < to_decimal("1e-15") else epsilon
-
-    full_cake = get_double_prime_for_interval(
-        segments=preference,
+    """
+    Cut point x in [start, end] where v''([start, x]) reaches `target`,
+    or `end` if [start, end] is worth less than that.
+    """
+    tolerance = to_number(tolerance)
+    tolerance = to_number("1e-10") if tolerance < to_number("1e-10") else tolerance
+    return invert_double_prime(
+        preference=preference,
+        cake_size=cake_size,
         epsilon=epsilon,
         start=start,
         end=end,
-        cake_size=cake_size,
+        target=target,
+        from_left=True,
+        tolerance=tolerance,
+        max_iterations=max_iterations,
     )
-    if full_cake < target:
-        # logging.warning(
-        #     f"binary search left to right: {start=}, {end=}, {target=}, but {cake_size=}, {full_cake=}, returned {end=}"
-        # )
-        return end
 
-    original_start = start
-    iteration = 0
 
-    while end - start > tolerance and iteration < max_iterations:
-        mid = to_decimal((start + end) / 2)
-        searched_value = get_double_prime_for_interval(
-            segments=preference,
-            epsilon=epsilon,
-            start=original_start,
-            end=mid,
-            cake_size=cake_size,
-        )
-        logging.info("***********")
-        logging.info(f"{mid=}, {searched_value=}, {original_start=}, {mid=}")
-        logging.info("***********")
-
-        if abs(searched_value - target) < tolerance:
-            return mid
+def _binary_search_right_to_left(
+    preference: List[Segment],
+    cake_size: Decimal,
+    epsilon: Decimal,
+    start: Decimal,
+    end: Decimal,
+    target: Decimal,
+    tolerance: Decimal = to_number(1e-10),
+    max_iterations: int = 1000,
+) -> Decimal:
+    """
+    Cut point x in [start, end] where v''([x, end]) reaches `target`,
+    or `start` if [start, end] is worth less than that.
+    """
+    return invert_double_prime(
+        preference=preference,
+        cake_size=cake_size,
+        epsilon=epsilon,
+        start=start,
+        end=end,
+        target=target,
+        from_left=False,
+        tolerance=to_number(tolerance),
+        max_iterations=max_iterations,
+    )
 
-        if searched_value < target:
-            start = mid
-        else:
-            end = mid
 
-        iteration = iteration + 1
+class CutPlanner:
+    """
+    Cuts of one preference, each searched for once.
+
+    A left-to-right cut only depends on where it starts and a right-to-left
+    one on where it ends, the other bound merely clips it. The planner runs
+    every search from its anchor to the far end of the cake and clips the
+    result, so the candidate cuts of a condition that share a cut also share
+    the search. `hits` and `misses` count the cuts served from and added to it.
+    """
+
+    def __init__(
+        self,
+        preference: List[Segment],
+        cake_size: Decimal,
+        epsilon: Decimal,
+        tolerance: Decimal = to_number(1e-10),
+    ):
+        self.preference = preference
+        self.cake_size = to_number(cake_size)
+        self.epsilon = epsilon
+        self.tolerance = tolerance
+        self.hits = 0
+        self.misses = 0
+        self._cuts: Dict[Tuple[bool, Decimal, Decimal], Decimal] = {}
+
+    def left_to_right(self, start: Decimal, end: Decimal, target: Decimal) -> Decimal:
+        """Same as `_binary_search_left_to_right` over [start, end]"""
+        start = to_number(start)
+        cut = self._cut(
+            (True, start, to_number(target)),
+            lambda: _binary_search_left_to_right(
+                preference=self.preference,
+                cake_size=self.cake_size,
+                epsilon=self.epsilon,
+                start=start,
+                end=self.cake_size,
+                target=target,
+                tolerance=self.tolerance,
+            ),
+        )
+        return min(cut, to_number(end))
+
+    def right_to_left(self, start: Decimal, end: Decimal, target: Decimal) -> Decimal:
+        """Same as `_binary_search_right_to_left` over [start, end]"""
+        end = to_number(end)
+        cut = self._cut(
+            (False, end, to_number(target)),
+            lambda: _binary_search_right_to_left(
+                preference=self.preference,
+                cake_size=self.cake_size,
+                epsilon=self.epsilon,
+                start=to_number(0),
+                end=end,
+                target=target,
+                tolerance=self.tolerance,
+            ),
+        )
+        return max(cut, to_number(start))
 
-    return to_decimal((start + end) / 2)
+    def _cut(
+        self, key: Tuple[bool, Decimal, Decimal], search: Callable[[], Decimal]
+    ) -> Decimal:
+        cut = self._cuts.get(key)
+        if cut is not None:
+            self.hits += 1
+            return cut
+        self.misses += 1
+        cut = self._cuts[key] = search()
+        return cut
 
 
-def _binary_search_right_to_left(
+def invert_double_prime(
     preference: List[Segment],
     cake_size: Decimal,
     epsilon: Decimal,
     start: Decimal,
     end: Decimal,
     target: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    from_left: bool,
+    tolerance: Decimal = to_number(0),
     max_iterations: int = 1000,
 ) -> Decimal:
-    cake_size = to_decimal(cake_size)
-    epsilon = to_decimal(epsilon)
-    start = to_decimal(start)
-    end = to_decimal(end)
-    target = to_decimal(target)
-    getcontext().prec = 15
-    # tolerance = to_decimal("1e-10") if tolerance < to_decimal("1e-10") else tolerance
-    epsilon = to_decimal("1e-15")
+    """
+    Inverse of v'': the first grid point x in [start, end] where v''([start, x])
+    reaches `target` (`from_left`), or the last one where v''([x, end]) does.
+
+    v'' only changes from one grid point to the next, so the search runs over
+    integer grid indices. It starts from the exact cut of the underlying v, which
+    is at most a few grid cells away, brackets the answer by doubling steps and
+    bisects the bracket. A grid point whose value is within `tolerance` of the
+    target is returned as soon as it is seen.
+    """
+    cake_size = to_number(cake_size)
+    start = to_number(start)
+    end = to_number(end)
+    target = to_number(target)
+    tolerance = to_number(tolerance)
+    delta = lattice_step(epsilon)
 
     full_cake = get_double_prime_for_interval(
         segments=preference,
-        epsilon=epsilon,
+        epsilon=delta,
         start=start,
         end=end,
         cake_size=cake_size,
     )
     if full_cake < target:
-        # logging.warning(
-        #     f"binary search right to left: {start=}, {end=}, {target=}, but {cake_size=}, {full_cake=}, returned {start=}"
-        # )
-        return start
+        return end if from_left else start
 
-    original_end = end
-    iteration = 0
+    def point(n: int) -> Decimal:
+        return _grid_point(n, delta, cake_size)
 
-    while end - start > tolerance and iteration < max_iterations:
-        mid = to_decimal((start + end) / 2)
+    def index(x: Decimal) -> int:
+        return _grid_index(x, delta, cake_size)
 
-        searched_value = get_double_prime_for_interval(
-            segments=preference,
-            epsilon=epsilon,
-            start=mid,
-            end=original_end,
-            cake_size=to_decimal(cake_size),
+    lowest, highest = _grid_indices_within(start, end, delta, cake_size)
+
+    # Initial guess from the Robertson-Webb cut of v, v'' is v up to O(delta)
+    whole_cake_value = get_whole_cake_value(preference, cake_size)
+    try:
+        if from_left:
+            guess = cut_from(preference, start, target * whole_cake_value)
+        else:
+            guess = cut_to(preference, end, target * whole_cake_value)
+    except ValueError:
+        guess = end if from_left else start
+    guess = index(min(max(guess, start), end))
+
+    if from_left:
+        found = _first_grid_index_reaching(
+            lambda n: get_double_prime_for_interval(
+                segments=preference,
+                epsilon=delta,
+                start=start,
+                end=point(n),
+                cake_size=cake_size,
+            ),
+            target=target,
+            guess=guess,
+            lowest=lowest,
+            highest=highest,
+            tolerance=tolerance,
+            max_iterations=max_iterations,
         )
-        logging.info("***********")
-        logging.info(f"{mid=}, {searched_value=}, {mid=}, {original_end=}")
-        logging.info("***********")
+        return end if found is None else point(found)
+
+    # Right to left, mirror the indices so that the value increases with them
+    found = _first_grid_index_reaching(
+        lambda n: get_double_prime_for_interval(
+            segments=preference,
+            epsilon=delta,
+            start=point(-n),
+            end=end,
+            cake_size=cake_size,
+        ),
+        target=target,
+        guess=-guess,
+        lowest=-highest,
+        highest=-lowest,
+        tolerance=tolerance,
+        max_iterations=max_iterations,
+    )
+    return start if found is None else point(-found)
 
-        if abs(searched_value - target) < tolerance:
-            return mid
 
-        if searched_value < target:
-            end = mid
-        else:
-            start = mid
+def _grid_point(n: int, delta: Decimal, cake_size: Decimal) -> Decimal:
+    return scale_back_from_unit(to_number(n) * delta, cake_size)
+
+
+def _grid_index(x: Decimal, delta: Decimal, cake_size: Decimal) -> int:
+    """Index of the grid point nearest to x"""
+    return int(round(scale_to_unit(x, cake_size) / delta))
 
-        iteration = iteration + 1
 
-    return to_decimal((start + end) / 2)
+def _grid_indices_within(
+    start: Decimal, end: Decimal, delta: Decimal, cake_size: Decimal
+) -> Tuple[int, int]:
+    """First and last grid index inside [start, end]"""
+    lowest = _grid_index(start, delta, cake_size)
+    lowest += _grid_point(lowest, delta, cake_size) < start
+    highest = _grid_index(end, delta, cake_size)
+    highest -= _grid_point(highest, delta, cake_size) > end
+    return lowest, highest
+
+
+def _first_grid_index_reaching(
+    value_at: Callable[[int], Decimal],
+    target: Decimal,
+    guess: int,
+    lowest: int,
+    highest: int,
+    tolerance: Decimal,
+    max_iterations: int,
+) -> Optional[int]:
+    """
+    Smallest n in [lowest, highest] with value_at(n) >= target, for value_at
+    non-decreasing in n, or None if there is none. Any n whose value is within
+    `tolerance` of the target is accepted right away.
+    """
+    if lowest > highest:
+        return None
+
+    iteration = 0
+
+    def excess(n: int) -> Decimal:
+        nonlocal iteration
+        iteration += 1
+        return value_at(n) - target
+
+    def close(value: Decimal) -> bool:
+        return abs(value) < tolerance
+
+    # Bracket the answer in (below, above] by doubling steps from the guess
+    guess = min(max(guess, lowest), highest)
+    excess_guess = excess(guess)
+    if close(excess_guess):
+        return guess
+
+    step = 1
+    if excess_guess >= 0:
+        above, excess_above = guess, excess_guess
+        while True:
+            if above == lowest:
+                return lowest
+            probe = max(above - step, lowest)
+            excess_probe = excess(probe)
+            if close(excess_probe):
+                return probe
+            if excess_probe < 0:
+                below, excess_below = probe, excess_probe
+                break
+            above, excess_above = probe, excess_probe
+            step *= 2
+    else:
+        below, excess_below = guess, excess_guess
+        while True:
+            if below == highest:
+                return None
+            probe = min(below + step, highest)
+            excess_probe = excess(probe)
+            if close(excess_probe):
+                return probe
+            if excess_probe >= 0:
+                above, excess_above = probe, excess_probe
+                break
+            below, excess_below = probe, excess_probe
+            step *= 2
+
+    # v'' is piecewise linear in the grid index, interpolation homes in on the
+    # answer in a handful of steps
+    return find_root(
+        lambda n: value_at(n) - target,
+        lower=below,
+        upper=above,
+        position_tolerance=1,
+        value_tolerance=tolerance if tolerance > 0 else None,
+        f_lower=excess_below,
+        f_upper=excess_above,
+        integral=True,
+        max_iterations=max(max_iterations - iteration, 0),
+    ).x
 
 
 def equipartition(
@@ -139,57 +342,71 @@ def equipartition(
     epsilon: Decimal,
     start: Decimal,
     end: Decimal,
-    tolerance: Decimal = to_decimal(1e-10),
+    tolerance: Decimal = to_number(1e-10),
+    n: int = 4,
 ) -> List[Decimal]:
-    # tolerance = to_decimal("1e-10")
-    epsilon = Decimal(epsilon)
-    epsilon = to_decimal("1e-15")
-    start = Decimal(start)
-    end = Decimal(end)
+    """
+    The n - 1 cuts splitting [start, end] into n pieces of equal v'' value.
+
+    All cuts come from one left-to-right sweep: the k-th cut is the first grid
+    point where v''([start, x]) reaches k/n of v''([start, end]), searched from
+    the previous cut on and starting at the matching cut of the cumulative v.
+    v'' adds up over pieces split at grid points, so this is cutting the pieces
+    one after the other without re-valuing the cake already cut off.
+    """
+    if n < 1:
+        raise ValueError(f"Cannot split a cake into {n} pieces")
+
+    # tolerance = to_number("1e-10")
+    epsilon = to_number(epsilon)
+    epsilon = to_number("1e-15")
+    cake_size = to_number(cake_size)
+    start = to_number(start)
+    end = to_number(end)
+    tolerance = max(to_number(tolerance), to_number("1e-10"))
+    delta = lattice_step(epsilon)
 
     total_v = get_double_prime_for_interval(
-        segments=preference, epsilon=epsilon, start=start, end=end, cake_size=cake_size
+        segments=preference, epsilon=delta, start=start, end=end, cake_size=cake_size
     )
-    segment_value = total_v / 4
+    segment_value = total_v / n
+    whole_cake_value = get_whole_cake_value(preference, cake_size)
 
-    # Finding cuts at 1/4, 1/2, and 3/4 of the cake
-    first_cut = _binary_search_left_to_right(
-        preference=preference,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=start,
-        end=end,
-        target=segment_value,
-        tolerance=tolerance,
-    )
-    logging.info(f"find l cut: {first_cut}")
-    logging.error(f"find l cut: {first_cut}")
-
-    second_cut = _binary_search_left_to_right(
-        preference=preference,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=first_cut,
-        end=end,
-        target=segment_value,
-        tolerance=tolerance,
-    )
-    logging.info(f"find m cut: {second_cut}")
-    logging.error(f"find m cut: {second_cut}")
+    def value_up_to(index: int) -> Decimal:
+        return get_double_prime_for_interval(
+            segments=preference,
+            epsilon=delta,
+            start=start,
+            end=_grid_point(index, delta, cake_size),
+            cake_size=cake_size,
+        )
 
-    third_cut = _binary_search_left_to_right(
-        preference=preference,
-        cake_size=cake_size,
-        epsilon=epsilon,
-        start=second_cut,
-        end=end,
-        target=segment_value,
-        tolerance=tolerance,
-    )
-    logging.info(f"find r cut: {third_cut}")
-    logging.error(f"find r cut: {third_cut}")
+    cuts = []
+    lowest, highest = _grid_indices_within(start, end, delta, cake_size)
+    for k in range(1, n):
+        target = segment_value * k
+        try:
+            guess = cut_from(preference, start, target * whole_cake_value)
+        except ValueError:
+            guess = end
+        found = _first_grid_index_reaching(
+            value_up_to,
+            target=target,
+            guess=_grid_index(min(max(guess, start), end), delta, cake_size),
+            lowest=lowest,
+            highest=highest,
+            tolerance=tolerance,
+            max_iterations=1000,
+        )
+        if found is None:
+            cuts.append(end)
+            lowest = highest + 1
+        else:
+            cuts.append(_grid_point(found, delta, cake_size))
+            lowest = found
+        logging.info(f"equipartition: cut {k} of {n - 1} at {cuts[-1]}")
 
-    return [first_cut, second_cut, third_cut]
+    return cuts
 
 
 def get_range_by_cuts(
@@ -201,21 +418,21 @@ def get_range_by_cuts(
 
     l, m, r = cuts
 
-    start: Decimal = to_decimal(-1)
-    end: Decimal = to_decimal(-1)
+    start: Decimal = to_number(-1)
+    end: Decimal = to_number(-1)
 
     if k == 0:
-        start = to_decimal(0)
-        end = to_decimal(l)
+        start = to_number(0)
+        end = to_number(l)
     elif k == 1:
-        start = to_decimal(l)
-        end = to_decimal(m)
+        start = to_number(l)
+        end = to_number(m)
     elif k == 2:
-        start = to_decimal(m)
-        end = to_decimal(r)
+        start = to_number(m)
+        end = to_number(r)
     elif k == 3:
-        start = to_decimal(r)
-        end = to_decimal(cake_size)
+        start = to_number(r)
+        end = to_number(cake_size)
 
     return start, end
 
@@ -229,7 +446,7 @@ def _check_if_weakly_prefer_piece_k(
     alpha: Decimal,
 ) -> bool:
     whole_cake_value = get_value_for_interval(
-        segments=preference, start=to_decimal(0), end=to_decimal(end)
+        segments=preference, start=to_number(0), end=to_number(end)
     )
     v = de_norm(
         v=get_double_prime_for_interval(
@@ -237,7 +454,7 @@ def _check_if_weakly_prefer_piece_k(
             epsilon=epsilon,
             start=start,
             end=end,
-            cake_size=to_decimal(cake_size),
+            cake_size=to_number(cake_size),
         ),
         whole_cake_value=whole_cake_value,
     )
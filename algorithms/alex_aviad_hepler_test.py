@@ -8,9 +8,11 @@ from valuation import get_double_prime_for_interval, get_values_for_cuts
 
 from .alex_aviad_condition.condition_a import _find_cuts_and_k_for_condition_a
 from .alex_aviad_hepler import (
+    CutPlanner,
     _binary_search_left_to_right,
     _binary_search_right_to_left,
     equipartition,
+    invert_double_prime,
 )
 from .algorithm_test_utils import gen_flat_seg, gen_sloped_seg
 
@@ -92,6 +94,46 @@ def test_binary_search_right_to_left():
     ), "Wrong remained piece value"
 
 
+def test_invert_double_prime_is_exact_on_the_grid():
+    # Cake coordinates only resolve single grid cells below 1 with 15 digits
+    cake_size = to_decimal(1)
+    delta = EPSILON
+    preference = [
+        gen_sloped_seg(to_decimal(0), to_decimal("0.5"), to_decimal(10), to_decimal(0)),
+        gen_flat_seg(to_decimal("0.5"), cake_size, to_decimal(5)),
+    ]
+    start, end = to_decimal("0.15"), to_decimal("0.95")
+
+    def v(a, b):
+        return get_double_prime_for_interval(preference, EPSILON, a, b, cake_size)
+
+    for target in [to_decimal("0.1"), to_decimal("0.35"), v(start, end)]:
+        x = invert_double_prime(
+            preference, cake_size, EPSILON, start, end, target, from_left=True
+        )
+        assert v(start, x) >= target > v(start, x - delta)
+
+        x = invert_double_prime(
+            preference, cake_size, EPSILON, start, end, target, from_left=False
+        )
+        assert v(x, end) >= target > v(x + delta, end)
+
+    # Not enough value in [start, end]
+    too_much = v(start, end) + to_decimal("0.01")
+    assert (
+        invert_double_prime(
+            preference, cake_size, EPSILON, start, end, too_much, from_left=True
+        )
+        == end
+    )
+    assert (
+        invert_double_prime(
+            preference, cake_size, EPSILON, start, end, too_much, from_left=False
+        )
+        == start
+    )
+
+
 def test_find_cuts_for_condition_a():
     cake_size = to_decimal(1)
     epsilon = to_decimal("1e-15")
@@ -488,3 +530,52 @@ def test_equipartition():
         assert cuts[i] == pytest.approx(
             expected_cuts[i], abs=TOLERANCE
         ), f"Wrong cuts {cut[i]} yielded, expected {expected_cuts[i]}, got {cuts[i]}"
+
+
+@pytest.mark.parametrize("n", [2, 3, 7])
+def test_equipartition_n_pieces(n):
+    preference = [
+        gen_sloped_seg(to_decimal(0), to_decimal(0.5), to_decimal(10), to_decimal(0)),
+        gen_flat_seg(to_decimal(0.5), CAKE_SIZE, to_decimal(5)),
+    ]
+    cuts = equipartition(
+        preference=preference,
+        cake_size=CAKE_SIZE,
+        epsilon=EPSILON,
+        start=to_decimal(0),
+        end=CAKE_SIZE,
+        n=n,
+    )
+    assert len(cuts) == n - 1
+    assert cuts == sorted(cuts)
+
+    slice_values = get_values_for_cuts(
+        preference=preference, cuts=cuts, cake_size=CAKE_SIZE, epsilon=EPSILON
+    )
+    assert len(slice_values) == n
+    for slice_value in slice_values:
+        assert slice_value == pytest.approx(to_decimal(1) / n, abs=TOLERANCE)
+
+
+def test_cut_planner_matches_the_searches_and_shares_them():
+    preference = [
+        gen_sloped_seg(to_decimal(0), to_decimal(0.5), to_decimal(10), to_decimal(0)),
+        gen_flat_seg(to_decimal(0.5), CAKE_SIZE, to_decimal(5)),
+    ]
+    target = to_decimal("0.25")
+    planner = CutPlanner(preference, CAKE_SIZE, EPSILON, TOLERANCE)
+
+    l = planner.left_to_right(start=to_decimal(0), end=CAKE_SIZE, target=target)
+    assert l == _binary_search_left_to_right(
+        preference, CAKE_SIZE, EPSILON, to_decimal(0), CAKE_SIZE, target, TOLERANCE
+    )
+    r = planner.right_to_left(start=l, end=CAKE_SIZE, target=target)
+    assert r == _binary_search_right_to_left(
+        preference, CAKE_SIZE, EPSILON, l, CAKE_SIZE, target, TOLERANCE
+    )
+
+    # Same anchors, other bounds: no new search, the cut is only clipped
+    assert planner.left_to_right(start=to_decimal(0), end=r, target=target) == l
+    assert planner.right_to_left(start=to_decimal(0), end=CAKE_SIZE, target=target) == r
+    assert planner.left_to_right(start=to_decimal(0), end=l / 2, target=target) == l / 2
+    assert (planner.hits, planner.misses) == (3, 2)
@@ -4,7 +4,7 @@ from typing import List
 from algorithms.algorithm_types import Result
 from base_types import Portion, Preferences
 from type_helper import to_decimal
-from values import get_value_for_interval
+from values import get_values_for_intervals
 
 getcontext().prec = 15
 
@@ -21,21 +21,12 @@ def build_solution(
     cake_size = to_decimal(cake_size)
     epsilon = to_decimal(epsilon)
 
-    total_values = []
-    for preference in preferences:
-        # double_prime_v = get_value_for_interval(
-        #     segments=preference,
-        #     epsilon=epsilon,
-        #     start=Decimal(0),
-        #     end=Decimal(cake_size),
-        #     cake_size=Decimal(cake_size),
-        # )
-        v = get_value_for_interval(
-            segments=preference,
-            start=Decimal(0),
-            end=Decimal(cake_size),
-        )
-        total_values.append(v)
+    total_values = [
+        to_decimal(v)
+        for v in get_values_for_intervals(
+            preferences, starts=[Decimal(0)], ends=[cake_size]
+        )[:, 0]
+    ]
 
     portions = [
         Portion(owner=i, percent_values=[Decimal(0)] * num_people, edges=[])
@@ -3,12 +3,23 @@ from decimal import Decimal, getcontext
 
 import pytest
 
+from parallel import use_workers
 from type_helper import de_norm, to_decimal
 from valuation import get_double_prime_for_interval
 
-from .alex_aviad import alex_aviad
+from .alex_aviad import (
+    _bisection_tree,
+    _check_conditions,
+    _check_conditions_ahead,
+    alex_aviad,
+)
 from .alex_aviad_hepler import _binary_search_left_to_right, equipartition
-from .algorithm_test_utils import check_if_envy_free, gen_flat_seg, gen_sloped_seg
+from .algorithm_test_utils import (
+    check_if_envy_free,
+    gen_flat_seg,
+    gen_four_sloped_preferences,
+    gen_sloped_seg,
+)
 
 getcontext().prec = 15
 
@@ -25,9 +36,12 @@ def test_alex_aviad_same_evaluations_case_flat_graph_one_seg():
         [gen_flat_seg(to_decimal(0), CAKE_SIZE, to_decimal(10))],
     ]
 
-    result = alex_aviad(preferences, int(CAKE_SIZE), EPSILON)["solution"]
+    output = alex_aviad(preferences, int(CAKE_SIZE), EPSILON)
+    result = output["solution"]
     # assert len(result) == 4, "The result should have exactly four segments."
     logging.info(f"{result=}")
+    # Every piece is valued by all four agents, who share the same preference
+    assert output["notebook"]["hits"] > 0
 
     sum_of_first_values = sum(slice.values[0] for slice in result)
 
@@ -147,6 +161,73 @@ def test_alex_aviad_same_evaluations_case_flat_graph_two_segs():
     ), "Yield none-envy-free allocation"
 
 
+@pytest.mark.parametrize("backend", ["float", "fraction"])
+def test_alex_aviad_backends_agree_with_decimal(backend):
+    cake_size = to_decimal(2)
+    preferences = [
+        [
+            gen_sloped_seg(to_decimal(0), cake_size / 2, to_decimal(10), to_decimal(0)),
+            gen_flat_seg(cake_size / 2, cake_size, to_decimal(5)),
+        ]
+        for _ in range(4)
+    ]
+
+    reference = alex_aviad(preferences, int(cake_size), EPSILON)["solution"]
+    result = alex_aviad(preferences, int(cake_size), EPSILON, backend=backend)[
+        "solution"
+    ]
+
+    assert [slice.owner for slice in result] == [slice.owner for slice in reference]
+    # Cut positions are ill-conditioned where the density vanishes (m = 1 here),
+    # compare what the agents get instead
+    for slice, expected in zip(result, reference):
+        assert [float(v) for v in slice.values] == pytest.approx(
+            [float(v) for v in expected.values], abs=1e-9
+        )
+
+
+def test_bisection_tree_holds_the_alphas_of_the_next_rounds():
+    alphas = _bisection_tree(
+        to_decimal("0.25"), to_decimal(1), counter=0, depth=2, epsilon=EPSILON
+    )
+    # Met at 0.625 the next alpha is 0.8125, missed it is 0.4375
+    assert alphas == [
+        to_decimal("0.625"),
+        to_decimal("0.8125"),
+        to_decimal("0.4375"),
+    ]
+    # The last round of the main loop has no rounds after it
+    assert _bisection_tree(
+        to_decimal("0.25"), to_decimal(1), counter=12, depth=2, epsilon=EPSILON
+    ) == [to_decimal("0.625")]
+
+
+def test_check_conditions_ahead_matches_checking_each_alpha():
+    preferences = gen_four_sloped_preferences(CAKE_SIZE)
+    bracket = dict(
+        alpha_underline=to_decimal("0.25"), alpha_overline=to_decimal("0.4")
+    )
+
+    with use_workers(3):
+        outcomes = _check_conditions_ahead(
+            **bracket,
+            counter=0,
+            preferences=preferences,
+            cake_size=CAKE_SIZE,
+            epsilon=EPSILON,
+            tolerance=TOLERANCE,
+        )
+
+    assert list(outcomes) == _bisection_tree(
+        **bracket, counter=0, depth=2, epsilon=EPSILON
+    )
+    for alpha, outcome in outcomes.items():
+        assert outcome == _check_conditions(
+            alpha, preferences, CAKE_SIZE, EPSILON, TOLERANCE
+        )
+    assert [met for met, _ in outcomes.values()] == ["A", "", "A"]
+
+
 def test_alex_aviad_same_evaluations_case_flat_graph_three_segs():
     cake_size = to_decimal(3)
 
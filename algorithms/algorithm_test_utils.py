@@ -6,8 +6,8 @@ from typing import List
 
 from base_types import AssignedSlice, Preferences, Segment
 from cut import cut_slice
-from type_helper import de_norm, to_decimal
-from values import get_value_for_interval
+from type_helper import de_norm, to_number
+from values import get_values_for_intervals
 
 halfway_point_of_triangle_area = 70.710678
 
@@ -19,9 +19,9 @@ getcontext().prec = 15
 
 
 def gen_flat_seg(start: Decimal, end: Decimal, value: Decimal) -> Segment:
-    start = to_decimal(start)
-    end = to_decimal(end)
-    value = to_decimal(value)
+    start = to_number(start)
+    end = to_number(end)
+    value = to_number(value)
 
     global id_counter
     id_counter += 1
@@ -33,10 +33,10 @@ def gen_flat_seg(start: Decimal, end: Decimal, value: Decimal) -> Segment:
 def gen_sloped_seg(
     start: Decimal, end: Decimal, start_value: Decimal, end_value: Decimal
 ) -> Segment:
-    start = to_decimal(start)
-    end = to_decimal(end)
-    start_value = to_decimal(start_value)
-    end_value = to_decimal(end_value)
+    start = to_number(start)
+    end = to_number(end)
+    start_value = to_number(start_value)
+    end_value = to_number(end_value)
 
     global id_counter
     id_counter += 1
@@ -49,6 +49,17 @@ def gen_sloped_seg(
     )
 
 
+def gen_four_sloped_preferences(cake_size: Decimal) -> Preferences:
+    """
+    Four agents who each value the cake along one sloped segment, differently
+    enough that condition B is only met by a late (k, k')
+    """
+    return [
+        [gen_sloped_seg(to_number(0), cake_size, to_number(a), to_number(b))]
+        for a, b in [(3, 4), (2, 5), (5, 9), (1, 9)]
+    ]
+
+
 def rand(max: int) -> int:
     """
     Generates pseudo-random whole numbers between 0 and `max`
@@ -66,21 +77,21 @@ def gen_random_segs(cake_size: int) -> List[Segment]:
     base_num_to_gen = cake_size - 1 if cake_size < base_num else base_num
 
     num_to_gen = 1 + rand(base_num_to_gen)
-    seg_width = to_decimal(cake_size // num_to_gen)
+    seg_width = to_number(cake_size // num_to_gen)
 
-    last_end = to_decimal(0)
+    last_end = to_number(0)
     for _ in range(num_to_gen):
         if rand(1) == 1:
             segs.append(
-                gen_flat_seg(last_end, last_end + seg_width, to_decimal(rand(10)))
+                gen_flat_seg(last_end, last_end + seg_width, to_number(rand(10)))
             )
         else:
             segs.append(
                 gen_sloped_seg(
                     last_end,
                     last_end + seg_width,
-                    to_decimal(rand(10)),
-                    to_decimal(rand(10)),
+                    to_number(rand(10)),
+                    to_number(rand(10)),
                 )
             )
         last_end += seg_width
@@ -94,7 +105,7 @@ def check_if_envy_free_allocation_origin(num_people: int, result: List[AssignedS
             total_values[slice.owner] += slice.values[a]
 
         obtained_value = total_values[a]
-        fudge_factor = to_decimal("1e-12")
+        fudge_factor = to_number("1e-12")
         for value in total_values:
             assert (
                 value - fudge_factor <= obtained_value
@@ -119,13 +130,16 @@ def check_if_envy_free(
     preferences: List[List[Segment]],
 ) -> bool:
     """O(m * n): m: number of Assigned Slice, n: number of agents"""
-    fudge_factor = to_decimal(epsilon)
+    fudge_factor = to_number(epsilon)
     logging.error(f"{allocation=}")
-    for slice in allocation:
+    slice_values = get_values_for_intervals(
+        preferences,
+        starts=[slice.start for slice in allocation],
+        ends=[slice.end for slice in allocation],
+    )
+    for j, slice in enumerate(allocation):
         owner_value = slice.values[slice.owner]
-        owner_whole_cake_value = get_value_for_interval(
-            segments=preferences[slice.owner], start=slice.start, end=slice.end
-        )
+        owner_whole_cake_value = slice_values[slice.owner, j]
         owner_fudge_value = de_norm(
             v=fudge_factor, whole_cake_value=owner_whole_cake_value
         )
@@ -148,7 +162,7 @@ def find_envy_free_allocation(
     preferences: Preferences,
     epsilon: Decimal,
 ) -> List[AssignedSlice]:
-    cake_size = to_decimal(cake_size)
+    cake_size = to_number(cake_size)
     for allocation in generate_all_possible_allocations(cuts, num_agents):
         envy_free_allocation = []
         for agent_id, slices in enumerate(allocation):
@@ -164,10 +178,10 @@ def find_envy_free_allocation(
                     end = cuts[slice_index]
                 unassigned_slice = cut_slice(
                     preferences=preferences,
-                    cake_size=to_decimal(cake_size),
+                    cake_size=to_number(cake_size),
                     epsilon=epsilon,
-                    start=to_decimal(start),
-                    end=to_decimal(end),
+                    start=to_number(start),
+                    end=to_number(end),
                     id=slice_index,
                     note=None,
                 )
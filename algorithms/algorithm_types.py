@@ -36,6 +36,20 @@ class Result:
     steps: List[Step]
 
 
+@dataclass(frozen=True)
+class Rejected:
+    """
+    A candidate of a condition check that failed, and why. It is falsy, like
+    the empty dict a successful check would otherwise be compared against.
+    """
+
+    candidate: str
+    reason: str
+
+    def __bool__(self) -> bool:
+        return False
+
+
 def make_step(
     actor: int,
     action: str,
@@ -0,0 +1,340 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from decimal import getcontext
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from type_helper import to_number
+
+getcontext().prec = 15
+
+# ITP parameters, see Oliveira & Takahashi, "An Enhancement of the Bisection
+# Method Average Performance Preserving Minmax Optimality" (2020)
+ITP_KAPPA_1 = "0.2"
+ITP_N_0 = 1
+
+
+@dataclass(frozen=True)
+class RootResult:
+    """
+    Outcome of `find_root`.
+
+    `x` is the point returned and `fx` its value (None if it was never
+    evaluated), `lower` and `upper` the final bracket with f(lower) < 0 <= f(upper)
+    for every end that was evaluated, and `iterations` the number of evaluations
+    of f. `converged` is False if the search stopped at `max_iterations`.
+    """
+
+    x: Any
+    fx: Any
+    lower: Any
+    upper: Any
+    iterations: int
+    converged: bool
+
+
+def find_root(
+    f: Callable[[Any], Optional[Any]],
+    lower,
+    upper,
+    position_tolerance,
+    value_tolerance=None,
+    f_lower=None,
+    f_upper=None,
+    guess=None,
+    integral: bool = False,
+    max_iterations: int = 1000,
+) -> RootResult:
+    """
+    Root of a non-decreasing `f` on [lower, upper] by the ITP method.
+
+    The search stops as soon as |f(x)| <= `value_tolerance` (never, if it is
+    None) or once the bracket is at most `position_tolerance` wide, in which
+    case the bracket end closest to the root is returned. ITP picks each point
+    between the bisection midpoint and the regula falsi estimate, so it needs
+    as many evaluations as bisection in the worst case and far fewer on smooth
+    functions such as v''.
+
+    `f_lower` and `f_upper` are values already known at the ends, ends without
+    one are never evaluated and the search bisects (or starts at `guess`) until
+    both sides of the root have been seen. `f` may return None where it is not
+    defined, such a point is treated as lying above the root.
+
+    With `integral`, the ends are integers and only integers are evaluated, a
+    `position_tolerance` of 1 then finds the first integer where f >= 0.
+    """
+    position_tolerance = to_number(position_tolerance)
+    if position_tolerance <= 0:
+        raise ValueError(
+            f"position_tolerance must be positive, got {position_tolerance}"
+        )
+    if value_tolerance is not None:
+        value_tolerance = to_number(value_tolerance)
+
+    half_tolerance = position_tolerance / 2
+    two = to_number(2)
+    width = to_number(upper - lower)
+    kappa_1 = to_number(ITP_KAPPA_1) / width if width > 0 else to_number(0)
+    n_max = ITP_N_0 + max(
+        0, math.ceil(math.log2(float(width / position_tolerance))) if width > 0 else 0
+    )
+
+    iterations = 0
+    x = None
+    fx = None
+
+    while upper - lower > position_tolerance and iterations < max_iterations:
+        midpoint = (to_number(lower) + to_number(upper)) / 2
+        if f_lower is None or f_upper is None:
+            x = guess if iterations == 0 and guess is not None else midpoint
+        else:
+            # Interpolate, truncate towards the midpoint and project into the
+            # minmax radius around it
+            width = to_number(upper - lower)
+            radius = max(
+                half_tolerance * two ** (n_max - iterations) - width / 2,
+                to_number(0),
+            )
+            offset = kappa_1 * width * width
+            regula_falsi = (f_upper * lower - f_lower * upper) / (f_upper - f_lower)
+            direction = 1 if midpoint > regula_falsi else -1
+            if offset <= abs(midpoint - regula_falsi):
+                x = regula_falsi + direction * offset
+            else:
+                x = midpoint
+            if abs(x - midpoint) > radius:
+                x = midpoint - direction * radius
+
+        if integral:
+            x = min(max(int(round(x)), lower + 1), upper - 1)
+        elif not lower < x < upper:
+            x = midpoint
+
+        fx = f(x)
+        iterations += 1
+
+        if fx is None:
+            upper, f_upper = x, None
+            continue
+        if value_tolerance is not None and abs(fx) <= value_tolerance:
+            return RootResult(x, fx, lower, upper, iterations, True)
+        if fx < 0:
+            lower, f_lower = x, fx
+        else:
+            upper, f_upper = x, fx
+
+    converged = upper - lower <= position_tolerance
+    if f_lower is None and f_upper is None:
+        x, fx = (upper, None) if integral else ((lower + upper) / 2, None)
+    elif f_upper is None or (
+        not integral and f_lower is not None and abs(f_lower) < abs(f_upper)
+    ):
+        x, fx = lower, f_lower
+    else:
+        x, fx = upper, f_upper
+    return RootResult(x, fx, lower, upper, iterations, converged)
+
+
+class WarmStarts:
+    """
+    Roots found earlier in a request, per search and alpha.
+
+    The cuts the condition checks search for move monotonically with alpha,
+    so the roots found for the nearest alpha below and above a new one bracket
+    its root, whichever way the cut moves. `hits` counts the searches that
+    found their root inside such a bracket, `misses` those that had to fall
+    back to the full one.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._roots: Dict[Hashable, Dict[Any, Any]] = {}
+
+    def bracket(
+        self, key: Hashable, alpha, lower, upper, padding
+    ) -> Tuple[Any, Any, Optional[Any]]:
+        """Bracket (within [lower, upper]) and first guess for the root at alpha"""
+        roots = self._roots.get(key, {})
+        if alpha in roots:
+            return lower, upper, roots[alpha]
+
+        below = max((a for a in roots if a < alpha), default=None)
+        above = min((a for a in roots if a > alpha), default=None)
+        if below is None or above is None:
+            nearest = below if above is None else above
+            return lower, upper, None if nearest is None else roots[nearest]
+
+        x_below, x_above = roots[below], roots[above]
+        guess = x_below + (x_above - x_below) * (alpha - below) / (above - below)
+        warm_lower = max(lower, min(x_below, x_above) - padding)
+        warm_upper = min(upper, max(x_below, x_above) + padding)
+        if warm_lower >= warm_upper:
+            return lower, upper, guess
+        return warm_lower, warm_upper, guess
+
+    def record(self, key: Hashable, alpha, x) -> None:
+        self._roots.setdefault(key, {})[alpha] = x
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+_current_warm_starts: ContextVar[Optional[WarmStarts]] = ContextVar(
+    "warm_starts", default=None
+)
+
+
+@contextmanager
+def warm_starts() -> Iterator[WarmStarts]:
+    """
+    Remember the roots of `find_warm_root` in the enclosed code. Nested uses
+    share the outermost store.
+    """
+    starts = _current_warm_starts.get()
+    if starts is not None:
+        yield starts
+        return
+
+    starts = WarmStarts()
+    token = _current_warm_starts.set(starts)
+    try:
+        yield starts
+    finally:
+        _current_warm_starts.reset(token)
+
+
+def find_warm_root(
+    f: Callable[[Any], Optional[Any]],
+    lower,
+    upper,
+    position_tolerance,
+    key: Hashable,
+    alpha,
+    guess=None,
+    bracket: Optional[Tuple[Any, Any]] = None,
+    **kwargs,
+) -> RootResult:
+    """
+    `find_root` for a search that is repeated as alpha is bisected.
+
+    Inside `warm_starts()`, the search starts from the bracket the roots for
+    neighbouring alphas give (see `WarmStarts`). `bracket` is where the caller
+    expects the root from other searches, the search starts from where the two
+    overlap. If the root turns out not to be inside, the search goes on over
+    the full [lower, upper].
+    """
+    starts = _current_warm_starts.get()
+    if starts is None and bracket is None:
+        return find_root(f, lower, upper, position_tolerance, guess=guess, **kwargs)
+
+    padding = to_number(position_tolerance) * 2
+    warm_lower, warm_upper, warm_guess = lower, upper, None
+    if starts is not None:
+        warm_lower, warm_upper, warm_guess = starts.bracket(
+            key, alpha, lower, upper, padding
+        )
+    if bracket is not None:
+        expected_lower = max(lower, min(bracket) - padding)
+        expected_upper = min(upper, max(bracket) + padding)
+        if max(warm_lower, expected_lower) < min(warm_upper, expected_upper):
+            warm_lower = max(warm_lower, expected_lower)
+            warm_upper = min(warm_upper, expected_upper)
+        elif expected_lower < expected_upper:
+            warm_lower, warm_upper = expected_lower, expected_upper
+    result = find_root(
+        f,
+        warm_lower,
+        warm_upper,
+        position_tolerance,
+        guess=guess if warm_guess is None else warm_guess,
+        **kwargs,
+    )
+
+    value_tolerance = kwargs.get("value_tolerance")
+    found = value_tolerance is not None and (
+        result.fx is not None and abs(result.fx) <= to_number(value_tolerance)
+    )
+    # Both ends either are the real ones or were moved by an evaluation
+    held = (warm_lower == lower or result.lower > warm_lower) and (
+        warm_upper == upper or result.upper < warm_upper
+    )
+    narrowed = warm_lower > lower or warm_upper < upper
+    if found or held:
+        if starts is not None and narrowed:
+            starts.hits += 1
+    else:
+        if starts is not None:
+            starts.misses += 1
+        iterations = result.iterations
+        result = find_root(
+            f, lower, upper, position_tolerance, guess=result.x, **kwargs
+        )
+        result = replace(result, iterations=result.iterations + iterations)
+
+    if starts is not None:
+        starts.record(key, alpha, result.x)
+    return result
+
+
+def expand_feasible_range(
+    feasible: Callable[[Any], bool],
+    centre,
+    step,
+    lower,
+    upper,
+    max_iterations: int = 200,
+) -> Tuple[Any, Any]:
+    """
+    Widest range around the feasible `centre`, within [lower, upper], whose
+    ends are feasible, found to `step`.
+
+    The set of feasible points is taken to be an interval. Each end is
+    bracketed by steps doubling from `step` and then bisected, so it costs
+    O(log(range / step)) calls of `feasible` rather than range / step.
+    """
+    step = to_number(step)
+    return (
+        _feasible_boundary(feasible, centre, -step, lower, max_iterations),
+        _feasible_boundary(feasible, centre, step, upper, max_iterations),
+    )
+
+
+def _feasible_boundary(
+    feasible: Callable[[Any], bool], inside, step, limit, max_iterations: int
+):
+    """Last feasible point from `inside` towards `limit`, moving by `step`."""
+    iterations = 0
+    outside = None
+    stride = step
+    while outside is None:
+        if abs(limit - inside) < abs(step):
+            return inside
+        candidate = inside + stride
+        if candidate == inside:
+            # Below the resolution of the number type at `inside`, no step taken
+            stride *= 2
+            continue
+        if (candidate - limit) * step > 0:
+            candidate = limit
+        if iterations >= max_iterations:
+            return inside
+        iterations += 1
+        if feasible(candidate):
+            inside = candidate
+        else:
+            outside = candidate
+        stride *= 2
+
+    while abs(outside - inside) > abs(step) and iterations < max_iterations:
+        middle = (inside + outside) / 2
+        if middle == inside or middle == outside:
+            # Below the resolution of the number type
+            break
+        iterations += 1
+        if feasible(middle):
+            inside = middle
+        else:
+            outside = middle
+    return inside
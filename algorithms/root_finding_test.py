@@ -0,0 +1,222 @@
+from decimal import Decimal
+
+import pytest
+
+from type_helper import to_decimal
+
+from .root_finding import (
+    expand_feasible_range,
+    find_root,
+    find_warm_root,
+    warm_starts,
+)
+
+
+def test_find_root_linear():
+    result = find_root(
+        lambda x: x - to_decimal("0.3"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-10"),
+        value_tolerance=to_decimal("1e-12"),
+        f_lower=to_decimal("-0.3"),
+        f_upper=to_decimal("0.7"),
+    )
+    assert result.converged
+    assert abs(result.x - to_decimal("0.3")) <= to_decimal("1e-12")
+    assert result.iterations < 10
+
+
+def test_find_root_beats_bisection():
+    def f(x: Decimal) -> Decimal:
+        return x * x * x + x - to_decimal(1)
+
+    result = find_root(
+        f,
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-10"),
+    )
+    assert result.converged
+    assert float(result.x) == pytest.approx(0.6823278038, abs=1e-10)
+    assert result.upper - result.lower <= to_decimal("1e-10")
+    # Bisection needs 34 steps for this bracket
+    assert result.iterations < 34
+
+
+def test_find_root_value_tolerance_stops_early():
+    result = find_root(
+        lambda x: x - to_decimal("0.5"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-10"),
+        value_tolerance=to_decimal("1e-3"),
+    )
+    assert result.x == to_decimal("0.5")
+    assert result.iterations == 1
+
+
+def test_find_root_max_iterations():
+    result = find_root(
+        lambda x: x - to_decimal("0.123456789"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-12"),
+        max_iterations=3,
+    )
+    assert not result.converged
+    assert result.iterations == 3
+    assert result.lower < to_decimal("0.123456789") <= result.upper
+
+
+def test_find_root_undefined_points_lie_above_the_root():
+    result = find_root(
+        lambda x: None if x > to_decimal("0.4") else x - to_decimal("0.1"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-9"),
+    )
+    assert result.converged
+    assert float(result.x) == pytest.approx(0.1, abs=1e-9)
+
+
+def test_find_root_integral_first_index_reaching():
+    # Step function: first n with f(n) >= 0 is 37
+    result = find_root(
+        lambda n: to_decimal(1) if n >= 37 else to_decimal(-1),
+        lower=0,
+        upper=1000,
+        position_tolerance=1,
+        f_lower=to_decimal(-1),
+        f_upper=to_decimal(1),
+        integral=True,
+    )
+    assert result.converged
+    assert result.x == 37
+    assert isinstance(result.x, int)
+
+
+def test_find_root_rejects_zero_position_tolerance():
+    with pytest.raises(ValueError):
+        find_root(lambda x: x, to_decimal(-1), to_decimal(1), position_tolerance=0)
+
+
+def test_find_warm_root_narrows_to_neighbouring_alphas():
+    def search(alpha: Decimal):
+        calls = []
+
+        def f(x: Decimal) -> Decimal:
+            calls.append(x)
+            return x * x - alpha
+
+        result = find_warm_root(
+            f,
+            lower=to_decimal(0),
+            upper=to_decimal(1),
+            position_tolerance=to_decimal("1e-9"),
+            key="sqrt",
+            alpha=alpha,
+        )
+        return result, calls
+
+    with warm_starts() as starts:
+        search(to_decimal("0.25"))
+        search(to_decimal("0.36"))
+        result, calls = search(to_decimal("0.3"))
+
+    assert float(result.x) == pytest.approx(0.3**0.5, abs=1e-9)
+    assert all(to_decimal("0.5") <= x <= to_decimal("0.6") for x in calls)
+    assert starts.stats() == {"hits": 1, "misses": 0}
+
+
+def test_find_warm_root_falls_back_to_the_full_bracket():
+    with warm_starts() as starts:
+        for alpha, root in [("0.2", "0.2"), ("0.4", "0.3"), ("0.3", "0.9")]:
+            result = find_warm_root(
+                lambda x: x - to_decimal(root),
+                lower=to_decimal(0),
+                upper=to_decimal(1),
+                position_tolerance=to_decimal("1e-9"),
+                key="not monotone",
+                alpha=to_decimal(alpha),
+            )
+            assert float(result.x) == pytest.approx(float(root), abs=1e-9)
+
+    assert starts.stats() == {"hits": 0, "misses": 1}
+
+
+def test_expand_feasible_range():
+    calls = []
+
+    def feasible(x: Decimal) -> bool:
+        calls.append(x)
+        return to_decimal("0.3") <= x <= to_decimal("0.45")
+
+    lower, upper = expand_feasible_range(
+        feasible,
+        centre=to_decimal("0.4"),
+        step=to_decimal("1e-12"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+    )
+    assert to_decimal("0.3") <= lower <= to_decimal("0.3") + to_decimal("1e-12")
+    assert to_decimal("0.45") - to_decimal("1e-12") <= upper <= to_decimal("0.45")
+    # Stepping by 1e-12 would take 1.5e11 calls
+    assert len(calls) < 200
+
+
+def test_expand_feasible_range_stops_at_the_limits():
+    lower, upper = expand_feasible_range(
+        lambda x: True,
+        centre=to_decimal("0.5"),
+        step=to_decimal("1e-15"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+    )
+    assert (lower, upper) == (to_decimal(0), to_decimal(1))
+
+
+def test_expand_feasible_range_above_one():
+    # Steps of 1e-15 vanish in 15 digits once the centre is 1 or more
+    lower, upper = expand_feasible_range(
+        lambda x: to_decimal("1.2") <= x <= to_decimal("1.8"),
+        centre=to_decimal("1.5"),
+        step=to_decimal("1e-15"),
+        lower=to_decimal(0),
+        upper=to_decimal(3),
+    )
+    assert to_decimal("1.2") <= lower < to_decimal("1.2") + to_decimal("1e-13")
+    assert to_decimal("1.8") - to_decimal("1e-13") < upper <= to_decimal("1.8")
+
+
+def test_find_warm_root_starts_from_the_expected_bracket():
+    calls = []
+
+    def f(x: Decimal) -> Decimal:
+        calls.append(x)
+        return x - to_decimal("0.42")
+
+    result = find_warm_root(
+        f,
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-9"),
+        key="expected",
+        alpha=to_decimal("0.3"),
+        bracket=(to_decimal("0.4"), to_decimal("0.45")),
+    )
+    assert float(result.x) == pytest.approx(0.42, abs=1e-9)
+    assert all(to_decimal("0.39") <= x <= to_decimal("0.46") for x in calls)
+
+
+def test_find_warm_root_falls_back_when_the_expected_bracket_is_wrong():
+    result = find_warm_root(
+        lambda x: x - to_decimal("0.8"),
+        lower=to_decimal(0),
+        upper=to_decimal(1),
+        position_tolerance=to_decimal("1e-9"),
+        key="expected",
+        alpha=to_decimal("0.3"),
+        bracket=(to_decimal("0.4"), to_decimal("0.45")),
+    )
+    assert float(result.x) == pytest.approx(0.8, abs=1e-9)
@@ -1,8 +1,8 @@
 from dataclasses import dataclass, field
 from decimal import Decimal, getcontext
-from typing import List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
 
-from type_helper import to_decimal
+from type_helper import to_number
 
 getcontext().prec = 15
 
@@ -21,10 +21,99 @@ class Segment:
     end_value: Decimal = field(default_factory=Decimal)
 
     def __post_init__(self):
-        self.start = to_decimal(self.start)
-        self.end = to_decimal(self.end)
-        self.start_value = to_decimal(self.start_value)
-        self.end_value = to_decimal(self.end_value)
+        self.start = to_number(self.start)
+        self.end = to_number(self.end)
+        self.start_value = to_number(self.start_value)
+        self.end_value = to_number(self.end_value)
+
+
+@dataclass(frozen=True)
+class SegmentArray:
+    """
+    Struct-of-arrays form of one agent's segments, the i-th segment is
+    (ids[i], starts[i], ends[i], start_values[i], end_values[i]).
+
+    Hot paths read the columns directly instead of dereferencing `Segment`
+    objects, `Segment`s are only created at the API boundary
+    (`from_segments`, `to_segments`, iteration and indexing).
+    """
+
+    ids: Tuple[int, ...] = ()
+    starts: Tuple[Decimal, ...] = ()
+    ends: Tuple[Decimal, ...] = ()
+    start_values: Tuple[Decimal, ...] = ()
+    end_values: Tuple[Decimal, ...] = ()
+
+    def __post_init__(self):
+        assert (
+            len(self.ids)
+            == len(self.starts)
+            == len(self.ends)
+            == len(self.start_values)
+            == len(self.end_values)
+        ), "SegmentArray columns should have the same length"
+
+    @classmethod
+    def from_segments(
+        cls, segments: Union[Iterable[Segment], "SegmentArray"]
+    ) -> "SegmentArray":
+        """Build the columns, converting every number to the current numeric backend."""
+        if isinstance(segments, SegmentArray):
+            columns = (
+                segments.starts,
+                segments.ends,
+                segments.start_values,
+                segments.end_values,
+            )
+            ids = segments.ids
+        else:
+            segments = list(segments)
+            ids = tuple(seg.id for seg in segments)
+            columns = (
+                [seg.start for seg in segments],
+                [seg.end for seg in segments],
+                [seg.start_value for seg in segments],
+                [seg.end_value for seg in segments],
+            )
+
+        starts, ends, start_values, end_values = (
+            tuple(to_number(v) for v in column) for column in columns
+        )
+        return cls(
+            ids=ids,
+            starts=starts,
+            ends=ends,
+            start_values=start_values,
+            end_values=end_values,
+        )
+
+    def to_segments(self) -> List[Segment]:
+        return list(self)
+
+    def sorted_by_start(self) -> "SegmentArray":
+        order = sorted(range(len(self)), key=lambda i: self.starts[i])
+        return SegmentArray(
+            ids=tuple(self.ids[i] for i in order),
+            starts=tuple(self.starts[i] for i in order),
+            ends=tuple(self.ends[i] for i in order),
+            start_values=tuple(self.start_values[i] for i in order),
+            end_values=tuple(self.end_values[i] for i in order),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Segment]:
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, i: int) -> Segment:
+        return Segment(
+            id=self.ids[i],
+            start=self.starts[i],
+            end=self.ends[i],
+            start_value=self.start_values[i],
+            end_value=self.end_values[i],
+        )
 
 
 @dataclass
@@ -41,13 +130,13 @@ class DrawnSegment:
     currently_drawing: Optional[bool] = None
 
     def __post_init__(self):
-        self.x1 = to_decimal(self.x1)
-        self.x2 = to_decimal(self.x2)
-        self.y1 = to_decimal(self.y1)
-        self.y2 = to_decimal(self.y2)
+        self.x1 = to_number(self.x1)
+        self.x2 = to_number(self.x2)
+        self.y1 = to_number(self.y1)
+        self.y2 = to_number(self.y2)
 
 
-Preferences = List[List[Segment]]
+Preferences = List[Union[List[Segment], SegmentArray]]
 
 
 @dataclass
@@ -73,9 +162,9 @@ class Slice:
     values: List[Decimal] = field(default_factory=list)
 
     def __post_init__(self):
-        self.start = to_decimal(self.start)
-        self.end = to_decimal(self.end)
-        self.values = [to_decimal(v) for v in self.values]
+        self.start = to_number(self.start)
+        self.end = to_number(self.end)
+        self.values = [to_number(v) for v in self.values]
 
     def assign(self, agent: int) -> "AssignedSlice":
         """Allocate a slice to a specific agent and create an immutable copy as AssignedSlice."""
@@ -98,9 +187,9 @@ class FrozenUnassignedSlice:
     values: List[Decimal] = field(default_factory=list)
 
     def __post_init__(self):
-        object.__setattr__(self, "start", to_decimal(self.start))
-        object.__setattr__(self, "end", to_decimal(self.end))
-        object.__setattr__(self, "values", [to_decimal(v) for v in self.values])
+        object.__setattr__(self, "start", to_number(self.start))
+        object.__setattr__(self, "end", to_number(self.end))
+        object.__setattr__(self, "values", [to_number(v) for v in self.values])
 
     def assign(self, agent, note_override=None):
         return AssignedSlice(
@@ -123,9 +212,9 @@ class AssignedSlice:
     values: List[Decimal] = field(default_factory=list)
 
     def __post_init__(self):
-        object.__setattr__(self, "start", to_decimal(self.start))
-        object.__setattr__(self, "end", to_decimal(self.end))
-        object.__setattr__(self, "values", [to_decimal(v) for v in self.values])
+        object.__setattr__(self, "start", to_number(self.start))
+        object.__setattr__(self, "end", to_number(self.end))
+        object.__setattr__(self, "values", [to_number(v) for v in self.values])
 
 
 @dataclass
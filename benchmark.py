@@ -0,0 +1,115 @@
+"""
+Compare the numeric backends on a few fixed inputs.
+
+    python benchmark.py [--repeat N]
+
+For every backend this prints the wall time of `alex_aviad` and the envy
+error of the allocation it returns: the largest amount, as a share of the
+whole cake, by which an agent values another agent's piece over their own.
+"""
+
+import argparse
+import logging
+import time
+from decimal import Decimal, getcontext
+from typing import Dict, List
+
+import numpy as np
+
+from algorithms.alex_aviad import alex_aviad
+from base_types import AssignedSlice, Segment
+from numeric_backend import BACKENDS
+from values import get_values_for_intervals
+
+getcontext().prec = 15
+
+EPSILON = Decimal("1e-15")
+TOLERANCE = Decimal("1e-10")
+
+
+def _seg(id: int, start, end, start_value, end_value) -> Segment:
+    return Segment(
+        id=id,
+        start=Decimal(str(start)),
+        end=Decimal(str(end)),
+        start_value=Decimal(str(start_value)),
+        end_value=Decimal(str(end_value)),
+    )
+
+
+CASES: Dict[str, Dict] = {
+    "flat": {
+        "cake_size": 1,
+        "preferences": [[_seg(i, 0, 1, 10, 10)] for i in range(4)],
+    },
+    "slope": {
+        "cake_size": 1,
+        "preferences": [[_seg(i, 0, 1, 10, 0)] for i in range(4)],
+    },
+    "flat_three_segs": {
+        "cake_size": 3,
+        "preferences": [
+            [_seg(3 * i, 0, 1, 10, 10), _seg(3 * i + 1, 1, 2, 5, 5), _seg(3 * i + 2, 2, 3, 10, 10)]
+            for i in range(4)
+        ],
+    },
+    "slope_flat": {
+        "cake_size": 2,
+        "preferences": [
+            [_seg(2 * i, 0, 1, 10, 0), _seg(2 * i + 1, 1, 2, 5, 5)] for i in range(4)
+        ],
+    },
+}
+
+
+def envy_error(
+    preferences: List[List[Segment]], cake_size: int, allocation: List[AssignedSlice]
+) -> float:
+    values = get_values_for_intervals(
+        preferences,
+        starts=[slice.start for slice in allocation],
+        ends=[slice.end for slice in allocation],
+    )
+    whole = get_values_for_intervals(preferences, starts=[0], ends=[cake_size])[:, 0]
+    owners = np.array([slice.owner for slice in allocation])
+
+    error = 0.0
+    for agent in range(len(preferences)):
+        own = values[agent, owners == agent].sum()
+        others = max(values[agent, owners == other].sum() for other in set(owners))
+        error = max(error, (others - own) / whole[agent])
+    return float(error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'case':<18}{'backend':<10}{'seconds':>10}{'speedup':>10}{'envy error':>14}")
+    for case, data in CASES.items():
+        reference = None
+        for backend in BACKENDS:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                result = alex_aviad(
+                    data["preferences"],
+                    data["cake_size"],
+                    EPSILON,
+                    TOLERANCE,
+                    backend=backend,
+                )
+                timings.append(time.perf_counter() - started)
+            seconds = min(timings)
+            reference = reference or seconds
+            error = envy_error(data["preferences"], data["cake_size"], result["solution"])
+            print(
+                f"{case:<18}{backend:<10}{seconds:>10.4f}{reference / seconds:>9.2f}x{error:>14.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
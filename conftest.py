@@ -0,0 +1,6 @@
+import os
+
+from verification import VERIFY_ENV
+
+# Run every internal consistency check in the tests, worker processes inherit it
+os.environ[VERIFY_ENV] = "full"
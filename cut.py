@@ -2,8 +2,8 @@ from decimal import Decimal, getcontext
 from typing import List
 
 from base_types import FrozenUnassignedSlice, Preferences, Slice
-from type_helper import de_norm, to_decimal
-from valuation import get_double_prime_for_interval
+from type_helper import de_norm, to_number
+from valuation import get_double_prime_for_interval, get_whole_cake_value
 from values import get_value_for_interval
 
 getcontext().prec = 15
@@ -32,7 +32,7 @@ def cut_cake(
 ) -> List[FrozenUnassignedSlice]:
 
     slices = []
-    start = to_decimal(0)
+    start = to_number(0)
 
     for i, end in enumerate(cuts):
         slice = cut_slice(
@@ -69,11 +69,7 @@ def cut_slice(
             v=get_double_prime_for_interval(
                 segments, epsilon, start, end, cake_size=cake_size
             ),
-            whole_cake_value=get_value_for_interval(
-                segments,
-                to_decimal(0),
-                to_decimal(cake_size),
-            ),
+            whole_cake_value=get_whole_cake_value(segments, cake_size),
         )
         for segments in preferences
     ]
@@ -8,7 +8,9 @@ from flask_cors import CORS
 from algorithms.alex_aviad import alex_aviad
 from algorithms.alex_aviad_result_helper import build_solution
 from base_types import Segment
+from numeric_backend import DEFAULT_BACKEND
 from type_helper import to_decimal
+from verification import LEVELS
 
 app = Flask(__name__)
 
@@ -32,6 +34,20 @@ def set_decimal_precision():
 @app.route("/alex_aviad", methods=["POST"])
 def handle_alex_aviad():
     data = request.json
+    # "decimal" is the reference, "float" the fast path, "fraction" for verification
+    backend = data.get("backend", os.getenv("NUMERIC_BACKEND", DEFAULT_BACKEND))
+    # "off", "sampled" or "full", by default ALEX_AVIAD_VERIFY's level
+    verification = data.get("verification")
+    if verification is not None and verification not in LEVELS:
+        return (
+            jsonify(
+                {
+                    "error": f"Unknown verification level: {verification}, "
+                    f"expected one of {list(LEVELS)}"
+                }
+            ),
+            400,
+        )
     preferences = [
         [
             Segment(
@@ -58,6 +74,8 @@ def handle_alex_aviad():
         cake_size=int(cake_size),
         epsilon=epsilon,
         tolerance=tolerance,
+        backend=backend,
+        verification=verification,
     )
 
     response = build_solution(
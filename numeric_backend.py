@@ -0,0 +1,156 @@
+import math
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import (
+    ROUND_CEILING,
+    ROUND_DOWN,
+    ROUND_FLOOR,
+    ROUND_UP,
+    Decimal,
+    InvalidOperation,
+    localcontext,
+)
+from fractions import Fraction
+from typing import Dict, Iterator, Optional, Union
+
+Number = Union[Decimal, float, Fraction]
+
+
+class NumericBackend:
+    """
+    The number type the solver computes with.
+
+    `decimal` is the reference implementation (15 significant digits),
+    `float` is the fast path and `fraction` is exact rational arithmetic
+    (apart from square roots) for verification.
+    """
+
+    name: str = ""
+
+    def convert(self, value) -> Number:
+        raise NotImplementedError
+
+    def sqrt(self, value: Number) -> Number:
+        raise NotImplementedError
+
+    def floor(self, value: Number) -> Number:
+        return self.convert(math.floor(value))
+
+    def ceil(self, value: Number) -> Number:
+        return self.convert(math.ceil(value))
+
+    def quantize(self, value: Number, exponent: str, rounding: str) -> Number:
+        """Round `value` to the same number of decimal places as `exponent`, e.g. "0.01"."""
+        scale = 10 ** -Decimal(exponent).as_tuple().exponent
+        scaled = value * scale
+        if abs(scaled - round(scaled)) < 1e-6:
+            # Already on the grid up to representation error
+            return self.convert(round(scaled)) / self.convert(scale)
+
+        if rounding == ROUND_UP:
+            rounded = math.ceil(scaled) if scaled >= 0 else math.floor(scaled)
+        elif rounding == ROUND_DOWN:
+            rounded = math.floor(scaled) if scaled >= 0 else math.ceil(scaled)
+        elif rounding == ROUND_CEILING:
+            rounded = math.ceil(scaled)
+        elif rounding == ROUND_FLOOR:
+            rounded = math.floor(scaled)
+        else:
+            raise ValueError(f"Unsupported rounding: {rounding}")
+        return self.convert(rounded) / self.convert(scale)
+
+
+class DecimalBackend(NumericBackend):
+    name = "decimal"
+
+    def convert(self, value) -> Decimal:
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, Fraction):
+            return Decimal(value.numerator) / Decimal(value.denominator)
+        try:
+            return Decimal(str(value))
+        except InvalidOperation as exc:
+            raise ValueError(f"InvalidOperation：{value}") from exc
+
+    def sqrt(self, value: Decimal) -> Decimal:
+        return value.sqrt()
+
+    def floor(self, value: Decimal) -> Decimal:
+        return value.to_integral_value(rounding=ROUND_FLOOR)
+
+    def ceil(self, value: Decimal) -> Decimal:
+        return value.to_integral_value(rounding=ROUND_CEILING)
+
+    def quantize(self, value: Decimal, exponent: str, rounding: str) -> Decimal:
+        return self.convert(value).quantize(Decimal(exponent), rounding=rounding)
+
+
+class FloatBackend(NumericBackend):
+    name = "float"
+
+    def convert(self, value) -> float:
+        if isinstance(value, float):
+            return value
+        try:
+            return float(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"InvalidOperation：{value}") from exc
+
+    def sqrt(self, value: float) -> float:
+        return math.sqrt(value)
+
+
+class FractionBackend(NumericBackend):
+    name = "fraction"
+
+    def convert(self, value) -> Fraction:
+        if isinstance(value, Fraction):
+            return value
+        try:
+            # Go through str for floats so that 0.1 becomes 1/10, as with Decimal(str(0.1))
+            return Fraction(str(value)) if isinstance(value, float) else Fraction(value)
+        except (TypeError, ValueError, InvalidOperation) as exc:
+            raise ValueError(f"InvalidOperation：{value}") from exc
+
+    def sqrt(self, value: Fraction) -> Fraction:
+        # Square roots are the only inexact step, keep them well below Decimal precision
+        with localcontext() as ctx:
+            ctx.prec = 40
+            root = (Decimal(value.numerator) / Decimal(value.denominator)).sqrt()
+        return Fraction(root)
+
+
+BACKENDS: Dict[str, NumericBackend] = {
+    DecimalBackend.name: DecimalBackend(),
+    FloatBackend.name: FloatBackend(),
+    FractionBackend.name: FractionBackend(),
+}
+
+DEFAULT_BACKEND = DecimalBackend.name
+
+_current_backend: ContextVar[NumericBackend] = ContextVar(
+    "numeric_backend", default=BACKENDS[DEFAULT_BACKEND]
+)
+
+
+def get_backend(name: Optional[str] = None) -> NumericBackend:
+    """Backend registered as `name`, or the one currently in use."""
+    if name is None:
+        return _current_backend.get()
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown numeric backend: {name}, expected one of {list(BACKENDS)}"
+        )
+    return BACKENDS[name]
+
+
+@contextmanager
+def use_backend(name: Optional[str]) -> Iterator[NumericBackend]:
+    """Run the enclosed code with the given backend. `None` keeps the current one."""
+    backend = get_backend(name)
+    token = _current_backend.set(backend)
+    try:
+        yield backend
+    finally:
+        _current_backend.reset(token)
@@ -0,0 +1,47 @@
+from decimal import ROUND_DOWN, ROUND_UP, Decimal
+from fractions import Fraction
+
+import pytest
+
+from numeric_backend import BACKENDS, get_backend, use_backend
+from type_helper import quantize, to_number
+
+
+def test_default_backend_is_decimal():
+    assert get_backend().name == "decimal"
+    assert isinstance(to_number("0.1"), Decimal)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend("bigfloat")
+
+
+def test_use_backend_restores_previous_backend():
+    with use_backend("float"):
+        assert isinstance(to_number("0.1"), float)
+        with use_backend(None):
+            assert get_backend().name == "float"
+        with use_backend("fraction"):
+            assert to_number("0.1") == Fraction(1, 10)
+        assert get_backend().name == "float"
+    assert get_backend().name == "decimal"
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_backend_arithmetic(name):
+    backend = get_backend(name)
+    assert backend.sqrt(backend.convert(4)) == 2
+    assert backend.floor(backend.convert("2.5")) == 2
+    assert backend.ceil(backend.convert("2.5")) == 3
+    assert backend.convert(0.1) == backend.convert("0.1")
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_quantize(name):
+    with use_backend(name):
+        assert quantize(to_number("0.123451"), "0.0001", ROUND_UP) == to_number("0.1235")
+        assert quantize(to_number("0.123459"), "0.0001", ROUND_DOWN) == to_number("0.1234")
+        assert quantize(to_number("-0.123451"), "0.0001", ROUND_UP) == to_number("-0.1235")
+        # Already on the grid, must not move
+        assert quantize(to_number("0.3"), "0.0001", ROUND_UP) == to_number("0.3")
@@ -0,0 +1,175 @@
+import decimal
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Number of worker processes used when the caller does not say, unset means serial
+WORKERS_ENV = "ALEX_AVIAD_WORKERS"
+
+_current_executor: ContextVar[Optional[Executor]] = ContextVar(
+    "executor", default=None
+)
+_current_workers: ContextVar[int] = ContextVar("workers", default=1)
+
+
+def workers_from_env() -> int:
+    value = os.getenv(WORKERS_ENV, "")
+    try:
+        return int(value) if value else 0
+    except ValueError as exc:
+        raise ValueError(f"{WORKERS_ENV} must be an integer, got {value!r}") from exc
+
+
+@contextmanager
+def use_workers(workers: Optional[int] = None) -> Iterator[Optional[Executor]]:
+    """
+    Run the independent jobs of the enclosed code (see `first_success`) on a
+    pool of `workers` processes. `None` reads ALEX_AVIAD_WORKERS, 0 or 1 runs
+    them one after the other in this process. Nested uses share the outer pool.
+
+    Context variables do not reach the workers, jobs have to be given the
+    numeric backend and the like as arguments.
+    """
+    executor = _current_executor.get()
+    if executor is not None:
+        yield executor
+        return
+
+    workers = workers_from_env() if workers is None else workers
+    if workers <= 1:
+        yield None
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    token = _current_executor.set(executor)
+    workers_token = _current_workers.set(workers)
+    try:
+        yield executor
+    finally:
+        _current_workers.reset(workers_token)
+        _current_executor.reset(token)
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def current_workers() -> int:
+    """Number of processes in the pool in use, 1 if there is none"""
+    return _current_workers.get()
+
+
+def run_all(fn: Callable[..., Any], jobs: Sequence[Tuple]) -> List[Any]:
+    """
+    `fn(*job)` for every job, in the order given. Without a pool the jobs run
+    one after the other, with one they all start at once.
+    """
+    executor = _current_executor.get()
+    if executor is None:
+        return [fn(*job) for job in jobs]
+
+    arithmetic = decimal.getcontext().copy()
+    futures = [
+        executor.submit(_in_fresh_context, arithmetic, fn, *job) for job in jobs
+    ]
+    try:
+        return [future.result() for future in futures]
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def first_success(
+    fn: Callable[..., Any],
+    jobs: Sequence[Tuple],
+    succeeded: Callable[[Any], bool] = bool,
+    finished: Optional[Callable[[Any], None]] = None,
+) -> Optional[Tuple[int, Any]]:
+    """
+    (index, result) of the first job, in the order given, for which
+    `succeeded(fn(*job))` holds, or None if there is none. `finished` is
+    called here with the result of every job that ran to the end.
+
+    Without a pool the jobs run in order until one succeeds. With one they all
+    start at once, and as soon as a job succeeds the ones after it that have
+    not finished are cancelled. A job that raises does so once the jobs before
+    it have failed, the answer is the same either way.
+    """
+    executor = _current_executor.get()
+    if executor is None:
+        for index, job in enumerate(jobs):
+            result = fn(*job)
+            if finished is not None:
+                finished(result)
+            if succeeded(result):
+                return index, result
+        return None
+
+    arithmetic = decimal.getcontext().copy()
+    futures: Dict[Future, int] = {
+        executor.submit(_in_fresh_context, arithmetic, fn, *job): i
+        for i, job in enumerate(jobs)
+    }
+    # (exception, result) of the jobs that finished, by index
+    outcomes: Dict[int, Tuple[Optional[BaseException], Any]] = {}
+    walked = 0
+    pending = set(futures)
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                result = future.result() if error is None else None
+                outcomes[futures[future]] = (error, result)
+                if error is None and finished is not None:
+                    finished(result)
+
+            # Go through the finished jobs in order, as the serial loop would,
+            # a job only raises once all those before it have failed
+            while walked in outcomes:
+                error, result = outcomes[walked]
+                if error is not None:
+                    raise error
+                if succeeded(result):
+                    return walked, result
+                walked += 1
+
+            best = min(
+                (
+                    index
+                    for index, (error, result) in outcomes.items()
+                    if error is None and succeeded(result)
+                ),
+                default=None,
+            )
+            if best is not None:
+                # Later jobs cannot change the answer any more
+                for future in pending:
+                    if futures[future] > best:
+                        future.cancel()
+                pending = {future for future in pending if futures[future] < best}
+    finally:
+        for future in pending:
+            future.cancel()
+
+    return None
+
+
+def _in_fresh_context(
+    arithmetic: decimal.Context, fn: Callable[..., Any], *job
+) -> Any:
+    # Forked workers inherit the context of the process that started them, the
+    # pool and request state such as memos included. Jobs start from none of
+    # it, whatever the worker ran before, and fan out again in order. Only the
+    # caller's decimal context, which lives in a context variable too, is
+    # carried over, as `arithmetic`
+    def run() -> Any:
+        decimal.setcontext(arithmetic)
+        return fn(*job)
+
+    return Context().run(run)
@@ -0,0 +1,146 @@
+import time
+from contextvars import ContextVar
+from decimal import ROUND_DOWN, Decimal, getcontext, localcontext
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from parallel import (
+    WORKERS_ENV,
+    current_workers,
+    first_success,
+    run_all,
+    use_workers,
+    workers_from_env,
+)
+
+
+_request: ContextVar[str] = ContextVar("request", default="none")
+
+
+def _logged_square(
+    log: str, n: int, wait_for: str = "", fail: bool = False
+) -> Optional[int]:
+    """
+    n * n once `wait_for` shows up in the `log` directory, None if it does not
+    within 30 seconds. Records when it starts and finishes there. With `fail`,
+    raises instead, right after it starts.
+    """
+    (Path(log) / f"{n}.started").touch()
+    if fail:
+        raise RuntimeError(f"job {n} failed")
+    deadline = time.monotonic() + 30
+    while wait_for and not (Path(log) / wait_for).exists():
+        if time.monotonic() > deadline:
+            return None
+        time.sleep(0.01)
+    (Path(log) / f"{n}.finished").touch()
+    return n * n
+
+
+def _seen_by_job() -> tuple:
+    return _request.get(), current_workers(), Decimal(1) / Decimal(3)
+
+
+def _seen_by_two_thirds() -> tuple:
+    return _request.get(), current_workers(), Decimal(2) / Decimal(3)
+
+
+def test_workers_from_env(monkeypatch):
+    monkeypatch.delenv(WORKERS_ENV, raising=False)
+    assert workers_from_env() == 0
+    monkeypatch.setenv(WORKERS_ENV, "3")
+    assert workers_from_env() == 3
+    monkeypatch.setenv(WORKERS_ENV, "many")
+    with pytest.raises(ValueError):
+        workers_from_env()
+
+
+def test_first_success_serial_stops_at_first_success():
+    calls = []
+
+    def square(n: int) -> int:
+        calls.append(n)
+        return n * n
+
+    with use_workers(0) as executor:
+        assert executor is None
+        assert first_success(square, [(0,), (2,), (3,)]) == (1, 4)
+        assert first_success(square, [(0,), (0,)]) is None
+    assert calls == [0, 2, 0, 0]
+
+
+def test_first_success_in_pool_is_the_lowest_index(tmp_path):
+    log = str(tmp_path)
+    # Job 2 finishes first, but job 1 succeeds too and comes before it. Job 3
+    # only finishes once released
+    jobs = [(log, 0, "2.finished"), (log, 1), (log, 2), (log, 3, "release")]
+    with use_workers(4) as executor:
+        assert executor is not None
+        with use_workers(2) as nested:
+            assert nested is executor
+        assert first_success(_logged_square, jobs) == (1, 1)
+        # The slow last job was not waited for
+        assert not (tmp_path / "3.finished").exists()
+        (tmp_path / "release").touch()
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_first_success_raises_as_the_serial_loop_would(tmp_path, workers):
+    log = str(tmp_path)
+    with use_workers(workers):
+        # In a pool, job 1 fails before job 0 finishes, but job 0 comes first
+        # and succeeds
+        wait_for = "2.started" if workers else ""
+        jobs = [(log, 1, wait_for), (log, 2, "", True)]
+        assert first_success(_logged_square, jobs) == (0, 1)
+        # Job 1 fails after job 0, which did not succeed, and before job 2
+        jobs = [(log, 0), (log, 3, "", True), (log, 4)]
+        with pytest.raises(RuntimeError, match="job 3 failed"):
+            first_success(_logged_square, jobs)
+
+
+def test_run_all_keeps_the_order_of_the_jobs(tmp_path):
+    serial, pool = tmp_path / "serial", tmp_path / "pool"
+    serial.mkdir()
+    pool.mkdir()
+    log = str(serial)
+    assert current_workers() == 1
+    assert run_all(_logged_square, [(log, 1), (log, 2), (log, 3)]) == [1, 4, 9]
+    with use_workers(3):
+        assert current_workers() == 3
+        # Jobs 1 and 3 each wait for the other to start, they only both finish
+        # when they run side by side
+        log = str(pool)
+        jobs = [(log, 1, "3.started"), (log, 2), (log, 3, "1.started")]
+        assert run_all(_logged_square, jobs) == [1, 4, 9]
+    assert current_workers() == 1
+
+
+def test_jobs_in_a_pool_start_from_a_fresh_context():
+    token = _request.set("parent")
+    try:
+        with use_workers(2):
+            request, workers, third = run_all(_seen_by_job, [()])[0]
+    finally:
+        _request.reset(token)
+
+    # Neither the parent's state nor its pool, but its decimal precision
+    assert (request, workers) == ("none", 1)
+    assert third == Decimal(1) / Decimal(3)
+    assert len(third.as_tuple().digits) == getcontext().prec
+
+
+def test_jobs_in_a_pool_use_the_callers_decimal_context():
+    with use_workers(2):
+        # Started before the change, the workers cannot have inherited it
+        run_all(_seen_by_job, [(), ()])
+        with localcontext() as arithmetic:
+            arithmetic.prec = 20
+            arithmetic.rounding = ROUND_DOWN
+            _, _, third = run_all(_seen_by_job, [()])[0]
+            _, (_, _, two_thirds) = first_success(_seen_by_two_thirds, [()])
+
+    assert third == Decimal("0.33333333333333333333")
+    assert two_thirds == Decimal("0.66666666666666666666")
@@ -1,5 +1,7 @@
 from decimal import Decimal, InvalidOperation, getcontext
 
+from numeric_backend import Number, get_backend
+
 getcontext().prec = 15
 
 
@@ -12,12 +14,25 @@ def to_decimal(value) -> Decimal:
         raise ValueError(f"InvalidOperation：{value}") from exc
 
 
+def to_number(value) -> Number:
+    """
+    Convert to the number type of the numeric backend in use,
+    a Decimal (same as `to_decimal`) unless another backend is selected.
+    """
+    return get_backend().convert(value)
+
+
+def quantize(value: Number, exponent: str, rounding: str) -> Number:
+    """Backend independent `Decimal.quantize`, e.g. quantize(x, "0.01", ROUND_DOWN)."""
+    return get_backend().quantize(to_number(value), exponent, rounding)
+
+
 def almost_equal(a: Decimal, b: Decimal, tolerance: Decimal) -> bool:
-    a, b = to_decimal(a), to_decimal(b)
+    a, b = to_number(a), to_number(b)
     if a > 0 and b > 0:
-        adjusted_tolerance = max(tolerance, Decimal(1))
+        adjusted_tolerance = max(tolerance, to_number(1))
     else:
-        adjusted_tolerance = max(tolerance, Decimal("1e-2"))
+        adjusted_tolerance = max(tolerance, to_number("1e-2"))
 
     absolute_difference = abs(a - b)
     return absolute_difference <= adjusted_tolerance
@@ -28,14 +43,14 @@ def scale_to_unit(a: Decimal, cake_size: Decimal) -> Decimal:
     Adjust cut point value from [0, cake_size] to [0, 1]
     """
     assert (
-        to_decimal(0) <= a <= to_decimal(cake_size)
+        to_number(0) <= a <= to_number(cake_size)
     ), f"a must be greater than or equal to 0 and less than cake_size: {cake_size}, got {a}"
 
     if cake_size == 1:
-        return to_decimal(a)
+        return to_number(a)
     elif cake_size == 0:
-        return to_decimal(0)
-    return to_decimal(a) / to_decimal(cake_size)
+        return to_number(0)
+    return to_number(a) / to_number(cake_size)
 
 
 def scale_back_from_unit(a: Decimal, cake_size: Decimal) -> Decimal:
@@ -43,29 +58,29 @@ def scale_back_from_unit(a: Decimal, cake_size: Decimal) -> Decimal:
     Adjust cut point value from [0, 1] back to [0, cake_size]
     """
     assert (
-        to_decimal(0) <= a <= to_decimal(1)
+        to_number(0) <= a <= to_number(1)
     ), f"a must be greater than or equal to 0 and less than 1, to transform back to [0, cake_size({cake_size})], got {a}, "
 
     if cake_size == 1:
-        return to_decimal(a)
+        return to_number(a)
     elif cake_size == 0:
-        return to_decimal(0)
-    return to_decimal(a) * to_decimal(cake_size)
+        return to_number(0)
+    return to_number(a) * to_number(cake_size)
 
 
 def norm(v: Decimal, whole_cake_value: Decimal) -> Decimal:
     """
     Adjust value from infinity to [0, 1]
     """
-    whole_cake_value = to_decimal(whole_cake_value)
-    v = to_decimal(v)
+    whole_cake_value = to_number(whole_cake_value)
+    v = to_number(v)
 
     assert (
-        to_decimal(0) <= v <= whole_cake_value
+        to_number(0) <= v <= whole_cake_value
     ), f"v must be greater than or equal to 0 and less than whole cake value: {whole_cake_value}, got {v}"
 
     if whole_cake_value == 0:
-        return to_decimal(0)
+        return to_number(0)
 
     return v / whole_cake_value
 
@@ -74,14 +89,14 @@ def de_norm(v: Decimal, whole_cake_value: Decimal) -> Decimal:
     """
     De-normalize a value from [0, 1] back to [0, whole_cake_value].
     """
-    v = to_decimal(v)
-    whole_cake_value = to_decimal(whole_cake_value)
+    v = to_number(v)
+    whole_cake_value = to_number(whole_cake_value)
 
     assert (
-        Decimal(0) <= v <= Decimal(1)
+        to_number(0) <= v <= to_number(1)
     ), f"Normalized value must be between 0 and 1, got {v}"
 
     if whole_cake_value == 0:
-        return to_decimal(0)
+        return to_number(0)
 
     return v * whole_cake_value
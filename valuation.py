@@ -1,29 +1,331 @@
 import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from decimal import Decimal, getcontext
-from typing import List
-
-from base_types import Segment
-from type_helper import norm, scale_back_from_unit, scale_to_unit, to_decimal
-from values import get_value_for_interval
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from base_types import SegmentArray
+from numeric_backend import get_backend
+from parallel import first_success, run_all
+from type_helper import norm, scale_back_from_unit, scale_to_unit, to_number
+from values import (
+    Preference,
+    PreferenceIndex,
+    columns_fingerprint,
+    get_value_for_interval,
+)
 
 getcontext().prec = 15
 
+LATTICE_TABLE_SIZE = 2**16
+
+
+class LatticeTable:
+    """
+    Lazily filled table of v'(i * delta, j * delta) keyed by the integer grid
+    indices (i, j), evicting the least recently used corner beyond `maxsize`.
+
+    Searches keep snapping to the same grid corners, so revisiting one costs a
+    dictionary lookup instead of a valuation. `hits` and `misses` count lookups.
+    """
+
+    def __init__(self, maxsize: int = LATTICE_TABLE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values: "OrderedDict[Tuple[int, int], Decimal]" = OrderedDict()
+
+    def get(self, i: int, j: int, compute: Callable[[], Decimal]) -> Decimal:
+        key = (i, j)
+        value = self._values.get(key)
+        if value is not None:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self._values[key] = compute()
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self):
+        self._values.clear()
+        self.hits = self.misses = 0
+
+
+@dataclass(frozen=True)
+class ValuationContext(PreferenceIndex):
+    """
+    One agent's preference bound to the cake it is valued on.
+
+    The compiled index and the whole-cake value used for normalisation are
+    computed once, so `v`, `v_prime` and `v_double_prime` only pay for the
+    interval itself. Being a `PreferenceIndex`, it can be passed anywhere a
+    preference is expected, the valuation functions below pick up the cached
+    values from it.
+    """
+
+    cake_size: Decimal
+    epsilon: Decimal
+    whole_cake_value: Decimal
+    # One v' table per grid step, in practice there is only the clamped epsilon
+    lattice_tables: Dict[Decimal, LatticeTable] = field(
+        default_factory=dict, compare=False, hash=False, repr=False
+    )
+
+    @classmethod
+    def from_preference(
+        cls, preference: Preference, cake_size: Decimal, epsilon: Decimal
+    ) -> "ValuationContext":
+        index = PreferenceIndex.from_segments(preference)
+        cake_size = to_number(cake_size)
+        return cls(
+            segments=index.segments,
+            cumulative=index.cumulative,
+            backend=index.backend,
+            cake_size=cake_size,
+            epsilon=to_number(epsilon),
+            whole_cake_value=index.value_for_interval(to_number(0), cake_size),
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lattice tables are a cache of this process, workers start empty
+        state = dict(self.__dict__)
+        state["lattice_tables"] = {}
+        return state
+
+    def lattice_table(self, delta: Decimal) -> LatticeTable:
+        table = self.lattice_tables.get(delta)
+        if table is None:
+            table = self.lattice_tables[delta] = LatticeTable()
+        return table
+
+    def v(self, a: Decimal, b: Decimal) -> Decimal:
+        return _v(self, a, b, self.cake_size, self.whole_cake_value)
+
+    def v_prime(self, a: Decimal, b: Decimal) -> Decimal:
+        return _v_prime(
+            self, self.epsilon, a, b, self.cake_size, self.whole_cake_value
+        )
+
+    def v_double_prime(self, start: Decimal, end: Decimal) -> Decimal:
+        return get_double_prime_for_interval(
+            self, self.epsilon, start, end, self.cake_size
+        )
+
+
+def as_valuation_context(
+    preference: Preference, cake_size: Decimal, epsilon: Decimal
+) -> ValuationContext:
+    """Bind `preference` to the cake, reusing it if it is already bound the same way."""
+    if (
+        isinstance(preference, ValuationContext)
+        and preference.backend == get_backend().name
+        and preference.cake_size == cake_size
+        and preference.epsilon == epsilon
+    ):
+        return preference
+    return ValuationContext.from_preference(preference, cake_size, epsilon)
+
+
+def get_whole_cake_value(preference: Preference, cake_size: Decimal) -> Decimal:
+    """Value of [0, cake_size], cached on a `ValuationContext` bound to that cake."""
+    if isinstance(preference, ValuationContext) and preference.cake_size == cake_size:
+        return preference.whole_cake_value
+    return get_value_for_interval(preference, to_number(0), to_number(cake_size))
+
+
+class ValuationNotebook:
+    """
+    Request-scoped memo of `get_double_prime_for_interval`, keyed by the
+    preference fingerprint and the exact arguments.
+
+    The solver values the same pieces again on every alpha iteration, in the
+    condition checks and when building the allocation. `time_saved` adds up,
+    for every hit, the time the value took to compute the first time.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+        self._entries: Dict[Hashable, Tuple[Decimal, float]] = {}
+        # Raw segment lists cannot carry their fingerprint, it is kept here
+        # by identity, along with the list so that the id is not reused
+        self._raw_fingerprints: Dict[Tuple[int, str], Tuple[Preference, str]] = {}
+
+    def lookup(self, key: Hashable, compute: Callable[[], Decimal]) -> Decimal:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.time_saved += entry[1]
+            return entry[0]
+
+        self.misses += 1
+        started = time.perf_counter()
+        value = compute()
+        self._entries[key] = (value, time.perf_counter() - started)
+        return value
+
+    def fingerprint(self, segments: Preference) -> str:
+        key = (id(segments), get_backend().name)
+        entry = self._raw_fingerprints.get(key)
+        if entry is None or entry[0] is not segments:
+            entry = self._raw_fingerprints[key] = (
+                segments,
+                _raw_fingerprint(segments),
+            )
+        return entry[1]
+
+    def add_stats(self, stats: Dict[str, Any]) -> None:
+        """Count the lookups of another notebook, e.g. of a worker process"""
+        self.hits += stats["hits"]
+        self.misses += stats["misses"]
+        self.time_saved += stats["time_saved"]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "time_saved": self.time_saved,
+        }
+
+
+_current_notebook: ContextVar[Optional[ValuationNotebook]] = ContextVar(
+    "valuation_notebook", default=None
+)
+
+
+@contextmanager
+def valuation_notebook() -> Iterator[ValuationNotebook]:
+    """
+    Memoise v'' values in the enclosed code. Nested uses share the outermost
+    notebook, so that it spans the whole request.
+    """
+    notebook = _current_notebook.get()
+    if notebook is not None:
+        yield notebook
+        return
+
+    notebook = ValuationNotebook()
+    token = _current_notebook.set(notebook)
+    try:
+        yield notebook
+    finally:
+        _current_notebook.reset(token)
+
+
+def notebook_job(fn: Callable[..., Any], *job) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    `fn(*job)`, with the stats of its notebook if it had to open one of its
+    own, as it does in a worker process. Otherwise its lookups are counted
+    where it ran already, and the stats are None.
+    """
+    opened = _current_notebook.get() is None
+    with valuation_notebook() as notebook:
+        result = fn(*job)
+    return result, notebook.stats() if opened else None
+
+
+def add_notebook_stats(outcome: Tuple[Any, Optional[Dict[str, Any]]]) -> None:
+    """Count the lookups of a `notebook_job` in the current notebook, if any"""
+    notebook = _current_notebook.get()
+    if notebook is not None and outcome[1] is not None:
+        notebook.add_stats(outcome[1])
+
+
+def first_success_in_notebook(
+    fn: Callable[..., Any], jobs: Sequence[Tuple]
+) -> Optional[Tuple[int, Any]]:
+    """
+    `first_success(fn, jobs)`, with the lookups of the jobs that ran in worker
+    processes counted in the current notebook too
+    """
+    found = first_success(
+        notebook_job,
+        [(fn,) + tuple(job) for job in jobs],
+        succeeded=lambda outcome: bool(outcome[0]),
+        finished=add_notebook_stats,
+    )
+    return None if found is None else (found[0], found[1][0])
 
-def _v(segments: List[Segment], a: Decimal, b: Decimal, cake_size: Decimal) -> Decimal:
-    whole_cake_value = get_value_for_interval(segments, to_decimal(0), cake_size)
+
+def run_all_in_notebook(fn: Callable[..., Any], jobs: Sequence[Tuple]) -> List[Any]:
+    """
+    `run_all(fn, jobs)`, with the lookups of the jobs that ran in worker
+    processes counted in the current notebook too
+    """
+    outcomes = run_all(notebook_job, [(fn,) + tuple(job) for job in jobs])
+    for outcome in outcomes:
+        add_notebook_stats(outcome)
+    return [result for result, _ in outcomes]
+
+
+def preference_fingerprint(segments: Preference) -> str:
+    """
+    Same as `PreferenceIndex.fingerprint`, without compiling raw segments. The
+    digest is computed once per index, and once per raw list in a notebook.
+    """
+    if isinstance(segments, PreferenceIndex):
+        return segments.fingerprint
+    notebook = _current_notebook.get()
+    if notebook is not None:
+        return notebook.fingerprint(segments)
+    return _raw_fingerprint(segments)
+
+
+def _raw_fingerprint(segments: Preference) -> str:
+    columns = SegmentArray.from_segments(segments).sorted_by_start()
+    return columns_fingerprint(columns, get_backend().name)
+
+
+def _v(
+    segments: Preference,
+    a: Decimal,
+    b: Decimal,
+    cake_size: Decimal,
+    whole_cake_value: Optional[Decimal] = None,
+) -> Decimal:
+    if whole_cake_value is None:
+        whole_cake_value = get_whole_cake_value(segments, cake_size)
     v = norm(get_value_for_interval(segments, a, b), whole_cake_value)
     logging.info(f"v={v}({a=}, {b=})")
     return v
 
 
 def _v_prime(
-    segments: List[Segment],
+    segments: Preference,
     epsilon: Decimal,
     a: Decimal,
     b: Decimal,
     cake_size: Decimal,
+    whole_cake_value: Optional[Decimal] = None,
 ) -> Decimal:
-    v = _v(segments, a, b, cake_size) / 2 + epsilon * abs(b - a)
+    v = _v(segments, a, b, cake_size, whole_cake_value) / 2 + epsilon * abs(b - a)
     assert 0 <= v <= 1, f"prime value should in [0, 1], got {v}"
     logging.info(f"v_prime={v}({a=}, {b=})")
     return v
@@ -32,11 +334,11 @@ def _v_prime(
 def _safe_double_prime(v: Decimal, tolerance: Decimal) -> Decimal:
     """Check if the total slightly exceeds 1 due to precision issues"""
 
-    tolerance = to_decimal(tolerance)
-    if v > to_decimal("1") and v - to_decimal("1") <= tolerance:
-        return to_decimal("1")
-    elif v > to_decimal("1") and v - to_decimal("1") <= to_decimal("0.5"):
-        return to_decimal("1")
+    tolerance = to_number(tolerance)
+    if v > to_number("1") and v - to_number("1") <= tolerance:
+        return to_number("1")
+    elif v > to_number("1") and v - to_number("1") <= to_number("0.5"):
+        return to_number("1")
     else:
         assert 0 <= v <= 1, f"v should in [0, 1], got {v}"
 
@@ -44,7 +346,26 @@ def _safe_double_prime(v: Decimal, tolerance: Decimal) -> Decimal:
 
 
 def get_double_prime_for_interval(
-    segments: List[Segment],
+    segments: Preference,
+    epsilon: Decimal,
+    start: Decimal,
+    end: Decimal,
+    cake_size: Decimal,
+) -> Decimal:
+    notebook = _current_notebook.get()
+    if notebook is None:
+        return _get_double_prime_for_interval(segments, epsilon, start, end, cake_size)
+
+    return notebook.lookup(
+        (preference_fingerprint(segments), epsilon, start, end, cake_size),
+        lambda: _get_double_prime_for_interval(
+            segments, epsilon, start, end, cake_size
+        ),
+    )
+
+
+def _get_double_prime_for_interval(
+    segments: Preference,
     epsilon: Decimal,
     start: Decimal,
     end: Decimal,
@@ -53,66 +374,81 @@ def get_double_prime_for_interval(
     # assert 0 <= start <= end, f"start or end out of range, got {start=}, {end=}"
     if not (0 <= start <= end):
         logging.error(f"start or end out of range, got {start=}, {end=}")
-        return to_decimal(0)
+        return to_number(0)
 
     # Make sure using Decimal
-    epsilon = to_decimal(epsilon)
-    start = to_decimal(start)
-    end = to_decimal(min(end, cake_size))
-    cake_size = to_decimal(cake_size)
-
-    tolerance = to_decimal("1e-10")
-    epsilon = (
-        to_decimal("1e-15") if epsilon > to_decimal("1e-15") else to_decimal(epsilon)
-    )
+    epsilon = to_number(epsilon)
+    start = to_number(start)
+    end = to_number(min(end, cake_size))
+    cake_size = to_number(cake_size)
+
+    tolerance = to_number("1e-10")
+    epsilon = lattice_step(epsilon)
+    whole_cake_value = get_whole_cake_value(segments, cake_size)
 
     # Only one segment
     if end <= 1:
         return _safe_double_prime(
-            _v_double_prime(segments, epsilon, start, end, cake_size),
+            _v_double_prime(
+                segments, epsilon, start, end, cake_size, whole_cake_value
+            ),
             tolerance=tolerance,
         )
 
     # Multi-segments
-    total = to_decimal(0)
+    total = to_number(0)
 
     start_int = int(start)
     end_int = int(end)
 
-    if start == to_decimal(start_int) and end == to_decimal(end_int):
+    if start == to_number(start_int) and end == to_number(end_int):
         return _safe_double_prime(
-            _v_double_prime(segments, epsilon, start, end, cake_size),
+            _v_double_prime(
+                segments, epsilon, start, end, cake_size, whole_cake_value
+            ),
             tolerance=tolerance,
         )
 
     # Incomplete start segment
-    if start != to_decimal(start_int):
-        first_segment_end = to_decimal(min(end, to_decimal(start_int + 1)))
-        total += _v_double_prime(segments, epsilon, start, first_segment_end, cake_size)
+    if start != to_number(start_int):
+        first_segment_end = to_number(min(end, to_number(start_int + 1)))
+        total += _v_double_prime(
+            segments, epsilon, start, first_segment_end, cake_size, whole_cake_value
+        )
         start_int += 1
 
-    # Complete middle segments
-    for mid in range(start_int, end_int):
-        mid_start = to_decimal(mid)
-        mid_end = to_decimal(mid + 1)
-        if mid_end > end:
-            mid_end = end
-        total += _v_double_prime(segments, epsilon, mid_start, mid_end, cake_size)
+    # Complete middle segments.
+    # Every integer boundary is an interior grid point, where v'' of the two sides
+    # telescopes: v''(a, k) + v''(k, b) == v''(a, b). So the whole run of middle
+    # segments costs one evaluation, however big the cake is.
+    if start_int < end_int:
+        total += _v_double_prime(
+            segments,
+            epsilon,
+            to_number(start_int),
+            to_number(end_int),
+            cake_size,
+            whole_cake_value,
+        )
 
-    # Incomplete end segment
-    if end > to_decimal(end_int):
-        last_segment_start = to_decimal(end_int)
-        total += _v_double_prime(segments, epsilon, last_segment_start, end, cake_size)
+    # Incomplete end segment, unless start and end share the same segment
+    # and it has been measured above already
+    if end > to_number(end_int) and end_int >= start_int:
+        last_segment_start = to_number(end_int)
+        total += _v_double_prime(
+            segments, epsilon, last_segment_start, end, cake_size, whole_cake_value
+        )
 
     return _safe_double_prime(total, tolerance=tolerance)
 
 
 def _v_double_prime(
-    segments: List[Segment],
+    segments: Preference,
     delta: Decimal,
     a: Decimal,
     b: Decimal,
     cake_size: Decimal,
+    whole_cake_value: Optional[Decimal] = None,
 ) -> Decimal:
     # Letting delta := epsilon, so,
     # any epsilon-envy-free allocation for (v_double_prime) is 5*epsilon-envy-free for (v_prime) for each agent.
@@ -122,47 +458,75 @@ def _v_double_prime(
 
     logging.info(f"{a_unit=}, {b_unit=}")
 
-    delta = to_decimal(delta)
-    a_unit = to_decimal(a_unit)
-    b_unit = to_decimal(b_unit)
+    delta = to_number(delta)
+    if whole_cake_value is None:
+        whole_cake_value = get_whole_cake_value(segments, cake_size)
+    a_unit = to_number(a_unit)
+    b_unit = to_number(b_unit)
 
-    # Get the grid points around a and b
-    a_underline_unit = underline(a_unit, delta)
-    a_overline_unit = overline(a_unit, delta)
-    b_underline_unit = underline(b_unit, delta)
-    b_overline_unit = overline(b_unit, delta)
+    # Get the grid points around a and b, and the distances to them in units of delta
+    a_underline_index, a_overline_index, a_to_underline, a_to_overline = (
+        _grid_coordinates(a_unit, delta)
+    )
+    b_underline_index, b_overline_index, b_to_underline, b_to_overline = (
+        _grid_coordinates(b_unit, delta)
+    )
+    a_underline_unit = to_number(a_underline_index) * delta
+    a_overline_unit = to_number(a_overline_index) * delta
+    b_underline_unit = to_number(b_underline_index) * delta
+    b_overline_unit = to_number(b_overline_index) * delta
     logging.info(f"{a_underline_unit=}")
     logging.info(f"{a_overline_unit=}")
     logging.info(f"{b_underline_unit=}")
     logging.info(f"{b_overline_unit=}")
-    assert a_underline_unit <= a_unit <= a_overline_unit, "Wrong grid points"
-    assert b_underline_unit <= b_unit <= b_overline_unit, "Wrong grid points"
+    assert a_to_underline >= 0 and a_to_overline >= 0, "Wrong grid points"
+    assert b_to_underline >= 0 and b_to_overline >= 0, "Wrong grid points"
 
     a_underline = scale_back_from_unit(a_underline_unit, cake_size)
     b_overline = scale_back_from_unit(b_overline_unit, cake_size)
     a_overline = scale_back_from_unit(a_overline_unit, cake_size)
     b_underline = scale_back_from_unit(b_underline_unit, cake_size)
 
-    v_prime_a_under_b_over = _v_prime(
-        segments, delta, a_underline, b_overline, cake_size
+    lattice = (
+        segments.lattice_table(delta)
+        if isinstance(segments, ValuationContext) and segments.cake_size == cake_size
+        else None
+    )
+
+    def v_prime_at(i: int, j: int, a: Decimal, b: Decimal) -> Decimal:
+        """v' at the grid corner (i * delta, j * delta), which is (a, b) on the cake"""
+        if lattice is None:
+            return _v_prime(segments, delta, a, b, cake_size, whole_cake_value)
+        return lattice.get(
+            i,
+            j,
+            lambda: _v_prime(segments, delta, a, b, cake_size, whole_cake_value),
+        )
+
+    v_prime_a_under_b_over = v_prime_at(
+        a_underline_index, b_overline_index, a_underline, b_overline
     )
-    v_prime_a_over_b_under = _v_prime(
-        segments, delta, a_overline, b_underline, cake_size
+    v_prime_a_over_b_under = v_prime_at(
+        a_overline_index, b_underline_index, a_overline, b_underline
     )
     logging.info(f"{v_prime_a_under_b_over=}({a_underline=}, {b_overline=})")
     logging.info(f"{v_prime_a_over_b_under=}({a_overline=}, {b_underline=})")
 
-    if a_overline_unit - a_unit >= b_unit - b_underline_unit:
+    if a_to_overline >= b_to_underline:
         logging.info("Case 1")
-        v_prime_a_under_b_under = _v_prime(
-            segments, delta, a_underline, b_underline, cake_size
+        # The weight of this corner is zero for grid points, skip evaluating it
+        v_prime_a_under_b_under = (
+            v_prime_at(
+                a_underline_index, b_underline_index, a_underline, b_underline
+            )
+            if a_to_overline != b_to_underline
+            else to_number(0)
         )
         logging.info(f"{v_prime_a_under_b_under=}({a_underline=}, {b_underline=})")
         v_double_prime = (
-            (((a_overline_unit - a_unit) - (b_unit - b_underline_unit)) / delta)
-            * v_prime_a_under_b_under
-            + ((b_unit - b_underline_unit) / delta) * v_prime_a_under_b_over
-            + ((a_unit - a_underline_unit) / delta) * v_prime_a_over_b_under
+            (a_to_overline - b_to_underline) * v_prime_a_under_b_under
+            + b_to_underline * v_prime_a_under_b_over
+            + a_to_underline * v_prime_a_over_b_under
         )
         # logging.info(
         #     f"((a_overline_unit - a_unit) - (b_unit - b_underline_unit))/ delta * v_prime_a_under_b_under = (({a_overline_unit} - {a_unit}) - ({b_unit} - {b_underline_unit}))/ {delta} * {v_prime_a_under_b_under} = {((a_overline_unit - a_unit) - (b_unit - b_underline_unit))/ delta * v_prime_a_under_b_under}"
@@ -176,7 +540,7 @@ def _v_double_prime(
 
         if (
             a_unit == 0
-            and (a_unit - a_underline_unit) / delta * v_prime_a_over_b_under == 0
+            and a_to_underline * v_prime_a_over_b_under == 0
         ):
             # If start from 0, need to compensate the last term
             logging.info(
@@ -187,17 +551,16 @@ def _v_double_prime(
         logging.info(f"v_double_prime={v_double_prime}({a_unit=}, {b_unit=})")
         logging.info("====end====")
         return v_double_prime
-    elif a_overline_unit - a_unit <= b_unit - b_underline_unit:
+    elif a_to_overline <= b_to_underline:
         logging.info("Case 2")
-        v_prime_a_over_b_over = _v_prime(
-            segments, delta, a_overline, b_overline, cake_size
+        v_prime_a_over_b_over = v_prime_at(
+            a_overline_index, b_overline_index, a_overline, b_overline
         )
         logging.info(f"{v_prime_a_over_b_over=}({a_overline=}, {b_overline=})")
         v_double_prime = (
-            (((b_unit - b_underline_unit) - (a_overline_unit - a_unit)) / delta)
-            * v_prime_a_over_b_over
-            + ((a_overline_unit - a_unit) / delta) * v_prime_a_under_b_over
-            + ((b_overline_unit - b_unit) / delta) * v_prime_a_over_b_under
+            (b_to_underline - a_to_overline) * v_prime_a_over_b_over
+            + a_to_overline * v_prime_a_under_b_over
+            + b_to_overline * v_prime_a_over_b_under
         )
         logging.info(f"v_double_prime={v_double_prime}({a_unit=}, {b_unit=})")
         logging.info("====end====")
@@ -207,13 +570,56 @@ def _v_double_prime(
     raise ValueError("Should not reach here")
 
 
+def lattice_step(epsilon: Decimal) -> Decimal:
+    """Grid step delta that v'' interpolates on: epsilon, capped at 1e-15."""
+    epsilon = to_number(epsilon)
+    return to_number("1e-15") if epsilon > to_number("1e-15") else epsilon
+
+
+def _grid_coordinates(x: Decimal, delta: Decimal) -> Tuple[int, int, Decimal, Decimal]:
+    """
+    Indices of underline(x) and overline(x) on the delta grid, and the distances
+    (x - underline(x)) / delta and (overline(x) - x) / delta.
+
+    Working on grid indices keeps the interpolation weights exact for every
+    numeric backend: with floats, delta is below the resolution of [0, 1], so
+    differences of grid positions would be mostly rounding noise.
+    """
+    tolerance = to_number("1e-8")
+    last = int(round(1 / delta))
+    position = x / delta
+
+    if x < delta or x == 0:
+        return 0, 1, position, 1 - position
+
+    if x == 1:
+        return last - 1, last, to_number(1), to_number(0)
+
+    nearest = int(round(position))
+    if abs((position - nearest) * delta) < tolerance:
+        # x is a multiple of delta within tolerance, snap it onto the grid and
+        # step to the neighbouring grid points
+        position = to_number(nearest)
+        underline_index, overline_index = nearest - 1, min(nearest + 1, last)
+    else:
+        underline_index = int(get_backend().floor(position))
+        overline_index = underline_index + 1
+
+    return (
+        underline_index,
+        overline_index,
+        position - underline_index,
+        overline_index - position,
+    )
+
+
 def overline(x, delta, tolerance=Decimal("1e-10")) -> Decimal:
     assert 0 <= x <= 1, f"got {x}, expect it between [0, 1]"
 
-    x = to_decimal(x)
-    delta = to_decimal(delta)
+    x = to_number(x)
+    delta = to_number(delta)
     # tolerance = delta
-    tolerance = Decimal("1e-8")
+    tolerance = to_number("1e-8")
 
     if x < delta or x == 0:
         return delta
@@ -221,7 +627,7 @@ def overline(x, delta, tolerance=Decimal("1e-10")) -> Decimal:
     if x == 1:
         return x
 
-    v = (x / delta).to_integral_value(rounding="ROUND_CEILING") * delta
+    v = get_backend().ceil(x / delta) * delta
 
     # If x is exactly a multiple of delta, step up to the next multiple
     # considering floating point precision issues
@@ -230,42 +636,42 @@ def overline(x, delta, tolerance=Decimal("1e-10")) -> Decimal:
     if abs(x % delta) < tolerance or abs(delta - (x % delta)) < tolerance:
         v += delta
 
-    return min(v, to_decimal(1))
+    return min(v, to_number(1))
 
 
 def underline(x, delta, tolerance=Decimal("1e-10")) -> Decimal:
     assert 0 <= x <= 1, f"got {x}, expect it between [0, 1]"
 
-    x = to_decimal(x)
-    delta = to_decimal(delta)
+    x = to_number(x)
+    delta = to_number(delta)
     # tolerance = delta
-    tolerance = Decimal("1e-8")
+    tolerance = to_number("1e-8")
 
     if x < delta or x == 0:
-        return to_decimal(0)
+        return to_number(0)
 
     if x == 1:
         return x - delta
 
     # Check if x is an exact multiple of delta,
     # considering floating point precision issues
-    v = (x / delta).to_integral_value(rounding="ROUND_FLOOR") * delta
+    v = get_backend().floor(x / delta) * delta
     # if abs(x - v) < tolerance:
     #     v -= delta
     if abs(x % delta) < tolerance or abs(delta - (x % delta)) < tolerance:
-        v = (x / delta - 1).to_integral_value(rounding="ROUND_FLOOR") * delta
+        v = get_backend().floor(x / delta - 1) * delta
     else:
-        v = (x / delta).to_integral_value(rounding="ROUND_FLOOR") * delta
+        v = get_backend().floor(x / delta) * delta
 
-    return max(v, to_decimal(0))
+    return max(v, to_number(0))
 
 
 def get_values_for_cuts(
-    preference: List[Segment], cuts: List[Decimal], cake_size: Decimal, epsilon: Decimal
+    preference: Preference, cuts: List[Decimal], cake_size: Decimal, epsilon: Decimal
 ) -> List[Decimal]:
     slice_values = []
 
-    start = to_decimal(0)
+    start = to_number(0)
     for end in cuts:
         value = get_double_prime_for_interval(
             preference, epsilon, start, end, cake_size=cake_size
@@ -283,3 +689,16 @@ def get_values_for_cuts(
         )
     )
     return slice_values
+
+
+def get_value_matrix(
+    preferences: List[Preference],
+    cuts: List[Decimal],
+    cake_size: Decimal,
+    epsilon: Decimal,
+) -> List[List[Decimal]]:
+    """v'' of every piece of `cuts` for every agent, indexed [agent][piece]"""
+    return [
+        get_values_for_cuts(preference, cuts, cake_size, epsilon)
+        for preference in preferences
+    ]
@@ -2,14 +2,25 @@ import logging
 
 import pytest
 
+from base_types import SegmentArray
+from parallel import use_workers
 from type_helper import de_norm, to_decimal
 from valuation import (
+    LatticeTable,
+    ValuationContext,
     _v,
     _v_double_prime,
     _v_prime,
+    as_valuation_context,
     get_double_prime_for_interval,
+    get_value_matrix,
+    get_values_for_cuts,
+    get_whole_cake_value,
     overline,
+    preference_fingerprint,
+    run_all_in_notebook,
     underline,
+    valuation_notebook,
 )
 
 from .algorithms.algorithm_test_utils import gen_flat_seg, gen_sloped_seg
@@ -177,6 +188,59 @@ def test_v_double_prime_two_flat_segs_by_interval():
     # assert de_norm(v, 20) == pytest.approx(to_decimal(10), abs=TOLERANCE)
 
 
+def test_v_double_prime_segment_array():
+    segs = [
+        gen_sloped_seg(to_decimal(0), to_decimal(1), to_decimal(10), to_decimal(0)),
+        gen_flat_seg(to_decimal(1), to_decimal(2), to_decimal(5)),
+    ]
+    array = SegmentArray.from_segments(segs)
+
+    for start, end in [(0, 2), (0, 1), ("0.3", "1.7"), ("1.2", "1.9")]:
+        start, end = to_decimal(start), to_decimal(end)
+        assert get_double_prime_for_interval(
+            array, EPSILON, start, end, cake_size=to_decimal(2)
+        ) == get_double_prime_for_interval(
+            segs, EPSILON, start, end, cake_size=to_decimal(2)
+        )
+
+
+def test_v_double_prime_within_one_unit_of_a_bigger_cake():
+    segs = [
+        gen_flat_seg(to_decimal(0), to_decimal(1), to_decimal(10)),
+        gen_flat_seg(to_decimal(1), to_decimal(2), to_decimal(10)),
+    ]
+    v = get_double_prime_for_interval(
+        segs, EPSILON, to_decimal("1.2"), to_decimal("1.7"), cake_size=to_decimal(2)
+    )
+    assert de_norm(v, to_decimal(20)) == pytest.approx(to_decimal(5), abs=TOLERANCE)
+
+
+def test_v_double_prime_weights_off_the_unit_grid():
+    # 0.5365 / 6 has a 16th digit, so it lies between two delta grid points.
+    # The interpolation weights are taken from its nearest grid point, as
+    # for every other point, where they used to span a grid step more and
+    # gave 0.769191666666676 for this interval
+    segs = [gen_flat_seg(to_decimal(0), to_decimal(6), to_decimal(10))]
+    v = get_double_prime_for_interval(
+        segs, EPSILON, to_decimal("0.5365"), to_decimal("4.9199"), to_decimal(6)
+    )
+    assert v == pytest.approx(to_decimal("0.730566666666674"), abs=to_decimal("1e-14"))
+    # Same as the whole units it spans, pro rata
+    assert v == pytest.approx((to_decimal("4.9199") - to_decimal("0.5365")) / 6)
+
+
+def test_v_double_prime_large_cake():
+    cake_size = to_decimal(10**4)
+    segs = [gen_sloped_seg(to_decimal(0), cake_size, to_decimal(0), to_decimal(10))]
+    whole_cake_value = to_decimal(5 * 10**4)
+
+    for start, end in [("0.5", "9999.5"), ("0", "5000.25"), ("1234.5", "1234.75")]:
+        start, end = to_decimal(start), to_decimal(end)
+        v = get_double_prime_for_interval(segs, EPSILON, start, end, cake_size)
+        expected = (end**2 - start**2) / 2 / 1000
+        assert de_norm(v, whole_cake_value) == pytest.approx(expected, abs=TOLERANCE)
+
+
 def test_v_double_prime_three_flat_segs_by_interval():
     segs = [
         gen_flat_seg(to_decimal(0), to_decimal(1), to_decimal(10)),
@@ -485,3 +549,157 @@ def test_underline():
     assert underline(0, 0.02) >= 0
     assert underline(0, 0.02) == pytest.approx(0, TOLERANCE)
     assert underline(0, 0.02) == 0
+
+
+def test_valuation_context():
+    cake_size = to_decimal(2)
+    segs = [
+        gen_sloped_seg(to_decimal(0), to_decimal(1), to_decimal(10), to_decimal(0)),
+        gen_flat_seg(to_decimal(1), to_decimal(2), to_decimal(5)),
+    ]
+    context = as_valuation_context(segs, cake_size, EPSILON)
+
+    assert isinstance(context, ValuationContext)
+    assert as_valuation_context(context, cake_size, EPSILON) is context
+    assert as_valuation_context(context, to_decimal(3), EPSILON) is not context
+    assert context.whole_cake_value == get_whole_cake_value(segs, cake_size) == 10
+
+    a, b = to_decimal("0.4"), to_decimal("1.3")
+    assert context.v(a, b) == _v(segs, a, b, cake_size)
+    assert context.v_prime(a, b) == _v_prime(segs, EPSILON, a, b, cake_size)
+    assert context.v_double_prime(a, b) == get_double_prime_for_interval(
+        segs, EPSILON, a, b, cake_size
+    )
+
+
+def test_lattice_table_lru():
+    table = LatticeTable(maxsize=2)
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or value
+
+    assert table.get(1, 2, compute(12)) == 12
+    assert table.get(1, 2, compute(-1)) == 12
+    assert table.get(3, 4, compute(34)) == 34
+    table.get(1, 2, compute(-1))  # (3, 4) is now the least recently used
+    assert table.get(5, 6, compute(56)) == 56
+    assert table.get(3, 4, compute(43)) == 43
+
+    assert calls == [12, 34, 56, 43]
+    assert (table.hits, table.misses, len(table)) == (2, 4, 2)
+
+
+def test_valuation_context_reuses_lattice_corners():
+    cake_size = to_decimal(1)
+    segs = [gen_sloped_seg(to_decimal(0), cake_size, to_decimal(10), to_decimal(0))]
+    context = as_valuation_context(segs, cake_size, EPSILON)
+
+    first = context.v_double_prime(to_decimal("0.25"), to_decimal("0.5"))
+    table = context.lattice_table(EPSILON)
+    misses = table.misses
+    assert context.v_double_prime(to_decimal("0.25"), to_decimal("0.5")) == first
+    assert table.misses == misses and table.hits == misses
+    assert first == get_double_prime_for_interval(
+        segs, EPSILON, to_decimal("0.25"), to_decimal("0.5"), cake_size
+    )
+
+
+def test_valuation_notebook():
+    cake_size = to_decimal(2)
+    segs = [gen_flat_seg(to_decimal(0), cake_size, to_decimal(10))]
+    same_valuation = as_valuation_context(
+        [gen_flat_seg(to_decimal(0), cake_size, to_decimal(10))], cake_size, EPSILON
+    )
+    start, end = to_decimal("0.5"), to_decimal("1.5")
+    expected = get_double_prime_for_interval(segs, EPSILON, start, end, cake_size)
+
+    with valuation_notebook() as notebook:
+        assert (
+            get_double_prime_for_interval(segs, EPSILON, start, end, cake_size)
+            == expected
+        )
+        with valuation_notebook() as nested:
+            assert nested is notebook
+            assert (
+                get_double_prime_for_interval(
+                    same_valuation, EPSILON, start, end, cake_size
+                )
+                == expected
+            )
+        get_double_prime_for_interval(segs, EPSILON, start, to_decimal(2), cake_size)
+
+    assert (notebook.hits, notebook.misses) == (1, 2)
+    assert notebook.stats()["hit_rate"] == pytest.approx(1 / 3)
+
+    # Outside of the notebook nothing is recorded
+    get_double_prime_for_interval(segs, EPSILON, start, end, cake_size)
+    assert notebook.hits + notebook.misses == 3
+
+
+def test_preference_fingerprint_is_computed_once(monkeypatch):
+    cake_size = to_decimal(2)
+    segs = [gen_flat_seg(to_decimal(0), cake_size, to_decimal(10))]
+    context = as_valuation_context(segs, cake_size, EPSILON)
+    other = as_valuation_context(
+        [gen_flat_seg(to_decimal(0), cake_size, to_decimal(9))], cake_size, EPSILON
+    )
+
+    fingerprint = preference_fingerprint(context)
+    assert isinstance(fingerprint, str) and len(fingerprint) == 32
+    assert preference_fingerprint(segs) == fingerprint
+    assert preference_fingerprint(other) != fingerprint
+
+    digests = []
+    monkeypatch.setattr(
+        "valuation._raw_fingerprint",
+        lambda segments: digests.append(segments) or fingerprint,
+    )
+    with valuation_notebook():
+        for _ in range(3):
+            assert preference_fingerprint(context) == fingerprint
+            assert preference_fingerprint(segs) == fingerprint
+    # Once for the raw list, never again for the index
+    assert digests == [segs]
+
+
+def test_get_value_matrix():
+    cake_size = to_decimal(1)
+    cuts = [to_decimal("0.25"), to_decimal("0.5"), to_decimal("0.75")]
+    preferences = [
+        [gen_flat_seg(0, cake_size, 10)],
+        [gen_sloped_seg(0, cake_size, 10, 0)],
+    ]
+
+    matrix = get_value_matrix(preferences, cuts, cake_size, EPSILON)
+
+    assert len(matrix) == 2 and all(len(row) == 4 for row in matrix)
+    for preference, row in zip(preferences, matrix):
+        assert row == get_values_for_cuts(preference, cuts, cake_size, EPSILON)
+        assert float(sum(row)) == pytest.approx(1)
+    assert matrix[1] == sorted(matrix[1], reverse=True)
+
+
+def _value_twice(preference) -> tuple:
+    return tuple(
+        get_double_prime_for_interval(
+            preference,
+            to_decimal("1e-15"),
+            to_decimal("0.25"),
+            to_decimal("0.75"),
+            to_decimal(1),
+        )
+        for _ in range(2)
+    )
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_notebook_counts_the_lookups_of_jobs_in_worker_processes(workers):
+    preference = [gen_flat_seg(to_decimal(0), to_decimal(1), to_decimal(10))]
+    with valuation_notebook() as notebook, use_workers(workers):
+        values = run_all_in_notebook(_value_twice, [(preference,), (preference,)])
+
+    assert values[0] == values[1]
+    # Jobs in worker processes each have a notebook of their own
+    misses = 2 if workers else 1
+    assert (notebook.hits, notebook.misses) == (4 - misses, misses)
@@ -1,43 +1,213 @@
+import hashlib
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from decimal import Decimal, getcontext
-from typing import List, Optional
+from functools import cached_property
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
-from base_types import Segment
-from type_helper import to_decimal
+import numpy as np
+
+from base_types import Segment, SegmentArray
+from numeric_backend import get_backend
+from type_helper import to_number
 
 getcontext().prec = 15
 
 
+def columns_fingerprint(columns: SegmentArray, backend: str) -> str:
+    """
+    Digest of sorted segment columns. It is computed once per index, memo keys
+    then hash a short string rather than every column of the preference.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(backend.encode())
+    for column in (
+        columns.starts,
+        columns.ends,
+        columns.start_values,
+        columns.end_values,
+    ):
+        digest.update(repr(column).encode())
+    return digest.hexdigest()
+
+
 @dataclass
 class BoundaryOptions:
     start_bound: int
     end_bound: int
 
 
+@dataclass(frozen=True)
+class PreferenceIndex:
+    """
+    A preference compiled once for repeated queries.
+
+    `segments` holds the segments sorted by start as a `SegmentArray`, and
+    `cumulative[i]` the value of the cake before `breakpoints[i]`, with the total
+    value appended at the end. Interval values then take two bisects plus the
+    partial segments at both ends instead of a scan over every segment.
+
+    It behaves like the `List[Segment]` it was built from, so it can be passed
+    anywhere a preference is expected. All numbers are stored in the numeric
+    backend that was in use when it was compiled.
+    """
+
+    segments: SegmentArray
+    cumulative: Tuple[Decimal, ...]
+    backend: str
+
+    @classmethod
+    def from_segments(cls, segments: "Preference") -> "PreferenceIndex":
+        backend = get_backend().name
+        if isinstance(segments, PreferenceIndex):
+            if segments.backend == backend:
+                return segments
+            segments = segments.segments
+
+        # Re-create the columns so they use the current backend
+        ordered = SegmentArray.from_segments(segments).sorted_by_start()
+        cumulative = [to_number(0)]
+        for i in range(len(ordered)):
+            cumulative.append(
+                cumulative[-1]
+                + _measure_partial_at(ordered, i, ordered.starts[i], ordered.ends[i])
+            )
+
+        return cls(segments=ordered, cumulative=tuple(cumulative), backend=backend)
+
+    def __iter__(self) -> Iterator[Segment]:
+        return iter(self.segments)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def __getitem__(self, i: int) -> Segment:
+        return self.segments[i]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Identifies the valuation, two indexes with the same fingerprint value every piece the same"""
+        return columns_fingerprint(self.segments, self.backend)
+
+    @property
+    def breakpoints(self) -> Tuple[Decimal, ...]:
+        """Sorted segment starts"""
+        return self.segments.starts
+
+    @property
+    def total_value(self) -> Decimal:
+        return self.cumulative[-1]
+
+    def value_up_to(self, point: Decimal) -> Decimal:
+        """Value of [-inf, point]"""
+        point = to_number(point)
+        i = bisect_right(self.breakpoints, point) - 1
+        if i < 0:
+            return to_number(0)
+        return self.cumulative[i] + _measure_partial_at(
+            self.segments, i, self.breakpoints[i], point
+        )
+
+    def value_for_interval(self, start: Decimal, end: Decimal) -> Decimal:
+        start = to_number(start)
+        end = to_number(end)
+
+        # First segment that may contain `start`, last segment starting before `end`
+        i = max(bisect_right(self.breakpoints, start) - 1, 0)
+        j = bisect_left(self.breakpoints, end) - 1
+        if j < i:
+            return to_number(0)
+        if i == j:
+            return _measure_partial_at(self.segments, i, start, end)
+
+        return (
+            _measure_partial_at(self.segments, i, start, end)
+            + (self.cumulative[j] - self.cumulative[i + 1])
+            + _measure_partial_at(self.segments, j, start, end)
+        )
+
+    @cached_property
+    def float_table(self) -> Tuple[np.ndarray, ...]:
+        """
+        float64 copy of the index for vectorized evaluation:
+        (breakpoints, segment ends, start values, slopes, cumulative values)
+        """
+        starts = np.array(self.segments.starts, dtype=np.float64)
+        ends = np.array(self.segments.ends, dtype=np.float64)
+        start_values = np.array(self.segments.start_values, dtype=np.float64)
+        end_values = np.array(self.segments.end_values, dtype=np.float64)
+        widths = ends - starts
+        slopes = np.divide(
+            end_values - start_values,
+            widths,
+            out=np.zeros_like(widths),
+            where=widths > 0,
+        )
+        cumulative = np.array(self.cumulative[:-1], dtype=np.float64)
+        return starts, ends, start_values, slopes, cumulative
+
+    def values_up_to(self, points: np.ndarray) -> np.ndarray:
+        """Vectorized `value_up_to` over a float64 array of points."""
+        starts, ends, start_values, slopes, cumulative = self.float_table
+        if len(starts) == 0:
+            return np.zeros_like(points)
+
+        i = np.searchsorted(starts, points, side="right") - 1
+        before_first = i < 0
+        i = np.maximum(i, 0)
+        width = np.clip(points, starts[i], ends[i]) - starts[i]
+        values = cumulative[i] + width * (start_values[i] + slopes[i] * width / 2)
+        return np.where(before_first, 0.0, values)
+
+    def segment_at_value(self, value: Decimal) -> int:
+        """
+        Index of the first segment at whose end the cumulative value reaches `value`.
+        Returns `len(self)` if the whole preference is worth less than `value`.
+        """
+        return bisect_left(self.cumulative, to_number(value), lo=1) - 1
+
+    def last_segment_at_value(self, value: Decimal) -> int:
+        """
+        Index of the last segment at whose start the cumulative value is at most `value`.
+        Returns -1 if `value` is negative.
+        """
+        return min(
+            bisect_right(self.cumulative, to_number(value)) - 1, len(self) - 1
+        )
+
+
+Preference = Union[List[Segment], SegmentArray, PreferenceIndex]
+
+
 def find_cut_line_by_percent(
-    segments: List[Segment],
+    segments: Preference,
     target_percent_val: float,
     options: Optional[BoundaryOptions] = None,
 ) -> Decimal:
     start = options.start_bound if options else 0
     end = options.end_bound if options else float("inf")
     total_cake_value = get_value_for_interval(
-        segments, to_decimal(start), to_decimal(end)
+        segments, to_number(start), to_number(end)
     )
-    target_value = total_cake_value * to_decimal(target_percent_val)
+    target_value = total_cake_value * to_number(target_percent_val)
     return find_cut_line_by_value(segments, target_value, options)
 
 
 def find_cut_line_by_value(
-    segments: List[Segment],
+    segments: Preference,
     target_value: Decimal,
     options: Optional[BoundaryOptions] = None,
 ) -> Decimal:
-    running_total = to_decimal(0)
+    if isinstance(segments, (PreferenceIndex, SegmentArray)):
+        return _find_cut_line_by_value_indexed(
+            PreferenceIndex.from_segments(segments), target_value, options
+        )
+
+    running_total = to_number(0)
     for seg in segments:
         seg_value = (
             _measure_partial_segment(
-                seg, to_decimal(options.start_bound), to_decimal(options.end_bound)
+                seg, to_number(options.start_bound), to_number(options.end_bound)
             )
             if options
             else measure_segment(seg)
@@ -48,6 +218,94 @@ def find_cut_line_by_value(
     raise ValueError("No cut line in segment")
 
 
+def _find_cut_line_by_value_indexed(
+    index: PreferenceIndex,
+    target_value: Decimal,
+    options: Optional[BoundaryOptions] = None,
+) -> Decimal:
+    if len(index) == 0:
+        raise ValueError("No cut line in segment")
+    if not options:
+        return cut_from(index, index.breakpoints[0], target_value)
+
+    start_bound = to_number(options.start_bound)
+    end_bound = to_number(options.end_bound)
+    if index.value_for_interval(start_bound, end_bound) < to_number(target_value):
+        raise ValueError("No cut line in segment")
+    return cut_from(index, start_bound, target_value)
+
+
+def cut_from(segments: Preference, start: Decimal, target_value: Decimal) -> Decimal:
+    """
+    Robertson-Webb cut query: returns the smallest x such that
+    the interval [start, x] is worth exactly `target_value`.
+    """
+    index = PreferenceIndex.from_segments(segments)
+    start = to_number(start)
+    target_value = to_number(target_value)
+    if target_value <= 0:
+        return start
+
+    absolute_value = index.value_up_to(start) + target_value
+    i = index.segment_at_value(absolute_value)
+    if i >= len(index):
+        raise ValueError(f"No cut line in segment, [{start}, inf] < {target_value}")
+
+    seg_start = max(index.breakpoints[i], start)
+    return max(
+        start,
+        _solve_segment_area(
+            index.segments, i, seg_start, absolute_value - index.value_up_to(seg_start)
+        ),
+    )
+
+
+def cut_to(segments: Preference, end: Decimal, target_value: Decimal) -> Decimal:
+    """
+    Robertson-Webb cut query from the right: returns the largest x such that
+    the interval [x, end] is worth exactly `target_value`.
+    """
+    index = PreferenceIndex.from_segments(segments)
+    end = to_number(end)
+    target_value = to_number(target_value)
+    if target_value <= 0:
+        return end
+
+    absolute_value = index.value_up_to(end) - target_value
+    if absolute_value < 0:
+        raise ValueError(f"No cut line in segment, [-inf, {end}] < {target_value}")
+
+    # Last segment starting before `end` whose cumulative value does not exceed the target
+    i = min(
+        index.last_segment_at_value(absolute_value),
+        bisect_left(index.breakpoints, end) - 1,
+    )
+    return min(
+        end,
+        _solve_segment_area(
+            index.segments,
+            i,
+            index.breakpoints[i],
+            absolute_value - index.cumulative[i],
+        ),
+    )
+
+
+def _solve_segment_area(
+    segments: SegmentArray, i: int, start: Decimal, target_area: Decimal
+) -> Decimal:
+    """Closed form x in the i-th segment such that [start, x] is worth `target_area`."""
+    return _segment_cutline(
+        segments.starts[i],
+        segments.ends[i],
+        segments.start_values[i],
+        segments.end_values[i],
+        target_area,
+        max(start, segments.starts[i]),
+        segments.ends[i],
+    )
+
+
 def _find_segment_cutline(
     seg: Segment, target_area: Decimal, options: Optional[BoundaryOptions] = None
 ) -> Decimal:
@@ -60,19 +318,39 @@ def _find_segment_cutline(
         end_bound = min(options.end_bound, seg.end)
     else:
         start_bound, end_bound = seg.start, seg.end
-    slope = to_decimal((seg.end_value - seg.start_value) / (seg.end - seg.start))
+    return _segment_cutline(
+        seg.start,
+        seg.end,
+        seg.start_value,
+        seg.end_value,
+        target_area,
+        to_number(start_bound),
+        to_number(end_bound),
+    )
 
-    start_bound = to_decimal(start_bound)
-    end_bound = to_decimal(end_bound)
 
-    if seg.start_value == seg.end_value:  # Flat segment
-        seg_value = _measure_partial_segment(seg, start_bound, end_bound)
+def _segment_cutline(
+    seg_start: Decimal,
+    seg_end: Decimal,
+    seg_start_value: Decimal,
+    seg_end_value: Decimal,
+    target_area: Decimal,
+    start_bound: Decimal,
+    end_bound: Decimal,
+) -> Decimal:
+    """`_find_segment_cutline` on the columns of a segment, bounds already capped."""
+    slope = to_number((seg_end_value - seg_start_value) / (seg_end - seg_start))
+
+    if seg_start_value == seg_end_value:  # Flat segment
+        seg_value = _measure_partial(
+            seg_start, seg_end, seg_start_value, seg_end_value, start_bound, end_bound
+        )
         target_area_percent = target_area / seg_value if seg_value > 0 else 0
         return start_bound + (end_bound - start_bound) * target_area_percent
     else:  # Sloped segment
-        start_val = to_decimal(
-            seg.start_value
-            + ((start_bound - seg.start) * slope if start_bound > seg.start else 0)
+        start_val = to_number(
+            seg_start_value
+            + ((start_bound - seg_start) * slope if start_bound > seg_start else 0)
         )
         # Thanks to Bence Szilágyi for help with the math here.
         # The formula is the result of adding a triangle and rectangle together,
@@ -87,21 +365,32 @@ def _find_segment_cutline(
         # but this actually works even if the slope is negative because in that case the
         # area of the triangle will be negative.
         target_end = (
-            -start_val + (start_val**2 + to_decimal(2) * slope * target_area).sqrt()
+            -start_val
+            + get_backend().sqrt(start_val**2 + to_number(2) * slope * target_area)
         ) / slope
         return start_bound + target_end
 
 
 def get_value_for_interval(
-    segments: List[Segment], start: Decimal, end: Decimal
+    segments: Preference, start: Decimal, end: Decimal
 ) -> Decimal:
     """
     Returns the total value of an interval,
     even if covers several segments or splits segments in half.
     """
-    total = to_decimal(0)
-    start = to_decimal(start)
-    end = to_decimal(end)
+    if isinstance(segments, PreferenceIndex):
+        return segments.value_for_interval(start, end)
+
+    total = to_number(0)
+    start = to_number(start)
+    end = to_number(end)
+
+    if isinstance(segments, SegmentArray):
+        for i in range(len(segments)):
+            if segments.ends[i] <= start or segments.starts[i] >= end:
+                continue
+            total += _measure_partial_at(segments, i, start, end)
+        return total
 
     for seg in segments:
         if seg.end <= start or seg.start >= end:
@@ -117,39 +406,70 @@ def _measure_partial_segment(seg: Segment, start: Decimal, end: Decimal) -> Deci
     Measures the area of a segment
     Works with flat or sloped sections, whole numbers and decimals.
     """
-    start = to_decimal(start)
-    end = to_decimal(end)
+    return _measure_partial(
+        seg.start,
+        seg.end,
+        seg.start_value,
+        seg.end_value,
+        to_number(start),
+        to_number(end),
+    )
+
 
-    start_cap = max(start, to_decimal(seg.start))
-    end_cap = min(end, to_decimal(seg.end))
+def _measure_partial_at(
+    segments: SegmentArray, i: int, start: Decimal, end: Decimal
+) -> Decimal:
+    """`_measure_partial_segment` for the i-th segment of a `SegmentArray`."""
+    return _measure_partial(
+        segments.starts[i],
+        segments.ends[i],
+        segments.start_values[i],
+        segments.end_values[i],
+        start,
+        end,
+    )
+
+
+def _measure_partial(
+    seg_start: Decimal,
+    seg_end: Decimal,
+    seg_start_value: Decimal,
+    seg_end_value: Decimal,
+    start: Decimal,
+    end: Decimal,
+) -> Decimal:
+    start_cap = max(start, seg_start)
+    end_cap = min(end, seg_end)
     measuring_width = end_cap - start_cap
 
     if measuring_width <= 0:
         # Nothing to measure
-        return to_decimal(0)
-    if seg.start_value == seg.end_value:
+        return to_number(0)
+    if seg_start_value == seg_end_value:
         # Flat section
-        return seg.start_value * measuring_width
+        return seg_start_value * measuring_width
     else:
         # Sloped section
-        segment_width = seg.end - seg.start
-        slope = (seg.end_value - seg.start_value) / segment_width
-        start_val = seg.start_value + slope * (start_cap - seg.start)
-        end_val = seg.end_value - slope * (seg.end - end_cap)
+        segment_width = seg_end - seg_start
+        slope = (seg_end_value - seg_start_value) / segment_width
+        start_val = seg_start_value + slope * (start_cap - seg_start)
+        end_val = seg_end_value - slope * (seg_end - end_cap)
         avg_value = (start_val + end_val) / 2
         return measuring_width * avg_value
 
 
 def measure_segment(seg: Segment) -> Decimal:
-    return _measure_partial_segment(seg, to_decimal(seg.start), to_decimal(seg.end))
+    return _measure_partial_segment(seg, to_number(seg.start), to_number(seg.end))
 
 
-def get_total_value(segments: List[Segment]) -> Decimal:
-    return get_value_for_interval(segments, to_decimal(0), to_decimal(float("inf")))
+def get_total_value(segments: Preference) -> Decimal:
+    if isinstance(segments, PreferenceIndex):
+        return segments.total_value
+    return get_value_for_interval(segments, to_number(0), to_number(float("inf")))
 
 
 # TODO: May delete
-def get_value_at_point(segments: List[Segment], point: int) -> float:
+def get_value_at_point(segments: Preference, point: int) -> float:
     for seg in segments:
         if seg.end <= point or seg.start >= point:
             continue
@@ -160,12 +480,32 @@ def get_value_at_point(segments: List[Segment], point: int) -> float:
             return seg.start_value + slope * (point - seg.start)
 
 
+def get_values_for_intervals(
+    preferences: Sequence[Preference],
+    starts: Sequence[Decimal],
+    ends: Sequence[Decimal],
+) -> np.ndarray:
+    """
+    Values of every interval [starts[j], ends[j]] for every agent,
+    as an agents × intervals float64 matrix.
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    assert starts.shape == ends.shape, "Need as many starts as ends"
+
+    values = np.empty((len(preferences), len(starts)), dtype=np.float64)
+    for agent, preference in enumerate(preferences):
+        index = PreferenceIndex.from_segments(preference)
+        values[agent] = index.values_up_to(ends) - index.values_up_to(starts)
+    return np.where(ends > starts, values, 0.0)
+
+
 def get_values_for_cuts_origin(
-    preference: List[Segment], cuts: List[Decimal], cake_size: Decimal
+    preference: Preference, cuts: List[Decimal], cake_size: Decimal
 ) -> List[Decimal]:
     slice_values = []
 
-    start = to_decimal(0)
+    start = to_number(0)
     for end in cuts:
         value = get_value_for_interval(preference, start, end)
         slice_values.append(value)
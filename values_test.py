@@ -1,7 +1,18 @@
-from base_types import Segment
-from values import find_cut_line_by_percent
+import pytest
 
-from .algorithms.algorithm_test_utils import gen_flat_seg
+from base_types import Segment, SegmentArray
+from values import (
+    PreferenceIndex,
+    cut_from,
+    cut_to,
+    find_cut_line_by_percent,
+    find_cut_line_by_value,
+    get_total_value,
+    get_value_for_interval,
+    get_values_for_intervals,
+)
+
+from .algorithms.algorithm_test_utils import gen_flat_seg, gen_sloped_seg
 
 
 def test_find_cut_line_by_percent():
@@ -10,3 +21,107 @@ def test_find_cut_line_by_percent():
     preferences: list[Segment] = [gen_flat_seg(0, cake_size, 10)]
     cut = find_cut_line_by_percent(preferences, 0.25)
     assert cut == 0.25
+
+
+def test_preference_index_value_for_interval():
+    preference: list[Segment] = [
+        gen_sloped_seg(0, 30, 0, 10),
+        gen_flat_seg(30, 60, 4),
+        gen_sloped_seg(60, 100, 10, 2),
+    ]
+    index = PreferenceIndex.from_segments(preference)
+
+    assert get_total_value(index) == get_total_value(preference)
+    for start, end in [(0, 100), (10, 20), (15, 45), (29.5, 61), (0, 0), (70, 65)]:
+        assert get_value_for_interval(index, start, end) == pytest.approx(
+            get_value_for_interval(preference, start, end), abs=1e-12
+        )
+
+
+def test_preference_index_find_cut_line_by_value():
+    preference: list[Segment] = [
+        gen_flat_seg(0, 50, 10),
+        gen_sloped_seg(50, 100, 0, 10),
+    ]
+    index = PreferenceIndex.from_segments(preference)
+
+    for target in [100, 500, 600, 750]:
+        assert find_cut_line_by_value(index, target) == pytest.approx(
+            find_cut_line_by_value(preference, target), abs=1e-12
+        )
+    with pytest.raises(ValueError):
+        find_cut_line_by_value(index, 1000)
+
+
+def test_segment_array():
+    preference: list[Segment] = [
+        gen_sloped_seg(30, 60, 0, 10),
+        gen_flat_seg(0, 30, 4),
+    ]
+    array = SegmentArray.from_segments(preference)
+
+    assert len(array) == 2
+    assert array.to_segments() == preference
+    assert array.sorted_by_start().starts == (0, 30)
+    assert [seg.id for seg in array.sorted_by_start()] == [
+        preference[1].id,
+        preference[0].id,
+    ]
+    assert PreferenceIndex.from_segments(array).segments == array.sorted_by_start()
+
+    for start, end in [(0, 60), (10, 45), (40, 50), (70, 80)]:
+        assert get_value_for_interval(array, start, end) == get_value_for_interval(
+            preference, start, end
+        )
+    assert get_total_value(array) == get_total_value(preference)
+    assert find_cut_line_by_value(array, 200) == pytest.approx(
+        find_cut_line_by_value(array.sorted_by_start().to_segments(), 200), abs=1e-12
+    )
+
+
+def test_cut_from_and_cut_to():
+    preference: list[Segment] = [
+        gen_flat_seg(0, 40, 5),
+        gen_sloped_seg(40, 80, 5, 10),
+        gen_flat_seg(80, 90, 0),
+        gen_sloped_seg(90, 100, 10, 0),
+    ]
+    index = PreferenceIndex.from_segments(preference)
+
+    for start, target in [(0, 100), (10, 150), (35, 250), (50, 250), (0, 0)]:
+        cut = cut_from(index, start, target)
+        assert get_value_for_interval(index, start, cut) == pytest.approx(
+            target, abs=1e-9
+        )
+    for end, target in [(100, 50), (100, 100), (85, 200), (60, 250), (70, 0)]:
+        cut = cut_to(preference, end, target)
+        assert get_value_for_interval(index, cut, end) == pytest.approx(
+            target, abs=1e-9
+        )
+
+    # Zero-valued stretches: cut_from is the leftmost cut, cut_to the rightmost
+    assert cut_from(index, 0, get_value_for_interval(index, 0, 80)) == 80
+    assert cut_to(index, 100, 50) == 90
+    with pytest.raises(ValueError):
+        cut_from(index, 50, 1000)
+    with pytest.raises(ValueError):
+        cut_to(index, 50, 1000)
+
+
+def test_get_values_for_intervals():
+    preferences: list[list[Segment]] = [
+        [gen_flat_seg(0, 50, 10), gen_sloped_seg(50, 100, 0, 10)],
+        [gen_sloped_seg(0, 100, 10, 0)],
+        [gen_flat_seg(0, 100, 0)],
+    ]
+    starts = [0, 10, 45, 60, 100, 70]
+    ends = [100, 30, 55, 99, 100, 65]
+
+    values = get_values_for_intervals(preferences, starts, ends)
+
+    assert values.shape == (3, 6)
+    for agent, preference in enumerate(preferences):
+        for j, (start, end) in enumerate(zip(starts, ends)):
+            assert values[agent, j] == pytest.approx(
+                float(get_value_for_interval(preference, start, end)), abs=1e-9
+            )
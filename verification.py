@@ -0,0 +1,90 @@
+import os
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Level used when the caller does not say, unset means "off"
+VERIFY_ENV = "ALEX_AVIAD_VERIFY"
+LEVELS = ("off", "sampled", "full")
+DEFAULT_LEVEL = "off"
+# With "sampled", the first check of every site and one in this many after it run
+SAMPLE_EVERY = 16
+
+
+class Verification:
+    """
+    How many of the solver's internal consistency checks to run.
+
+    The checks re-evaluate v'' to confirm what a search has just found, e.g.
+    that m(l) and r(l) really split agent 1's valuation evenly, which doubles
+    the cost of the condition B searches. "off" skips them, "full" runs all of
+    them and "sampled" runs a deterministic subset of every site. Each condition
+    B candidate counts the calls of its sites afresh, so that the subset is the
+    same whether it runs here or in a worker process, and whatever ran before.
+    """
+
+    def __init__(self, level: str):
+        if level not in LEVELS:
+            raise ValueError(
+                f"Unknown verification level: {level}, expected one of {list(LEVELS)}"
+            )
+        self.level = level
+        self._calls: Counter = Counter()
+
+    def should_verify(self, site: str) -> bool:
+        if self.level == "off":
+            return False
+        if self.level == "full":
+            return True
+        calls = self._calls[site]
+        self._calls[site] += 1
+        return calls % SAMPLE_EVERY == 0
+
+
+_current_verification: ContextVar[Optional[Verification]] = ContextVar(
+    "verification", default=None
+)
+
+
+def verification_from_env() -> str:
+    return os.getenv(VERIFY_ENV, "") or DEFAULT_LEVEL
+
+
+def get_verification() -> Verification:
+    """Verification in use, a fresh one at ALEX_AVIAD_VERIFY's level if none is."""
+    verification = _current_verification.get()
+    if verification is None:
+        verification = Verification(verification_from_env())
+        _current_verification.set(verification)
+    return verification
+
+
+@contextmanager
+def use_verification(
+    level: Optional[str] = None, fresh: bool = False
+) -> Iterator[Verification]:
+    """
+    Run the enclosed code at the given verification level. `None` keeps the
+    current one, and so does the level already in use, so that nested uses
+    share which checks have been sampled. With `fresh` the enclosed code counts
+    its calls on its own, even at the level in use.
+    """
+    current = get_verification()
+    if level is None:
+        level = current.level
+    if level == current.level and not fresh:
+        yield current
+        return
+
+    verification = Verification(level)
+    token = _current_verification.set(verification)
+    try:
+        yield verification
+    finally:
+        _current_verification.reset(token)
+
+
+def should_verify(site: str) -> bool:
+    """Whether the consistency check at `site` is to run this time"""
+    return get_verification().should_verify(site)
@@ -0,0 +1,50 @@
+import pytest
+
+from verification import (
+    SAMPLE_EVERY,
+    get_verification,
+    should_verify,
+    use_verification,
+)
+
+
+def test_tests_run_every_check():
+    assert get_verification().level == "full"
+    assert should_verify("anywhere")
+
+
+def test_unknown_verification_level():
+    with pytest.raises(ValueError):
+        with use_verification("some"):
+            pass
+
+
+def test_off_skips_every_check():
+    with use_verification("off"):
+        assert not any(should_verify("site") for _ in range(100))
+    assert should_verify("site")
+
+
+def test_sampled_checks_every_site_from_its_first_call():
+    with use_verification("sampled") as verification:
+        checked = [should_verify("a") for _ in range(2 * SAMPLE_EVERY)]
+        assert should_verify("b")
+        # Nested uses at the same level keep counting
+        with use_verification("sampled") as nested:
+            assert nested is verification
+            assert should_verify("a")
+    assert checked == [i % SAMPLE_EVERY == 0 for i in range(2 * SAMPLE_EVERY)]
+
+
+def test_fresh_use_counts_on_its_own():
+    with use_verification("sampled") as verification:
+        assert should_verify("a")
+        assert not should_verify("a")
+        with use_verification("sampled", fresh=True) as fresh:
+            assert fresh is not verification
+            assert should_verify("a")
+        with use_verification(fresh=True) as fresh:
+            assert fresh.level == "sampled"
+            assert should_verify("a")
+        # The outer count went on where it was
+        assert not should_verify("a")